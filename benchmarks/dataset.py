@@ -0,0 +1,167 @@
+import click
+import json
+import os
+import random
+from scraper.scraper.tapology import consts
+
+BASE_URL = "https://www.tapology.com"
+NATIONALITIES = ["us", "br", "jp", "ru", "gb", "ca", "au", "mx"]
+STATUSES = [
+    consts.STATUS_WIN,
+    consts.STATUS_LOSS,
+    consts.STATUS_DRAW,
+    consts.STATUS_NC,
+]
+
+
+def generate_dataset(json_dir: str, fighters: int, seed: int = 0) -> dict[str, int]:
+    # Synthetic feeds shaped like the spiders' output, with the gaps
+    # preprocess.py has to fill (missing heights, dates of birth, weights, ...)
+    rng = random.Random(seed)
+    weight_classes = consts.WEIGHT_CLASSES_BY_LIMIT + [consts.WEIGHT_CLASS_S_HEAVY]
+    promotions = [
+        {
+            "id": f"{BASE_URL}/fightcenter/promotions/{i}-promotion-{i}",
+            "name": f"promotion {i}",
+            "shorten": f"p{i}",
+            "headquarter": rng.choice(NATIONALITIES),
+        }
+        for i in range(max(1, fighters // 200))
+    ]
+    events = []
+    for i in range(max(1, fighters // 4)):
+        events.append(
+            {
+                "id": f"{BASE_URL}/fightcenter/events/{i}-event-{i}",
+                "name": f"event {i}",
+                "date": f"{rng.randint(1995, 2023)}-{rng.randint(1, 12):02d}-"
+                f"{rng.randint(1, 28):02d}",
+                "promotion": rng.choice(promotions)["id"],
+                "location": "las vegas, nevada",
+                "region": "nevada",
+                "enclosure": rng.choice(["cage", "ring"]),
+                "venue": "arena",
+                "cards": [],
+                "total_cards": 0,
+            }
+        )
+
+    profiles, female = [], []
+    for i in range(fighters):
+        profile = {
+            "weight_class": rng.choice(weight_classes),
+            "id": f"{BASE_URL}/fightcenter/fighters/{i}-fighter-{i}",
+            "name": f"fighter {i}",
+            "nickname": f"nickname {i}",
+            "record": {"w": rng.randint(0, 30), "l": rng.randint(0, 15), "d": 0},
+            "last_weigh_in": round(rng.uniform(50, 120), 1),
+            "foundation_styles": ["wrestling"],
+            "born": "somewhere",
+            "out_of": "elsewhere",
+        }
+        if rng.random() < 0.8:
+            profile["nationality"] = rng.choice(NATIONALITIES)
+        if rng.random() < 0.6:
+            profile["date_of_birth"] = (
+                f"{rng.randint(1960, 2002)}-{rng.randint(1, 12):02d}-"
+                f"{rng.randint(1, 28):02d}"
+            )
+        if rng.random() < 0.3:
+            profile["earnings"] = rng.randint(0, 10**6)
+        if rng.random() < 0.5:
+            profile["affiliation"] = f"{BASE_URL}/gyms/{rng.randint(0, 500)}-gym"
+        if rng.random() < 0.6:
+            profile["height"] = round(rng.uniform(1.5, 2.05), 3)
+        if rng.random() < 0.4:
+            profile["reach"] = round(rng.uniform(1.5, 2.15), 3)
+        if rng.random() < 0.2:
+            profile["college"] = "college"
+        if rng.random() < 0.2:
+            profile["head_coach"] = "coach"
+        profiles.append(profile)
+        if rng.random() < 0.15:
+            female.append({"id": profile["id"], "name": profile["name"]})
+
+    # Both sides of each bout, as parse_fighter_results emits them
+    results = []
+    for i in range(fighters * 5 // 2):
+        a, b = rng.sample(profiles, 2) if fighters > 1 else (profiles[0],) * 2
+        event = rng.choice(events)
+        match = f"{BASE_URL}/fightcenter/bouts/{i}-bout-{i}"
+        has_match = rng.random() < 0.9
+        status = rng.choice(STATUSES)
+        weight = {}
+        if rng.random() < 0.7:
+            weight["class"] = rng.choice(
+                weight_classes + [consts.WEIGHT_CLASS_CATCH, consts.WEIGHT_CLASS_OPEN]
+            )
+        if rng.random() < 0.5:
+            weight["limit"] = round(rng.uniform(50, 130), 2)
+        if rng.random() < 0.3:
+            weight["weigh_in"] = round(rng.uniform(50, 130), 2)
+        end_time = {"round": rng.randint(1, 3), "time": f"{rng.randint(0, 4)}:30"}
+        if rng.random() < 0.5:
+            end_time["elapsed"] = f"{rng.randint(5, 14)}:{rng.randint(0, 59):02d}"
+        for fighter, opponent in [(a, b), (b, a)]:
+            result = {
+                "fighter": fighter["id"],
+                "division": "pro",
+                "event": event["id"],
+                "status": status if fighter is a else reverse_status(status),
+                "date": event["date"],
+                "sport": "mma",
+                "opponent": opponent["id"],
+                "record_before": {"w": 1, "l": 1, "d": 0},
+                "record_after": {"w": 2, "l": 1, "d": 0},
+                "method": {"type": "ko/tko", "by": "punches"},
+                "end_time": end_time,
+                "odds": round(rng.uniform(1.1, 5.0), 2),
+            }
+            if has_match:
+                result["match"] = match
+            if rng.random() < 0.5:
+                result["age"] = round(rng.uniform(18, 40), 2)
+            if rng.random() < 0.6:
+                result["billing"] = "main"
+            if rng.random() < 0.6:
+                result["referee"] = "referee"
+            if weight:
+                result["weight"] = weight
+            if rng.random() < 0.1:
+                result["title_info"] = {"as": "champion", "for": "title"}
+            results.append(result)
+
+    feeds = {
+        "profiles": profiles,
+        "results": results,
+        "events": events,
+        "promotions": promotions,
+        "female": female,
+    }
+    os.makedirs(json_dir, exist_ok=True)
+    for name, items in feeds.items():
+        with open(os.path.join(json_dir, f"{name}.jsonl"), "w") as f:
+            for item in items:
+                f.write(json.dumps(item) + "\n")
+    return {name: len(items) for name, items in feeds.items()}
+
+
+def reverse_status(status: str) -> str:
+    if status == consts.STATUS_WIN:
+        return consts.STATUS_LOSS
+    if status == consts.STATUS_LOSS:
+        return consts.STATUS_WIN
+    return status
+
+
+@click.command()
+@click.argument("json_dir", type=click.Path(file_okay=False))
+@click.option("--fighters", type=int, default=10000, show_default=True)
+@click.option("--seed", type=int, default=0, show_default=True)
+def main(json_dir: str, fighters: int, seed: int):
+    for name, count in generate_dataset(json_dir, fighters, seed).items():
+        click.echo(f"{name:<12} {count:8d} items")
+
+
+if __name__ == "__main__":
+    main()
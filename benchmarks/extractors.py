@@ -0,0 +1,79 @@
+import click
+import importlib.util
+import logging
+import os
+import subprocess
+import timeit
+from itemadapter import is_item
+from scrapy.http import HtmlResponse, Request
+from scraper.scraper.tapology import spiders
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+FIGHTER_URL = "https://www.tapology.com/fightcenter/fighters/1-john-fixture"
+
+
+def load_baseline(rev: str):
+    # Load spiders.py of the given git revision next to the current one
+    source = subprocess.run(
+        ["git", "show", f"{rev}:scraper/scraper/tapology/spiders.py"],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    spec = importlib.util.spec_from_loader(
+        "scraper.scraper.tapology.baseline_spiders", loader=None
+    )
+    module = importlib.util.module_from_spec(spec)
+    module.__package__ = "scraper.scraper.tapology"
+    exec(source, module.__dict__)
+    return module
+
+
+def load_fixture(name: str) -> bytes:
+    with open(os.path.join(FIXTURES_DIR, name), "rb") as f:
+        return f.read()
+
+
+def run(module, scope: str, body: bytes) -> list:
+    # A fresh response each time, so that parsing the tree is measured too
+    request = Request(FIGHTER_URL)
+    response = HtmlResponse(FIGHTER_URL, body=body, encoding="utf-8", request=request)
+    spider = module.FightersSpider(scope=scope)
+    if scope == "profile":
+        outputs = spider.parse_fighter_profile(response, weight_class="light")
+        # Returned by revisions before the slotted items
+        outputs = [outputs] if outputs is None or is_item(outputs) else list(outputs)
+    else:
+        outputs = list(spider.parse_fighter_results(response))
+    ret = []
+    for x in outputs:
+        if isinstance(x, Request):
+            x = (x.url, x.callback.__name__, x.cb_kwargs, x.meta)
+        ret.append(x)
+    ret.append(spider.pending_bouts)
+    return ret
+
+
+@click.command()
+@click.option("--number", type=int, default=20, show_default=True)
+@click.option("--baseline", help="git revision to compare with, e.g. HEAD~1")
+def main(number: int, baseline: str | None):
+    logging.disable(logging.ERROR)
+    base = load_baseline(baseline) if baseline is not None else None
+    body = load_fixture("fighter.html")
+    for scope in ["profile", "result", "event"]:
+        msec = timeit.timeit(lambda: run(spiders, scope, body), number=number)
+        msec = msec / number * 1e3
+        line = f"{scope:<8} {msec:8.2f} ms/page"
+        if base is not None:
+            # Both versions must emit equal items and requests
+            if run(spiders, scope, body) != run(base, scope, body):
+                raise click.ClickException(f"outputs differ for scope={scope}")
+            msec_base = timeit.timeit(lambda: run(base, scope, body), number=number)
+            msec_base = msec_base / number * 1e3
+            line += f" (baseline {msec_base:8.2f}, {msec_base / msec:4.1f}x)"
+        click.echo(line)
+
+
+if __name__ == "__main__":
+    main()
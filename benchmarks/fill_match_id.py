@@ -0,0 +1,76 @@
+import click
+import numpy as np
+import pandas as pd
+import timeit
+from preprocess import fill_match_id
+
+
+def fill_match_id_apply(results: pd.DataFrame) -> pd.DataFrame:
+    # Row-wise implementation replaced by the vectorized fill_match_id
+    def generate_match_id(row: pd.DataFrame) -> str:
+        id_a = min(row["fighter"], row["opponent"])
+        id_b = max(row["fighter"], row["opponent"])
+        match_id = id_a + "-vs-" + id_b + "-at-" + row["date"].strftime("%Y-%m-%d")
+        return match_id
+
+    ret = results.copy()
+    mask = (
+        results["match"].isna()
+        & ~results["fighter"].isna()
+        & ~results["opponent"].isna()
+        & ~results["date"].isna()
+    )
+    ret["match"].fillna(
+        results.loc[mask, ["fighter", "opponent", "date"]].apply(
+            generate_match_id, axis=1
+        ),
+        inplace=True,
+    )
+    return ret
+
+
+def generate_results(rows: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    fighters = pd.Series([f"{i}-fighter-{i % 97}" for i in range(rows // 20 + 2)])
+    results = pd.DataFrame(
+        {
+            "fighter": fighters.sample(rows, replace=True, random_state=seed).values,
+            "opponent": fighters.sample(
+                rows, replace=True, random_state=seed + 1
+            ).values,
+            "match": [f"{i}-match" for i in range(rows)],
+            "date": pd.Timestamp("2000-01-01")
+            + pd.to_timedelta(rng.integers(0, 365 * 20, rows), unit="d"),
+        }
+    ).astype({"fighter": "string", "opponent": "string", "match": "string"})
+    results.loc[rng.random(rows) < 0.4, "match"] = None
+    results.loc[rng.random(rows) < 0.02, "opponent"] = None
+    results.loc[rng.random(rows) < 0.02, "date"] = None
+    return results
+
+
+@click.command()
+@click.option("--rows", type=int, default=200000, show_default=True)
+@click.option("--repeat", type=int, default=3, show_default=True)
+@click.option("--seed", type=int, default=0, show_default=True)
+def main(rows: int, repeat: int, seed: int):
+    results = generate_results(rows, seed)
+
+    # Both implementations must generate identical IDs
+    expected = fill_match_id_apply(results)
+    actual = fill_match_id(results)
+    pd.testing.assert_frame_equal(actual, expected)
+    click.secho("Identical match IDs", fg="green")
+
+    before = min(
+        timeit.repeat(lambda: fill_match_id_apply(results), number=1, repeat=repeat)
+    )
+    after = min(timeit.repeat(lambda: fill_match_id(results), number=1, repeat=repeat))
+    click.echo(f"rows: {rows}")
+    click.echo(f"apply: {before:.3f}s")
+    click.echo(f"vectorized: {after:.3f}s")
+    click.echo(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+import click
+import importlib.util
+import json
+import subprocess
+import timeit
+from scraper.scraper.tapology import utils
+
+SAMPLES = {
+    "normalize_text": ["  John   DOE ", "Las Vegas,\n Nevada", "N/A"],
+    "normalize_status": [
+        "Win",
+        "loss",
+        "Lose",
+        "Draw",
+        "Cancelled Bout",
+        "Overturned to No Contest",
+        "NC",
+        "Confirmed Upcoming Bout",
+        "N/A",
+        "forfeit",
+    ],
+    "normalize_sport": [
+        "MMA",
+        "Pancrase",
+        "Bare Knuck MMA",
+        "Modified Boxing (Cage)",
+        "Bare Knuck Box",
+        "Muay Thai",
+        "Kickboxing",
+        "Vale Tudo",
+        "Combat Jiu-Jitsu",
+        "Slap Fighting",
+        "Modified Custom Rules",
+        "Sumo",
+    ],
+    "normalize_weight_class": [
+        "Atomweight",
+        "Featherweight",
+        "Super Lightweight",
+        "Light Heavyweight",
+        "Heavyweight",
+        "Super Heavyweight",
+        "Open Weight",
+        "Catchweight",
+        "s_middle",
+        "Pinweight",
+    ],
+    "normalize_billing": [
+        "Main Event",
+        "Co-Main Event",
+        "Main Card",
+        "Preliminary Card",
+        "Prelim",
+        "Postlim",
+        "Undercard",
+    ],
+    "normalize_division": ["Pro", "Amateur", "Exhibition"],
+    "parse_date": ["2014.09.09", "09.09.2014", "Sat 2014.09.09 at 10:00 PM", "TBA"],
+    "parse_round_format": [
+        "5 x 5 minute rounds",
+        "5 min one round",
+        "5 min round plus overtime",
+        "5-5-5 plus overtime",
+        "5-5 two rounds",
+        "5 + 5 + 5 three rounds",
+        "5 min unlim rounds",
+        "1 Round, No Limit",
+        "3 Rounds",
+        "unknown",
+    ],
+    "parse_round_time": ["4:59", "0:05", "4-59"],
+    "parse_round": ["R1", "R12", "round"],
+    "parse_nickname": ['"The Eagle"', "Eagle"],
+    "parse_title_info": [
+        "Champion · UFC Featherweight Championship",
+        "Tournament Championship",
+        "·",
+    ],
+    "parse_odds": ["+210 · Moderate Underdog", "-150 · Favorite", "0 · Close", "n/a"],
+    "parse_end_time": [
+        "1:44 Round 1 of 3",
+        "0:56 Round 3 of 3, 10:56 Total",
+        "3:09 Round 2, 18:09 Total",
+        "Round 3 of 5",
+        "Round 2 of 3, 3:00 Total",
+        "5 Rounds, 25:00 Total",
+        "1 Round",
+        "1:31 Round 8/10, 22:31 Total",
+        "Rounds, 15:00 Total",
+        "unknown",
+    ],
+    "parse_weight_summary": [
+        "Heavyweight",
+        "Lightweight · 155 lbs (70.3 kg) · Weigh-In 154.5 lbs (70.1 kg)",
+        "*numeric weight* · 120 kg (264.6 lbs)",
+        "145 lbs (65.8 kg)",
+        "Weigh-In 170 lbs",
+        "unknown",
+    ],
+    "parse_last_weigh_in": ["155.5 lbs", "70 kgs", "n/a"],
+    "parse_height": ["5'11\" (180cm)", "n/a"],
+    "parse_reach": ['74.0" (188cm)', "n/a"],
+    "parse_earnings": ["$1,234,567 USD", "n/a"],
+    "parse_method": [
+        "KO/TKO, Punches",
+        "Submission, Rear Naked Choke",
+        "Decision, Unanimous",
+        "Decision, Spilt",
+        "Decision",
+        "Ends in a Draw, Majority",
+        "Ends in a No Contest, Failed Drug Test",
+        "Disqualificaton, Illegal Knee",
+        "Overturned to No Contest",
+        "N/A",
+        "Result Unknown",
+        "Forfeit",
+    ],
+    "parse_record": [
+        "Climbed to 10-2",
+        "Fell to 5-3-1",
+        "Stayed at 0-0",
+        "10-2-0, 1 NC",
+        "n/a",
+    ],
+    "is_doping": ["Failed Drug Test", "Banned Substance", "Illegal Knee"],
+}
+
+
+def load_baseline(rev: str):
+    # Load utils.py of the given git revision next to the current one
+    source = subprocess.run(
+        ["git", "show", f"{rev}:scraper/scraper/tapology/utils.py"],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    spec = importlib.util.spec_from_loader(
+        "scraper.scraper.tapology.baseline_utils", loader=None
+    )
+    module = importlib.util.module_from_spec(spec)
+    module.__package__ = "scraper.scraper.tapology"
+    exec(source, module.__dict__)
+    return module
+
+
+def call(func, text: str):
+    try:
+        return func(text)
+    except Exception as e:
+        return (type(e).__name__, str(e))
+
+
+def exported(result) -> str:
+    # Compare results as they end up in the feeds, so that read-only
+    # mappings and tuples match the dicts and lists of older revisions
+    return json.dumps(result, default=dict, sort_keys=True)
+
+
+def measure(module, name: str, number: int) -> float:
+    func = getattr(module, name)
+    texts = SAMPLES[name]
+    elapsed = timeit.timeit(lambda: [call(func, text) for text in texts], number=number)
+    return elapsed / (number * len(texts)) * 1e6
+
+
+@click.command()
+@click.option("--number", type=int, default=2000, show_default=True)
+@click.option("--baseline", help="git revision to compare with, e.g. HEAD~1")
+def main(number: int, baseline: str | None):
+    base = load_baseline(baseline) if baseline is not None else None
+    total, total_base = 0.0, 0.0
+    for name in SAMPLES:
+        usec = measure(utils, name, number)
+        total += usec
+        line = f"{name:<24} {usec:8.2f} us/call"
+        if base is not None:
+            # Both versions must agree on every sample, errors included
+            for text in SAMPLES[name]:
+                expected = call(getattr(base, name), text)
+                actual = call(getattr(utils, name), text)
+                if exported(expected) != exported(actual):
+                    raise click.ClickException(
+                        f"{name}({text!r}): {actual!r} != {expected!r}"
+                    )
+            usec_base = measure(base, name, number)
+            total_base += usec_base
+            line += f" (baseline {usec_base:8.2f}, {usec_base / usec:4.1f}x)"
+        click.echo(line)
+    if base is not None:
+        click.echo(f"{'total':<24} {total:8.2f} us ({total_base / total:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
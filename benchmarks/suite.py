@@ -0,0 +1,263 @@
+import click
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import timeit
+from collections.abc import Callable
+from itemadapter import is_item
+from scrapy.http import HtmlResponse, Request
+from scrapy.settings import Settings
+import preprocess
+from scraper.scraper import settings
+from scraper.scraper.tapology import spiders, utils
+from .dataset import generate_dataset
+from .normalizers import SAMPLES
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+GROUPS = ["utils", "callbacks", "preprocess"]
+SETTINGS = Settings()
+SETTINGS.setmodule(settings)
+
+# (spider, callback, fixture, url, spider kwargs, callback kwargs)
+CALLBACKS = [
+    (
+        "FightersSpider",
+        "parse",
+        "search.html",
+        "https://www.tapology.com/search/mma-fighters-by-weight-class/Lightweight",
+        {"scope": "profile"},
+        {},
+    ),
+    (
+        "FightersSpider",
+        "parse_fighter_profile",
+        "fighter.html",
+        "https://www.tapology.com/fightcenter/fighters/1-john-fixture",
+        {"scope": "profile"},
+        {"weight_class": "light"},
+    ),
+    (
+        "FightersSpider",
+        "parse_fighter_results",
+        "fighter.html",
+        "https://www.tapology.com/fightcenter/fighters/1-john-fixture",
+        {"scope": "result"},
+        {},
+    ),
+    (
+        "FightersSpider",
+        "parse_event",
+        "event.html",
+        "https://www.tapology.com/fightcenter/events/1-fixture-fc-100",
+        {"scope": "event"},
+        {},
+    ),
+    (
+        "FightersSpider",
+        "parse_event_results",
+        "event.html",
+        "https://www.tapology.com/fightcenter/events/1-fixture-fc-100",
+        {"scope": "result"},
+        {"event_url": "https://www.tapology.com/fightcenter/events/1-fixture-fc-100"},
+    ),
+    (
+        "PromotionsSpider",
+        "parse",
+        "promotions.html",
+        "https://www.tapology.com/fightcenter/promotions",
+        {},
+        {},
+    ),
+    (
+        "FemaleSpider",
+        "parse",
+        "search.html",
+        "https://www.tapology.com/search/misc/female-mixed-martial-artists",
+        {},
+        {},
+    ),
+]
+
+
+def load_fixture(name: str) -> bytes:
+    with open(os.path.join(FIXTURES_DIR, name), "rb") as f:
+        return f.read()
+
+
+def measure(func: Callable, repeat: int, calls: int = 1) -> dict[str, float]:
+    # Seconds per call, with as many loops as fit in 0.2 seconds
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    times = [t / (number * calls) for t in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "number": number * calls,
+        "best": min(times),
+        "median": statistics.median(times),
+    }
+
+
+def call(func: Callable, text: str):
+    try:
+        return func(text)
+    except Exception as e:
+        return e
+
+
+def bench_utils(repeat: int) -> dict[str, dict]:
+    results = {}
+    for name, texts in SAMPLES.items():
+        # The parsing itself, not the hits of the memoized wrappers
+        func = getattr(utils, name)
+        func = getattr(func, "func", func)
+        results[f"utils.{name}"] = measure(
+            lambda: [call(func, text) for text in texts], repeat, len(texts)
+        )
+    return results
+
+
+def run_callback(
+    spider_name: str, method: str, body: bytes, url: str, spider_kwargs, cb_kwargs
+) -> list:
+    # A fresh response each time, so that parsing the tree is measured too
+    response = HtmlResponse(url, body=body, encoding="utf-8", request=Request(url))
+    spider = getattr(spiders, spider_name)(**spider_kwargs)
+    # The project settings, without the crawler that would bring them
+    spider.settings = SETTINGS
+    outputs = getattr(spider, method)(response, **cb_kwargs)
+    if outputs is None or is_item(outputs):
+        return [outputs]
+    return list(outputs)
+
+
+def bench_callbacks(repeat: int) -> dict[str, dict]:
+    results = {}
+    for spider_name, method, fixture, url, spider_kwargs, cb_kwargs in CALLBACKS:
+        body = load_fixture(fixture)
+        args = (spider_name, method, body, url, spider_kwargs, cb_kwargs)
+        outputs = run_callback(*args)
+        stats = measure(lambda: run_callback(*args), repeat)
+        stats["outputs"] = len([x for x in outputs if x is not None])
+        results[f"callbacks.{spider_name}.{method}"] = stats
+    return results
+
+
+def bench_preprocess(repeat: int, size: int, seed: int) -> dict[str, dict]:
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="bench-") as tmpdir:
+        json_dir = os.path.join(tmpdir, "json")
+        out_dir = os.path.join(tmpdir, "out")
+        generate_dataset(json_dir, size, seed)
+
+        def run_main():
+            # main prints the frames it fills
+            with contextlib.redirect_stdout(io.StringIO()):
+                preprocess.main.callback(json_dir, out_dir)
+
+        results["preprocess.load_dataframes"] = measure(
+            lambda: preprocess.load_dataframes(json_dir), repeat
+        )
+        results["preprocess.main"] = measure(run_main, repeat)
+
+        # Again from the parquet files, preferred once they exist
+        for name in preprocess.FEEDS:
+            preprocess.convert_feed(json_dir, name)
+        results["preprocess.load_dataframes[parquet]"] = measure(
+            lambda: preprocess.load_dataframes(json_dir), repeat
+        )
+        results["preprocess.main[parquet]"] = measure(run_main, repeat)
+    return results
+
+
+def get_commit() -> dict[str, str | bool | None]:
+    try:
+        rev = subprocess.run(
+            ["git", "rev-parse", "HEAD"], check=True, capture_output=True, text=True
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return {"rev": None, "dirty": None}
+    return {"rev": rev, "dirty": status.strip() != ""}
+
+
+@click.command()
+@click.option(
+    "--group",
+    "groups",
+    type=click.Choice(GROUPS),
+    multiple=True,
+    help="run only these groups (may be repeated)  [default: all]",
+)
+@click.option("--repeat", type=int, default=5, show_default=True)
+@click.option(
+    "--size",
+    type=int,
+    default=10000,
+    show_default=True,
+    help="fighters in the synthetic dataset of preprocess",
+)
+@click.option("--seed", type=int, default=0, show_default=True)
+@click.option("-o", "--output", type=click.Path(dir_okay=False), help="JSON results")
+@click.option(
+    "--compare",
+    type=click.Path(exists=True, dir_okay=False),
+    help="JSON results of another run, e.g. of the previous commit",
+)
+def main(
+    groups: tuple[str],
+    repeat: int,
+    size: int,
+    seed: int,
+    output: str | None,
+    compare: str | None,
+):
+    # Fixtures contain malformed values on purpose
+    logging.disable(logging.ERROR)
+    groups = groups or GROUPS
+    base = None
+    if compare is not None:
+        with open(compare) as f:
+            base = json.load(f)["results"]
+
+    results = {}
+    if "utils" in groups:
+        results.update(bench_utils(repeat))
+    if "callbacks" in groups:
+        results.update(bench_callbacks(repeat))
+    if "preprocess" in groups:
+        results.update(bench_preprocess(repeat, size, seed))
+
+    for name, stats in results.items():
+        line = f"{name:<48} {stats['best'] * 1e6:12.2f} us"
+        if base is not None and name in base:
+            best = base[name]["best"]
+            line += f" (compared {best * 1e6:12.2f}, {best / stats['best']:5.2f}x)"
+        click.echo(line)
+
+    if output is not None:
+        with open(output, "w") as f:
+            json.dump(
+                {
+                    "commit": get_commit(),
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "options": {"repeat": repeat, "size": size, "seed": seed},
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+import click
+from preprocess import FEEDS, convert_feed
+
+
+@click.command()
+@click.argument(
+    "json_dir",
+    type=click.Path(exists=True, dir_okay=True, file_okay=False, resolve_path=True),
+)
+def main(json_dir: str):
+    # Write typed parquet files next to the feeds, preferred by load_dataframes
+    for name in FEEDS:
+        path = convert_feed(json_dir, name)
+        click.secho(f"Converted {name} into {path}", fg="green")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,11 @@
 import pandas as pd
 import numpy as np
 import click
+import itertools
 import json
 import os
+from collections.abc import Callable
 from scraper.scraper.tapology import consts
-from scraper.scraper.tapology.utils import to_weight_limit
 
 
 @click.command()
@@ -41,133 +42,117 @@ def main(json_dir: str, out_dir: str):
     results.info(verbose=True)
 
 
+FEEDS = {
+    "profiles": (
+        [
+            "name",
+            "nickname",
+            "record.w",
+            "record.l",
+            "record.d",
+            "last_weigh_in",
+            "foundation_styles",
+            "born",
+            "out_of",
+        ],
+        {
+            "id": "string",
+            "nationality": "string",
+            "weight_class": "string",
+            "earnings": "float32",
+            "affiliation": "string",
+            "height": "float32",
+            "reach": "float32",
+            "college": "string",
+            "head_coach": "string",
+        },
+    ),
+    "results": (
+        ["odds"],
+        {
+            "fighter": "string",
+            "division": "string",
+            "match": "string",
+            "status": "string",
+            "sport": "string",
+            "age": "float32",
+            "opponent": "string",
+            "record_before.w": "float32",
+            "record_before.l": "float32",
+            "record_before.d": "float32",
+            "record_after.w": "float32",
+            "record_after.l": "float32",
+            "record_after.d": "float32",
+            "event": "string",
+            "billing": "string",
+            "referee": "string",
+            "weight.class": "string",
+            "weight.limit": "float32",
+            "weight.weigh_in": "float32",
+            "method.type": "string",
+            "method.by": "string",
+            "end_time.round": "float32",
+            "title_info.as": "string",
+            "title_info.for": "string",
+        },
+    ),
+    "events": (
+        [
+            "name",
+            "ownership",
+            "venue",
+            "location",
+            "cards",
+            "total_cards",
+            "ring_announcer",
+        ],
+        {
+            "id": "string",
+            "promotion": "string",
+            "region": "string",
+            "enclosure": "string",
+        },
+    ),
+    "promotions": (["shorten", "name"], {"id": "string", "headquarter": "string"}),
+    "female": (["name"], {"id": "string"}),
+}
+
+
 def load_dataframes(
     json_dir: str,
 ) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
-    with open(os.path.join(json_dir, "profiles.json")) as f:
-        profiles = (
-            pd.json_normalize(json.load(f))
-            .drop(
-                [
-                    "name",
-                    "nickname",
-                    "record.w",
-                    "record.l",
-                    "record.d",
-                    "last_weigh_in",
-                    "foundation_styles",
-                    "born",
-                    "out_of",
-                ],
-                axis="columns",
-            )
-            .astype(
-                {
-                    "id": "string",
-                    "nationality": "string",
-                    "weight_class": "string",
-                    "earnings": "float32",
-                    "affiliation": "string",
-                    "height": "float32",
-                    "reach": "float32",
-                    "college": "string",
-                    "head_coach": "string",
-                }
-            )
-        )
-        profiles["date_of_birth"] = pd.to_datetime(
-            profiles["date_of_birth"], format="%Y-%m-%d"
-        )
-        for column in ["id", "affiliation"]:
-            profiles[column] = shorten_url(profiles[column])
-        profiles = profiles.set_index("id")
-    with open(os.path.join(json_dir, "results.json")) as f:
-        results = (
-            pd.json_normalize(json.load(f))
-            .drop(["odds"], axis="columns")
-            .astype(
-                {
-                    "fighter": "string",
-                    "division": "string",
-                    "match": "string",
-                    "status": "string",
-                    "sport": "string",
-                    "age": "float32",
-                    "opponent": "string",
-                    "record_before.w": "float32",
-                    "record_before.l": "float32",
-                    "record_before.d": "float32",
-                    "record_after.w": "float32",
-                    "record_after.l": "float32",
-                    "record_after.d": "float32",
-                    "event": "string",
-                    "billing": "string",
-                    "referee": "string",
-                    "weight.class": "string",
-                    "weight.limit": "float32",
-                    "weight.weigh_in": "float32",
-                    "method.type": "string",
-                    "method.by": "string",
-                    "end_time.round": "float32",
-                    "title_info.as": "string",
-                    "title_info.for": "string",
-                }
-            )
-        )
-        results["date"] = pd.to_datetime(results["date"], format="%Y-%m-%d")
-        for column in ["end_time.time", "end_time.elapsed"]:
-            results[column] = to_minutes(results[column])
-        for column in ["fighter", "opponent", "match", "event"]:
-            results[column] = shorten_url(results[column])
-        results = fill_match_id(results)
-        results = results.set_index("match")
-    with open(os.path.join(json_dir, "events.json")) as f:
-        events = (
-            pd.json_normalize(json.load(f))
-            .drop(
-                [
-                    "name",
-                    "ownership",
-                    "venue",
-                    "location",
-                    "cards",
-                    "total_cards",
-                    "ring_announcer",
-                ],
-                axis="columns",
-            )
-            .astype(
-                {
-                    "id": "string",
-                    "promotion": "string",
-                    "region": "string",
-                    "enclosure": "string",
-                }
-            )
-        )
-        for column in ["id", "promotion"]:
-            events[column] = shorten_url(events[column])
-        events["date"] = pd.to_datetime(events["date"], format="%Y-%m-%d")
-        events = events.set_index("id")
-    with open(os.path.join(json_dir, "promotions.json")) as f:
-        promotions = (
-            pd.json_normalize(json.load(f))
-            .drop(["shorten", "name"], axis="columns")
-            .astype({"id": "string", "headquarter": "string"})
-        )
-        promotions["id"] = shorten_url(promotions["id"])
-        promotions = promotions.set_index("id")
-
-    with open(os.path.join(json_dir, "female.json")) as f:
-        female = (
-            pd.json_normalize(json.load(f))
-            .drop(["name"], axis="columns")
-            .astype({"id": "string"})
-        )
-        mask = profiles.index.isin(female["id"].unique())
-        profiles.loc[mask, "sex"] = consts.SEX_WOMAN
-        profiles.loc[~mask, "sex"] = consts.SEX_MAN
-        profiles["sex"] = profiles["sex"].astype("string")
+    profiles = load_feed(json_dir, "profiles")
+    profiles["date_of_birth"] = pd.to_datetime(
+        profiles["date_of_birth"], format="%Y-%m-%d"
+    )
+    for column in ["id", "affiliation"]:
+        profiles[column] = shorten_url(profiles[column])
+    profiles = profiles.set_index("id")
+
+    results = load_feed(json_dir, "results")
+    results["date"] = pd.to_datetime(results["date"], format="%Y-%m-%d")
+    for column in ["end_time.time", "end_time.elapsed"]:
+        results[column] = to_minutes(results[column])
+    for column in ["fighter", "opponent", "match", "event"]:
+        results[column] = shorten_url(results[column])
+    results = fill_match_id(results)
+    results = results.set_index("match")
+
+    events = load_feed(json_dir, "events")
+    for column in ["id", "promotion"]:
+        events[column] = shorten_url(events[column])
+    events["date"] = pd.to_datetime(events["date"], format="%Y-%m-%d")
+    events = events.set_index("id")
+
+    promotions = load_feed(json_dir, "promotions")
+    promotions["id"] = shorten_url(promotions["id"])
+    promotions = promotions.set_index("id")
+
+    female = load_feed(json_dir, "female")
+    mask = profiles.index.isin(female["id"].unique())
+    profiles.loc[mask, "sex"] = consts.SEX_WOMAN
+    profiles.loc[~mask, "sex"] = consts.SEX_MAN
+    profiles["sex"] = profiles["sex"].astype("string")
 
     # Filter records
     profiles = profiles[profiles.index.isin(results["fighter"].unique())]
@@ -176,15 +161,112 @@ def load_dataframes(
     return (profiles, results, events, promotions)
 
 
+def load_feed(json_dir: str, name: str) -> pd.DataFrame:
+    drop, dtype = FEEDS[name]
+    path = get_parquet_path(json_dir, name)
+    json_path = get_json_path(json_dir, name)
+    # The parquet file, unless the feed has been written again since
+    if os.path.exists(path) and (
+        not os.path.exists(json_path)
+        or os.path.getmtime(path) >= os.path.getmtime(json_path)
+    ):
+        import pyarrow.parquet as pq
+
+        # Read only the columns in use, already typed
+        columns = [c for c in pq.read_schema(path).names if c not in drop]
+        return pd.read_parquet(path, columns=columns)
+    return load_json(json_dir, name, drop, dtype)
+
+
+def convert_feed(json_dir: str, name: str) -> str:
+    _, dtype = FEEDS[name]
+    frame = load_json(json_dir, name, [], dtype)
+
+    # Nested lists and dicts (e.g. cards) are kept as JSON strings
+    for column in frame.columns[frame.dtypes == "object"]:
+        if frame[column].map(lambda x: isinstance(x, (list, dict))).any():
+            frame[column] = frame[column].map(json.dumps, na_action="ignore")
+    path = get_parquet_path(json_dir, name)
+    frame.to_parquet(path, index=False)
+    return path
+
+
+def get_json_path(json_dir: str, name: str) -> str:
+    path = os.path.join(json_dir, f"{name}.jsonl")
+    if not os.path.exists(path):
+        path = os.path.join(json_dir, f"{name}.json")
+    return path
+
+
+def get_parquet_path(json_dir: str, name: str) -> str:
+    return os.path.join(json_dir, f"{name}.parquet")
+
+
+def load_json(
+    json_dir: str,
+    name: str,
+    drop: list[str],
+    dtype: dict[str, str],
+    chunksize: int = 10000,
+) -> pd.DataFrame:
+    path = get_json_path(json_dir, name)
+    if path.endswith(".json"):
+        with open(path) as f:
+            return (
+                pd.json_normalize(json.load(f)).drop(drop, axis="columns").astype(dtype)
+            )
+
+    # Stream JSON Lines feeds chunk by chunk into typed columns. The pieces
+    # of each column are joined one column at a time, so that the chunks are
+    # freed as the frame is built.
+    pieces: dict[str, list[pd.Series]] = {}
+    rows = 0
+    with open(path) as f:
+        lines = filter(lambda line: line.strip() != "", f)
+        while True:
+            records = [json.loads(line) for line in itertools.islice(lines, chunksize)]
+            if len(records) == 0:
+                break
+            chunk = pd.json_normalize(records).drop(
+                drop, axis="columns", errors="ignore"
+            )
+            chunk.index += rows
+            rows += len(chunk)
+            for column in chunk.columns:
+                series = chunk[column]
+                if column in dtype:
+                    series = series.astype(dtype[column])
+                pieces.setdefault(column, []).append(series)
+            del records, chunk
+
+    columns = {}
+    for column in list(pieces):
+        series = pd.concat(pieces.pop(column))
+        if len(series) < rows:
+            # Missing from some chunks
+            series = series.reindex(pd.RangeIndex(rows))
+        columns[column] = series
+    return pd.DataFrame(columns, copy=False).astype(dtype, copy=False)
+
+
 def count_nan(x: pd.Series | pd.DataFrame) -> int:
     if isinstance(x, pd.Series):
         return x.isnull().sum()
     return x.isnull().sum().sum()
 
 
+def map_unique(series: pd.Series, func: Callable[[pd.Series], pd.Series]) -> pd.Series:
+    # Values repeat a lot (e.g. fighter urls), so compute each distinct value once
+    codes, uniques = pd.factorize(series)
+    if len(uniques) == 0:
+        return series.copy()
+    mapped = func(pd.Series(uniques, dtype=series.dtype))
+    return pd.Series(mapped.array.take(codes, allow_fill=True), index=series.index)
+
+
 def shorten_url(url: pd.Series | str) -> pd.Series | str:
     if isinstance(url, pd.Series):
-        return url.map(lambda x: x.split("/")[-1], na_action="ignore").astype(url.dtype)
+        return map_unique(url, lambda x: x.str.extract(r"([^/]*)$", expand=False))
     return url.split("/")[-1]
 
 
@@ -193,8 +275,12 @@ def to_minutes(time: pd.Series | str, dtype="float32") -> pd.Series | float:
         min, sec = t.split(":")
         return float(min) + float(sec) / 60
 
+    def calc_minutes_vectorized(t: pd.Series) -> pd.Series:
+        split = t.str.extract(r"^([^:]*):([^:]*)$").astype("float64")
+        return split[0] + split[1] / 60
+
     if isinstance(time, pd.Series):
-        return time.map(calc_minutes, na_action="ignore").astype(dtype)
+        return map_unique(time, calc_minutes_vectorized).astype(dtype)
     return calc_minutes(time)
 
 
@@ -230,9 +316,9 @@ def fill_date_of_birth(profiles: pd.DataFrame, results: pd.DataFrame) -> pd.Data
         right_index=True,
         how="left",
     )
-    merged["mean_age_at_debut"] = merged.groupby(["weight_class", "sex"])[
-        "age_at_debut"
-    ].transform(lambda series: series.mean())
+    merged["mean_age_at_debut"] = group_means(
+        merged, "age_at_debut", ["weight_class", "sex"]
+    )
     merged["date_of_birth"].fillna(
         merged["date_at_debut"]
         - pd.to_timedelta(merged["mean_age_at_debut"] * 365.25, unit="d"),
@@ -247,31 +333,64 @@ def fill_date_of_birth(profiles: pd.DataFrame, results: pd.DataFrame) -> pd.Data
 def fill_height_and_reach(profiles: pd.DataFrame) -> pd.DataFrame:
     ret = profiles.copy()
     for column in ["height", "reach"]:
-        ret[column] = ret.groupby(["nationality", "sex", "weight_class"])[
-            column
-        ].transform(lambda series: series.fillna(series.mean()))
-        if count_nan(ret[column]) > 0:
-            ret[column] = ret.groupby(["sex", "weight_class"])[column].transform(
-                lambda series: series.fillna(series.mean())
-            )
-            if count_nan(ret[column]) > 0:
-                ret[column] = ret.groupby(["weight_class"])[column].transform(
-                    lambda series: series.fillna(series.mean())
-                )
-                if count_nan(ret[column]) > 0:
-                    ret[column] = ret.groupby(["sex"])[column].transform(
-                        lambda series: series.fillna(series.mean())
-                    )
+        ret[column] = fill_by_group_means(
+            ret,
+            column,
+            [
+                ["nationality", "sex", "weight_class"],
+                ["sex", "weight_class"],
+                ["weight_class"],
+                ["sex"],
+            ],
+        )
     return ret
 
 
-def fill_match_id(results: pd.DataFrame) -> pd.DataFrame:
-    def generate_match_id(row: pd.DataFrame) -> str:
-        id_a = min(row["fighter"], row["opponent"])
-        id_b = max(row["fighter"], row["opponent"])
-        match_id = id_a + "-vs-" + id_b + "-at-" + row["date"].strftime("%Y-%m-%d")
-        return match_id
+def group_means(
+    frame: pd.DataFrame, column: str | pd.Series, keys: list[str]
+) -> pd.Series:
+    # Mean of each group exactly as Series.mean computes it, nan for rows
+    # with a missing key. The built-in groupby mean sums in another order
+    # and may differ in the last bit of float32 columns.
+    values = frame[column] if isinstance(column, str) else column
+    codes = values.groupby([frame[key] for key in keys]).ngroup()
+    ret = pd.Series(np.nan, index=values.index, dtype=values.dtype)
+    valid = codes.notna().to_numpy()
+    if not valid.any():
+        return ret
+    codes = codes.to_numpy()[valid].astype("int64")
+    data = values.to_numpy()[valid]
+    missing = np.isnan(data)
+    order = np.argsort(codes, kind="stable")
+    sizes = np.bincount(codes)
+    counts = np.bincount(codes, weights=~missing).astype(values.dtype)
+
+    # One numpy sum per group over its values in row order, nan as 0
+    data = np.where(missing, 0, data).astype(values.dtype)
+    segments = np.split(data[order], np.cumsum(sizes)[:-1])
+    sums = np.array([segment.sum() for segment in segments], dtype=values.dtype)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = np.where(counts > 0, sums / counts, np.nan).astype(values.dtype)
+    ret[valid] = means[codes]
+    return ret
+
 
+def fill_by_group_means(
+    frame: pd.DataFrame, column: str, levels: list[list[str]]
+) -> pd.Series:
+    # Coalesce group means from the finest level to the coarsest,
+    # each level averaging over the values filled so far
+    filled = frame[column]
+    for keys in levels:
+        means = group_means(frame, filled, keys)
+        # Rows with a missing key fall out of the groups and are blanked
+        filled = filled.fillna(means).mask(frame[keys].isna().any(axis="columns"))
+        if count_nan(filled) == 0:
+            break
+    return filled
+
+
+def fill_match_id(results: pd.DataFrame) -> pd.DataFrame:
     ret = results.copy()
     mask = (
         results["match"].isna()
@@ -279,11 +398,17 @@ def fill_match_id(results: pd.DataFrame) -> pd.DataFrame:
         & ~results["opponent"].isna()
         & ~results["date"].isna()
     )
-    ret["match"].fillna(
-        results.loc[mask, ["fighter", "opponent", "date"]].apply(
-            generate_match_id, axis=1
-        ),
-        inplace=True,
+
+    # {min(fighter, opponent)}-vs-{max(fighter, opponent)}-at-{date}
+    fighter = results.loc[mask, "fighter"]
+    opponent = results.loc[mask, "opponent"]
+    swap = fighter > opponent
+    ret.loc[mask, "match"] = (
+        fighter.where(~swap, opponent)
+        + "-vs-"
+        + opponent.where(~swap, fighter)
+        + "-at-"
+        + results.loc[mask, "date"].dt.strftime("%Y-%m-%d")
     )
     return ret
 
@@ -315,9 +440,7 @@ def fill_weight(results: pd.DataFrame, profiles: pd.DataFrame) -> pd.DataFrame:
 
     # Fill weight limit
     copied["weight.limit"].fillna(
-        copied["weight.class"]
-        .map(lambda weight_class: to_weight_limit(weight_class))
-        .astype(copied["weight.limit"].dtype),
+        to_weight_limits(copied["weight.class"], dtype=copied["weight.limit"].dtype),
         inplace=True,
     )
 
@@ -332,13 +455,15 @@ def fill_weight(results: pd.DataFrame, profiles: pd.DataFrame) -> pd.DataFrame:
         copied["weight.class"] == consts.WEIGHT_CLASS_S_HEAVY
     )
     print(copied.loc[mask, ["weight.limit", "weight.class"]])
-    copied.loc[mask, "weight.limit"] = (
-        copied.loc[mask]
-        .groupby("fighter")["weight.limit"]
-        .transform(lambda series: series.fillna(series.mean()))
+    copied.loc[mask, "weight.limit"] = fill_by_group_means(
+        copied.loc[mask], "weight.limit", [["fighter"]]
     )
     return copied
 
 
+def to_weight_limits(weight_class: pd.Series, dtype="float32") -> pd.Series:
+    return weight_class.map(consts.WEIGHT_LIMITS_BY_CLASS).astype(dtype)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,12 @@
+from scrapy.settings import Settings
+from scrapy.spiderloader import SpiderLoader
+
+
+def get_store_name(settings: Settings, spider_name: str) -> str:
+    # Spiders reading the same pages share their cache and emitted items,
+    # see FightersSpider.store_name
+    try:
+        spidercls = SpiderLoader.from_settings(settings).load(spider_name)
+    except KeyError:
+        return spider_name
+    return getattr(spidercls, "store_name", spider_name)
@@ -0,0 +1,50 @@
+from pathlib import Path
+from scrapy.commands import ScrapyCommand
+from scrapy.exceptions import UsageError
+from scrapy.utils.project import data_path
+from ..httpcache import compact, get_db_path, import_filesystem_cache
+from . import get_store_name
+
+
+class Command(ScrapyCommand):
+    requires_project = True
+    default_settings = {"LOG_ENABLED": False}
+
+    def syntax(self) -> str:
+        return "[options] <spider>"
+
+    def short_desc(self) -> str:
+        return "Drop expired responses from the SQLite HTTP cache and reclaim space"
+
+    def add_options(self, parser) -> None:
+        super().add_options(parser)
+        parser.add_argument(
+            "--import-filesystem",
+            action="store_true",
+            help="import the spider's filesystem cache before compacting",
+        )
+
+    def run(self, args: list[str], opts) -> None:
+        if len(args) != 1:
+            raise UsageError()
+        settings = self.settings
+        spider_name = get_store_name(settings, args[0])
+        cachedir = data_path(settings["HTTPCACHE_DIR"], createdir=True)
+        dbpath = get_db_path(cachedir, spider_name)
+        expiration_secs = settings.getint("HTTPCACHE_EXPIRATION_SECS")
+        if opts.import_filesystem:
+            fsdir = Path(cachedir, spider_name)
+            if not fsdir.is_dir():
+                raise UsageError(f"No filesystem cache found in {fsdir}")
+            imported = import_filesystem_cache(
+                fsdir, dbpath, settings.getbool("HTTPCACHE_GZIP"), expiration_secs
+            )
+            print(f"Imported {imported} responses from {fsdir}")
+        if not dbpath.exists():
+            raise UsageError(f"No SQLite cache found in {dbpath}")
+        size = dbpath.stat().st_size
+        removed, remaining = compact(dbpath, expiration_secs)
+        print(
+            f"Removed {removed} expired responses, {remaining} left, "
+            f"{size / 2**20:.1f} MiB -> {dbpath.stat().st_size / 2**20:.1f} MiB"
+        )
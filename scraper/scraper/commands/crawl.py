@@ -0,0 +1,29 @@
+from scrapy.commands.crawl import Command as CrawlCommand
+from scrapy.exceptions import UsageError
+
+
+class Command(CrawlCommand):
+    def add_options(self, parser) -> None:
+        super().add_options(parser)
+        parser.add_argument(
+            "--checkpoint",
+            metavar="DIR",
+            help="checkpoint the crawl into DIR every CHECKPOINT_INTERVAL seconds",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="continue from the last checkpoint in --checkpoint DIR",
+        )
+
+    def process_options(self, args: list[str], opts) -> None:
+        if opts.resume:
+            if opts.checkpoint is None:
+                raise UsageError("--resume requires --checkpoint", print_help=False)
+            # Feeds are truncated to the checkpoint, then appended to
+            opts.output = (opts.output or []) + (opts.overwrite_output or [])
+            opts.overwrite_output = None
+        super().process_options(args, opts)
+        if opts.checkpoint is not None:
+            self.settings.set("CHECKPOINT_DIR", opts.checkpoint, priority="cmdline")
+            self.settings.set("CHECKPOINT_RESUME", opts.resume, priority="cmdline")
@@ -0,0 +1,67 @@
+import json
+import os
+from collections.abc import Generator
+from scrapy.commands import ScrapyCommand
+from scrapy.exceptions import UsageError
+from ..fingerprints import open_store
+from . import get_store_name
+
+
+class Command(ScrapyCommand):
+    requires_project = True
+    default_settings = {"LOG_ENABLED": False}
+
+    def syntax(self) -> str:
+        return "[options] <spider>"
+
+    def short_desc(self) -> str:
+        return "Show, seed or clear the items emitted across runs (-a emitted=skip)"
+
+    def add_options(self, parser) -> None:
+        super().add_options(parser)
+        parser.add_argument(
+            "--scope",
+            choices=["profile", "event"],
+            default="profile",
+            help="scope of the emitted items (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--import",
+            dest="feeds",
+            action="append",
+            default=[],
+            metavar="FILE",
+            help="mark the ids in FILE (.json or .jsonl) as emitted (may be repeated)",
+        )
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="forget every emitted item before importing",
+        )
+
+    def run(self, args: list[str], opts) -> None:
+        if len(args) != 1:
+            raise UsageError()
+        store = open_store(
+            self.settings, get_store_name(self.settings, args[0]), opts.scope
+        )
+        if opts.clear:
+            store.clear()
+            print("Cleared the emitted items")
+        for path in opts.feeds:
+            if not os.path.exists(path):
+                raise UsageError(f"No such feed: {path}", print_help=False)
+            added = store.update(item["id"] for item in read_feed(path))
+            print(f"Imported {added} new ids from {path}")
+        print(f"{len(store)} {opts.scope} items emitted by {args[0]}")
+        store.close()
+
+
+def read_feed(path: str) -> Generator[dict, None, None]:
+    with open(path, encoding="utf-8") as f:
+        if os.path.splitext(path)[1] == ".json":
+            yield from json.load(f)
+            return
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
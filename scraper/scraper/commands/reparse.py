@@ -0,0 +1,71 @@
+import os
+from scrapy.commands import ScrapyCommand
+from scrapy.exceptions import UsageError
+from scrapy.exporters import JsonItemExporter, JsonLinesItemExporter
+from scrapy.utils.conf import arglist_to_dict
+from ..offline import reparse
+
+
+class Command(ScrapyCommand):
+    requires_project = True
+
+    def syntax(self) -> str:
+        return "[options] <spider>"
+
+    def short_desc(self) -> str:
+        return "Re-run the spider callbacks over the HTTP cache without downloading"
+
+    def add_options(self, parser) -> None:
+        super().add_options(parser)
+        parser.add_argument(
+            "-a",
+            dest="spargs",
+            action="append",
+            default=[],
+            metavar="NAME=VALUE",
+            help="set spider argument (may be repeated)",
+        )
+        parser.add_argument(
+            "-o",
+            "--output",
+            metavar="FILE",
+            required=True,
+            help="dump scraped items into FILE (.json or .jsonl)",
+        )
+        parser.add_argument(
+            "-j",
+            "--processes",
+            type=int,
+            default=os.cpu_count(),
+            help="number of parser processes (default: %(default)s)",
+        )
+
+    def process_options(self, args: list[str], opts) -> None:
+        super().process_options(args, opts)
+        try:
+            opts.spargs = arglist_to_dict(opts.spargs)
+        except ValueError:
+            raise UsageError("Invalid -a value, use -a NAME=VALUE", print_help=False)
+
+    def run(self, args: list[str], opts) -> None:
+        if len(args) != 1:
+            raise UsageError()
+        ext = os.path.splitext(opts.output)[1]
+        if ext == ".json":
+            exporter_cls = JsonItemExporter
+        elif ext in [".jsonl", ".jl"]:
+            exporter_cls = JsonLinesItemExporter
+        else:
+            raise UsageError(f"Unsupported output format: {ext}", print_help=False)
+        with open(opts.output, "wb") as f:
+            exporter = exporter_cls(
+                f,
+                encoding=self.settings["FEED_EXPORT_ENCODING"],
+                indent=self.settings.getint("FEED_EXPORT_INDENT"),
+            )
+            exporter.start_exporting()
+            stats = reparse(
+                self.settings, args[0], opts.spargs, exporter, processes=opts.processes
+            )
+            exporter.finish_exporting()
+        print(f"Parsed {stats['pages']} pages into {stats['items']} items")
@@ -0,0 +1,149 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from scrapy.commands import ScrapyCommand
+from scrapy.exceptions import UsageError
+from scrapy.exporters import JsonItemExporter, JsonLinesItemExporter
+from scrapy.spiderloader import SpiderLoader
+from scrapy.utils.conf import arglist_to_dict
+from ..sharding import SHARD_MODES, merge_feeds
+
+# Each shard throttles on its own, these keep the combined live rate unchanged.
+# Cached responses never reach the download slots, so parsing still scales.
+SCALED_DELAYS = ["DOWNLOAD_DELAY", "ADAPTIVE_THROTTLE_MIN_DELAY"]
+
+
+class Command(ScrapyCommand):
+    requires_project = True
+
+    def syntax(self) -> str:
+        return "[options] <spider>"
+
+    def short_desc(self) -> str:
+        return "Run a spider in several processes and merge their feeds"
+
+    def add_options(self, parser) -> None:
+        super().add_options(parser)
+        parser.add_argument(
+            "-a",
+            dest="spargs",
+            action="append",
+            default=[],
+            metavar="NAME=VALUE",
+            help="set spider argument (may be repeated)",
+        )
+        parser.add_argument(
+            "-o",
+            "--output",
+            metavar="FILE",
+            required=True,
+            help="dump scraped items into FILE (.json or .jsonl)",
+        )
+        parser.add_argument(
+            "-n",
+            "--shards",
+            type=int,
+            default=os.cpu_count(),
+            help="number of crawler processes (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--shard-by",
+            choices=SHARD_MODES,
+            default="weight_class",
+            help="split the start urls by weight class or fighter urls by hash "
+            "(default: %(default)s)",
+        )
+        parser.add_argument(
+            "--workdir",
+            metavar="DIR",
+            help="keep the per-shard feeds and logs in DIR",
+        )
+
+    def process_options(self, args: list[str], opts) -> None:
+        super().process_options(args, opts)
+        try:
+            opts.spargs = arglist_to_dict(opts.spargs)
+        except ValueError:
+            raise UsageError("Invalid -a value, use -a NAME=VALUE", print_help=False)
+
+    def run(self, args: list[str], opts) -> None:
+        if len(args) != 1:
+            raise UsageError()
+        if opts.shards < 1:
+            raise UsageError("--shards must be positive", print_help=False)
+        try:
+            spidercls = SpiderLoader.from_settings(self.settings).load(args[0])
+        except KeyError:
+            raise UsageError(f"Spider not found: {args[0]}", print_help=False)
+        if not getattr(spidercls, "supports_sharding", False):
+            # Every shard would crawl everything
+            raise UsageError(
+                f"Spider {args[0]} does not support sharding", print_help=False
+            )
+        if "state" in opts.spargs:
+            # Every shard would overwrite the same state file
+            raise UsageError("Incremental state is not supported", print_help=False)
+        ext = os.path.splitext(opts.output)[1]
+        if ext == ".json":
+            exporter_cls = JsonItemExporter
+        elif ext in [".jsonl", ".jl"]:
+            exporter_cls = JsonLinesItemExporter
+        else:
+            raise UsageError(f"Unsupported output format: {ext}", print_help=False)
+
+        if opts.workdir is None:
+            workdir = Path(tempfile.mkdtemp(prefix="shardcrawl-"))
+        else:
+            workdir = Path(opts.workdir)
+            workdir.mkdir(parents=True, exist_ok=True)
+        if self.run_shards(args[0], opts, workdir, exporter_cls):
+            if opts.workdir is None:
+                shutil.rmtree(workdir)
+        else:
+            # Keep the logs of the failed shards around
+            self.exitcode = 1
+
+    def run_shards(self, spider_name: str, opts, workdir: Path, exporter_cls) -> bool:
+        settings = list(opts.set)
+        for name in SCALED_DELAYS:
+            settings.append(f"{name}={self.settings.getfloat(name) * opts.shards}")
+        # Claims only hold for one crawl
+        for path in workdir.glob("claims.sqlite3*"):
+            path.unlink()
+        settings.append(f"SHARD_CLAIMS={workdir / 'claims.sqlite3'}")
+
+        feeds, processes = [], []
+        for index in range(opts.shards):
+            feed = workdir / f"shard-{index}.jsonl"
+            feeds.append(feed)
+            command = [sys.executable, "-m", "scrapy", "crawl", spider_name]
+            for name, value in opts.spargs.items():
+                command += ["-a", f"{name}={value}"]
+            command += ["-a", f"shard={index}/{opts.shards}"]
+            command += ["-a", f"shard_by={opts.shard_by}"]
+            for setting in settings:
+                command += ["-s", setting]
+            command += ["-O", f"{feed}:jsonlines"]
+            command += ["--logfile", str(workdir / f"shard-{index}.log")]
+            processes.append(subprocess.Popen(command))
+        print(f"Started {opts.shards} shards, logs in {workdir}")
+
+        failed = [i for i, p in enumerate(processes) if p.wait() != 0]
+        if failed:
+            print(f"Shards {failed} failed, see the logs in {workdir}")
+            return False
+
+        with open(opts.output, "wb") as f:
+            exporter = exporter_cls(
+                f,
+                encoding=self.settings["FEED_EXPORT_ENCODING"],
+                indent=self.settings.getint("FEED_EXPORT_INDENT"),
+            )
+            exporter.start_exporting()
+            merged = merge_feeds(feeds, exporter)
+            exporter.finish_exporting()
+        print(f"Merged {merged} items from {opts.shards} shards into {opts.output}")
+        return True
@@ -0,0 +1,135 @@
+import os
+import pickle
+import sqlite3
+import tempfile
+from collections.abc import Iterator, MutableMapping
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS queue (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    value TEXT NOT NULL
+)
+"""
+
+DICT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dict (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL
+)
+"""
+
+
+def open_temporary(dirpath: str, prefix: str) -> tuple[Path, sqlite3.Connection]:
+    # Nothing is synced, the file does not outlive the process
+    fd, path = tempfile.mkstemp(prefix=prefix, suffix=".sqlite3", dir=dirpath)
+    os.close(fd)
+    db = sqlite3.connect(path, isolation_level=None)
+    db.execute("PRAGMA journal_mode = MEMORY")
+    db.execute("PRAGMA synchronous = OFF")
+    return Path(path), db
+
+
+class TemporaryStore:
+    # Temporary SQLite file, removed on close
+    table = ""
+    schema = ""
+
+    def __init__(self, dirpath: str, prefix: str) -> None:
+        self.path, self.db = open_temporary(dirpath, prefix)
+        self.db.execute(self.schema)
+        self.size = 0
+
+    @classmethod
+    def from_snapshot(cls, path: Path) -> "TemporaryStore":
+        store = cls(str(path.parent))
+        store.load(path)
+        return store
+
+    def snapshot(self, path: Path) -> Path:
+        # Consistent copy for checkpoints, page by page instead of row by row
+        dst = sqlite3.connect(path)
+        try:
+            self.db.backup(dst)
+        finally:
+            dst.close()
+        return path
+
+    def load(self, path: Path) -> None:
+        # Replaces the contents with a snapshot
+        src = sqlite3.connect(path)
+        try:
+            src.backup(self.db)
+        finally:
+            src.close()
+        self.size = self.db.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def __len__(self) -> int:
+        return self.size
+
+    def close(self) -> None:
+        self.db.close()
+        self.path.unlink(missing_ok=True)
+
+
+class DiskQueue(TemporaryStore):
+    # FIFO of strings
+    table = "queue"
+    schema = SCHEMA
+
+    def __init__(self, dirpath: str, prefix: str = "queue-") -> None:
+        super().__init__(dirpath, prefix)
+
+    def push(self, value: str) -> None:
+        self.db.execute("INSERT INTO queue (value) VALUES (?)", (value,))
+        self.size += 1
+
+    def pop(self) -> str | None:
+        row = self.db.execute(
+            "SELECT id, value FROM queue ORDER BY id LIMIT 1"
+        ).fetchone()
+        if row is None:
+            return None
+        self.db.execute("DELETE FROM queue WHERE id = ?", (row[0],))
+        self.size -= 1
+        return row[1]
+
+    def __iter__(self) -> Iterator[str]:
+        for (value,) in self.db.execute("SELECT value FROM queue ORDER BY id"):
+            yield value
+
+
+class DiskDict(TemporaryStore, MutableMapping):
+    # Pickled values by string keys
+    table = "dict"
+    schema = DICT_SCHEMA
+
+    def __init__(self, dirpath: str, prefix: str = "dict-") -> None:
+        super().__init__(dirpath, prefix)
+
+    def __getitem__(self, key: str):
+        row = self.db.execute("SELECT value FROM dict WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return pickle.loads(row[0])
+
+    def __setitem__(self, key: str, value) -> None:
+        if key not in self:
+            self.size += 1
+        self.db.execute(
+            "INSERT OR REPLACE INTO dict (key, value) VALUES (?, ?)",
+            (key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)),
+        )
+
+    def __delitem__(self, key: str) -> None:
+        if self.db.execute("DELETE FROM dict WHERE key = ?", (key,)).rowcount == 0:
+            raise KeyError(key)
+        self.size -= 1
+
+    def __contains__(self, key: object) -> bool:
+        row = self.db.execute("SELECT 1 FROM dict WHERE key = ?", (key,)).fetchone()
+        return row is not None
+
+    def __iter__(self) -> Iterator[str]:
+        for (key,) in self.db.execute("SELECT key FROM dict ORDER BY rowid"):
+            yield key
@@ -0,0 +1,349 @@
+import json
+import logging
+import os
+import pickle
+import shutil
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from scrapy import Spider, signals
+from scrapy.crawler import Crawler
+from scrapy.exceptions import NotConfigured
+from scrapy.extensions.feedexport import FeedExporter
+from scrapy.http import Request, Response
+from scrapy.utils.misc import load_object
+from scrapy.utils.request import request_from_dict
+from twisted.internet import task
+from w3lib.url import file_uri_to_path
+from . import timing
+from .scheduler import CacheAwareScheduler
+from .tapology import memo
+from .tapology.errors import NormalizeError, ParseError
+
+logger = logging.getLogger(__name__)
+
+
+class MemoStats:
+    def __init__(self, crawler: Crawler) -> None:
+        self.crawler = crawler
+        crawler.signals.connect(self.spider_closed, signal=signals.spider_closed)
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "MemoStats":
+        return cls(crawler)
+
+    def spider_closed(self, spider: Spider, reason: str) -> None:
+        for name, stats in memo.get_stats().items():
+            if stats["hits"] + stats["misses"] == 0:
+                continue
+            for key, value in stats.items():
+                self.crawler.stats.set_value(f"memo/{name}/{key}", value, spider=spider)
+            logger.info(
+                "Memo %(name)s: hit rate %(hit_rate).1f%% "
+                "(%(hits)d hits, %(misses)d misses, %(evictions)d evictions)",
+                {**stats, "name": name, "hit_rate": stats["hit_rate"] * 100},
+                extra={"spider": spider},
+            )
+
+
+class ErrorCounter(logging.Handler):
+    # Counts the normalize and parse errors logged by spiders per property
+    def __init__(self, crawler: Crawler) -> None:
+        super().__init__()
+        self.crawler = crawler
+
+    def emit(self, record: logging.LogRecord) -> None:
+        e = record.msg
+        if isinstance(e, (NormalizeError, ParseError)):
+            key = f"errors/{type(e).__name__}/{e.property}"
+            self.crawler.stats.inc_value(key)
+
+
+class TimingStats:
+    # Per-callback timings and throughput, optionally appended to
+    # TIMING_STATS_FILE as JSON Lines every TIMING_STATS_INTERVAL seconds
+    def __init__(self, crawler: Crawler) -> None:
+        self.crawler = crawler
+        self.path = crawler.settings.get("TIMING_STATS_FILE")
+        self.interval = crawler.settings.getfloat("TIMING_STATS_INTERVAL", 60.0)
+        self.handler = ErrorCounter(crawler)
+        self.started = None
+        self.last = None
+        self.task = None
+        crawler.signals.connect(self.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(self.spider_closed, signal=signals.spider_closed)
+        crawler.signals.connect(
+            self.response_received, signal=signals.response_received
+        )
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "TimingStats":
+        return cls(crawler)
+
+    def spider_opened(self, spider: Spider) -> None:
+        self.started = time.monotonic()
+        self.last = (self.started, 0, 0)
+        logging.getLogger(spider.name).addHandler(self.handler)
+        if self.path:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self.task = task.LoopingCall(self.write, spider)
+            self.task.start(self.interval, now=False)
+
+    def spider_closed(self, spider: Spider, reason: str) -> None:
+        logging.getLogger(spider.name).removeHandler(self.handler)
+        if self.task is not None and self.task.running:
+            self.task.stop()
+        stats = self.crawler.stats
+        for name, timer_stats in timing.get_stats().items():
+            if timer_stats["calls"] == 0:
+                continue
+            for key, value in timer_stats.items():
+                stats.set_value(f"timing/{name}/{key}", value, spider=spider)
+            logger.info(
+                "Timing %(name)s: %(calls)d calls, %(wall).2fs wall, "
+                "%(cpu).2fs cpu, %(wall_mean_ms).2fms mean, %(wall_max_ms).2fms max",
+                {
+                    **timer_stats,
+                    "name": name,
+                    "wall_mean_ms": timer_stats["wall_mean"] * 1000,
+                    "wall_max_ms": timer_stats["wall_max"] * 1000,
+                },
+                extra={"spider": spider},
+            )
+        metrics = self.get_metrics(spider)
+        for key in ["items_per_sec", "requests_per_sec"]:
+            stats.set_value(f"throughput/{key}", metrics[key], spider=spider)
+        if self.path:
+            self.write(spider, metrics)
+
+    def response_received(self, response: Response, request: Request) -> None:
+        # Network time of live downloads, the cache is timed on its own
+        if "cached" in response.flags:
+            return
+        latency = request.meta.get("download_latency")
+        if latency is not None:
+            timing.get_timer("download").observe(latency)
+
+    def get_metrics(self, spider: Spider) -> dict:
+        stats = self.crawler.stats
+        now = time.monotonic()
+        items = stats.get_value("item_scraped_count", 0)
+        requests = stats.get_value("response_received_count", 0)
+        elapsed = now - self.started
+        last_time, last_items, last_requests = self.last
+        self.last = (now, items, requests)
+        since = now - last_time
+        return {
+            "time": datetime.now(timezone.utc).isoformat(),
+            "spider": spider.name,
+            "scope": getattr(spider, "scope", None),
+            "elapsed": elapsed,
+            "items": items,
+            "requests": requests,
+            "items_per_sec": items / elapsed if elapsed > 0 else 0.0,
+            "requests_per_sec": requests / elapsed if elapsed > 0 else 0.0,
+            # Rates since the previous line of the metrics file
+            "recent_items_per_sec": (items - last_items) / since if since > 0 else 0.0,
+            "recent_requests_per_sec": (
+                (requests - last_requests) / since if since > 0 else 0.0
+            ),
+            "timing": {
+                name: timer_stats
+                for name, timer_stats in timing.get_stats().items()
+                if timer_stats["calls"] > 0
+            },
+            "errors": {
+                key.removeprefix("errors/"): value
+                for key, value in stats.get_stats().items()
+                if key.startswith("errors/")
+            },
+        }
+
+    def write(self, spider: Spider, metrics: dict | None = None) -> None:
+        if metrics is None:
+            metrics = self.get_metrics(spider)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(metrics) + "\n")
+
+
+class Checkpoint:
+    # Periodic consistent snapshot of a crawl, see `scrapy crawl --resume`
+    def __init__(self, crawler: Crawler) -> None:
+        settings = crawler.settings
+        dirpath = settings.get("CHECKPOINT_DIR")
+        if not dirpath:
+            raise NotConfigured
+        if settings.get("JOBDIR"):
+            raise NotConfigured("JOBDIR persists the crawl on its own")
+        # Only its queued set tells the requests waiting in the queues. Not
+        # issubclass, which scheduler classes answer by duck typing.
+        if CacheAwareScheduler not in load_object(settings["SCHEDULER"]).__mro__:
+            raise NotConfigured(
+                f"Checkpoints need the CacheAwareScheduler, not {settings['SCHEDULER']}"
+            )
+        self.crawler = crawler
+        self.path = Path(dirpath, "checkpoint.pickle")
+        # Files the spider copies next to each checkpoint, by generation
+        self.snapshots = Path(dirpath, "snapshots")
+        self.generation = 0
+        self.interval = settings.getfloat("CHECKPOINT_INTERVAL", 300.0)
+        feeds = settings.getdict("FEEDS")
+        for uri, options in feeds.items():
+            if options.get("format") not in ["jsonlines", "jsonl", "jl"]:
+                raise ValueError(f"Checkpoints need JSON Lines feeds: {uri}")
+        self.restored = None
+        if settings.getbool("CHECKPOINT_RESUME") and self.path.exists():
+            for uri, options in feeds.items():
+                if options.get("overwrite"):
+                    raise ValueError(f"Resuming would overwrite {uri}")
+            with open(self.path, "rb") as f:
+                self.restored = pickle.load(f)
+            # Items written after the checkpoint come again from its requests
+            for path, offset in self.restored["feeds"].items():
+                if os.path.exists(path):
+                    os.truncate(path, offset)
+            if self.restored["requests"] is None:
+                # Killed before the first checkpoint
+                self.restored = None
+            else:
+                self.generation = self.restored.get("generation", 0)
+        Path(dirpath).mkdir(parents=True, exist_ok=True)
+        # Byte offsets of the items written so far
+        self.feeds = {}
+        for uri, options in feeds.items():
+            path = file_uri_to_path(uri)
+            if options.get("overwrite") or not os.path.exists(path):
+                self.feeds[path] = 0
+            else:
+                self.feeds[path] = os.path.getsize(path)
+        if self.restored is None:
+            self.write({"requests": None, "feeds": dict(self.feeds)})
+            self.remove_snapshots()
+        self.task = None
+        crawler.signals.connect(self.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(self.spider_closed, signal=signals.spider_closed)
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "Checkpoint":
+        return cls(crawler)
+
+    def spider_opened(self, spider: Spider) -> None:
+        if self.restored is not None:
+            self.restore(spider)
+        self.task = task.LoopingCall(self.pause, spider)
+        self.task.start(self.interval, now=False)
+
+    def spider_closed(self, spider: Spider, reason: str) -> None:
+        if self.task is not None and self.task.running:
+            self.task.stop()
+        if reason == "finished":
+            # Resuming a finished crawl does nothing
+            for slot in get_feed_slots(self.crawler):
+                if slot.file is not None and not slot.file.closed:
+                    slot.file.flush()
+            for path in self.feeds:
+                if os.path.exists(path):
+                    self.feeds[path] = os.path.getsize(path)
+            self.write(
+                {"requests": [], "seen": set(), "spider": None, "feeds": self.feeds}
+            )
+            self.remove_snapshots()
+
+    def restore(self, spider: Spider) -> None:
+        engine = self.crawler.engine
+        # Replaces the start requests, which were exhausted before the checkpoint
+        engine.slot.start_requests = iter(
+            [request_from_dict(d, spider=spider) for d in self.restored["requests"]]
+        )
+        engine.slot.scheduler.df.fingerprints.update(self.restored["seen"])
+        if self.restored["spider"] is not None and hasattr(spider, "restore"):
+            spider.restore(self.restored["spider"])
+        logger.info(
+            "Resumed from %(path)s with %(requests)d requests",
+            {"path": self.path, "requests": len(self.restored["requests"])},
+            extra={"spider": spider},
+        )
+        self.restored = None
+
+    def pause(self, spider: Spider) -> None:
+        engine = self.crawler.engine
+        if engine.slot is None or engine.slot.closing or engine.paused:
+            return
+        if engine.slot.start_requests is not None:
+            return
+        engine.pause()
+        self.wait(spider)
+
+    def wait(self, spider: Spider) -> None:
+        # A callback that is half consumed would be replayed in full
+        engine = self.crawler.engine
+        if engine.slot is None or engine.slot.closing:
+            return
+        if engine.scraper.slot.active:
+            from twisted.internet import reactor
+
+            reactor.callLater(0.1, self.wait, spider)
+            return
+        try:
+            self.save(spider)
+        finally:
+            engine.unpause()
+            engine.slot.nextcall.schedule()
+
+    def save(self, spider: Spider) -> None:
+        engine = self.crawler.engine
+        for slot in get_feed_slots(self.crawler):
+            path = getattr(slot.storage, "path", None)
+            if path in self.feeds and slot.file is not None:
+                slot.file.flush()
+                os.fsync(slot.file.fileno())
+                self.feeds[path] = slot.file.tell()
+        df = engine.slot.scheduler.df
+        requests = list(engine.slot.scheduler.queued) + list(engine.slot.inprogress)
+        # Left out so that the restored requests pass the dupefilter again
+        frontier = {df.request_fingerprint(r) for r in requests}
+        # The snapshots of the checkpoint on disk stay until it is replaced
+        generation = self.generation + 1
+        snapshots = self.snapshots / str(generation)
+        snapshots.mkdir(parents=True, exist_ok=True)
+        checkpoint = {
+            "requests": [r.to_dict(spider=spider) for r in requests],
+            "seen": df.fingerprints - frontier,
+            "spider": (
+                spider.checkpoint(snapshots) if hasattr(spider, "checkpoint") else None
+            ),
+            "feeds": dict(self.feeds),
+            "generation": generation,
+        }
+        self.write(checkpoint)
+        self.generation = generation
+        self.remove_snapshots(keep=generation)
+        if hasattr(spider, "record_emitted"):
+            spider.record_emitted()
+        logger.info(
+            "Checkpointed %(requests)d requests into %(path)s",
+            {"requests": len(requests), "path": self.path},
+            extra={"spider": spider},
+        )
+
+    def write(self, checkpoint: dict) -> None:
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(checkpoint, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def remove_snapshots(self, keep: int | None = None) -> None:
+        if not self.snapshots.exists():
+            return
+        for path in self.snapshots.iterdir():
+            if path.name != str(keep):
+                shutil.rmtree(path, ignore_errors=True)
+
+
+def get_feed_slots(crawler: Crawler) -> list:
+    for extension in crawler.extensions.middlewares:
+        if isinstance(extension, FeedExporter):
+            return extension.slots
+    return []
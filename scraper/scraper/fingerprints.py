@@ -0,0 +1,188 @@
+import fcntl
+import hashlib
+import math
+import mmap
+import os
+import sqlite3
+import struct
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from scrapy.settings import Settings
+from scrapy.utils.project import data_path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS fingerprints (
+    key TEXT PRIMARY KEY
+)
+"""
+
+# Written last, a filter that was never completed is built again
+BLOOM_MAGIC = b"BLM2"
+BLOOM_HEADER = struct.Struct("<4sIQ")
+
+
+class BloomFilter:
+    # Bit array in a shared mmap, so every process of a crawl sees the same
+    # bits. The file is only built and its bits only set under a lock, it is
+    # never replaced while other processes may have it mapped.
+    def __init__(
+        self,
+        path: Path,
+        capacity: int,
+        error_rate: float,
+        keys: Callable[[], Iterable[str]],
+    ) -> None:
+        bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.bits = (bits + 7) // 8 * 8
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        header = BLOOM_HEADER.pack(BLOOM_MAGIC, self.hashes, self.bits)
+        size = BLOOM_HEADER.size + self.bits // 8
+        self.lock = open(path.with_name(f"{path.name}.lock"), "wb")
+        with self.locked():
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                if os.pread(fd, BLOOM_HEADER.size, 0) == header:
+                    self.mm = mmap.mmap(fd, size)
+                    return
+                # Missing, sized for other settings or never completed
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, size)
+                self.mm = mmap.mmap(fd, size)
+            finally:
+                os.close(fd)
+            for key in keys():
+                self.set_bits(key)
+            self.mm[: BLOOM_HEADER.size] = header
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        fcntl.flock(self.lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self.lock, fcntl.LOCK_UN)
+
+    def get_positions(self, key: str) -> Iterable[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1, h2 = struct.unpack("<QQ", digest)
+        for i in range(self.hashes):
+            yield BLOOM_HEADER.size * 8 + (h1 + i * h2) % self.bits
+
+    def __contains__(self, key: str) -> bool:
+        mm = self.mm
+        for pos in self.get_positions(key):
+            if not mm[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+    def set_bits(self, key: str) -> None:
+        # Read-modify-write of whole bytes, only under the lock
+        mm = self.mm
+        for pos in self.get_positions(key):
+            mm[pos >> 3] |= 1 << (pos & 7)
+
+    def add(self, key: str) -> None:
+        with self.locked():
+            self.set_bits(key)
+
+    def update(self, keys: Iterable[str]) -> None:
+        with self.locked():
+            for key in keys:
+                self.set_bits(key)
+
+    def clear(self) -> None:
+        with self.locked():
+            self.mm[BLOOM_HEADER.size :] = bytes(self.bits // 8)
+
+    def close(self) -> None:
+        self.mm.close()
+        self.lock.close()
+
+
+class FingerprintStore:
+    # Exact set of keys in SQLite, optionally fronted by a Bloom filter
+    # that answers most misses without a query
+    def __init__(
+        self, path: Path, capacity: int | None = None, error_rate: float = 0.001
+    ) -> None:
+        self.db = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.execute("PRAGMA synchronous = NORMAL")
+        self.db.execute(SCHEMA)
+        self.added: set[str] = set()
+        self.bloom = None
+        if capacity is not None:
+            self.bloom = BloomFilter(
+                path.with_suffix(".bloom"), capacity, error_rate, self.iter_keys
+            )
+
+    def iter_keys(self) -> Iterator[str]:
+        for (key,) in self.db.execute("SELECT key FROM fingerprints"):
+            yield key
+
+    def __contains__(self, key: str) -> bool:
+        if key in self.added:
+            return True
+        if self.bloom is not None and key not in self.bloom:
+            return False
+        row = self.db.execute(
+            "SELECT 1 FROM fingerprints WHERE key = ?", (key,)
+        ).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM fingerprints").fetchone()[0]
+
+    def add(self, key: str) -> bool:
+        # True only for the first caller across runs and processes
+        if key in self.added:
+            return False
+        self.added.add(key)
+        cursor = self.db.execute(
+            "INSERT OR IGNORE INTO fingerprints VALUES (?)", (key,)
+        )
+        if self.bloom is not None:
+            self.bloom.add(key)
+        return cursor.rowcount == 1
+
+    def update(self, keys: Iterable[str]) -> int:
+        keys = [key for key in dict.fromkeys(keys) if key not in self.added]
+        self.added.update(keys)
+        added = 0
+        self.db.execute("BEGIN")
+        for key in keys:
+            added += self.db.execute(
+                "INSERT OR IGNORE INTO fingerprints VALUES (?)", (key,)
+            ).rowcount
+        if self.bloom is not None:
+            # One lock for the whole batch
+            self.bloom.update(keys)
+        self.db.execute("COMMIT")
+        return added
+
+    def clear(self) -> None:
+        self.db.execute("DELETE FROM fingerprints")
+        self.added.clear()
+        if self.bloom is not None:
+            self.bloom.clear()
+
+    def close(self) -> None:
+        if self.bloom is not None:
+            self.bloom.close()
+        self.db.close()
+
+
+def get_store_path(settings: Settings, spider_name: str, scope: str) -> Path:
+    dirpath = data_path(
+        settings.get("FINGERPRINTS_DIR", "fingerprints"), createdir=True
+    )
+    return Path(dirpath, f"{spider_name}-{scope}.sqlite3")
+
+
+def open_store(settings: Settings, spider_name: str, scope: str) -> FingerprintStore:
+    return FingerprintStore(
+        get_store_path(settings, spider_name, scope),
+        capacity=settings.getint("FINGERPRINTS_CAPACITY", 1_000_000),
+        error_rate=settings.getfloat("FINGERPRINTS_ERROR_RATE", 0.001),
+    )
@@ -0,0 +1,176 @@
+import gzip
+import logging
+import os
+import pickle
+import sqlite3
+import zlib
+from pathlib import Path
+from time import time
+from scrapy import Spider
+from scrapy.http import Request, Response
+from scrapy.http.headers import Headers
+from scrapy.responsetypes import responsetypes
+from scrapy.settings import Settings
+from scrapy.utils.project import data_path
+from w3lib.http import headers_dict_to_raw, headers_raw_to_dict
+from .timing import timed
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    fingerprint TEXT PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    url TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    compressed INTEGER NOT NULL,
+    headers BLOB NOT NULL,
+    body BLOB NOT NULL
+)
+"""
+
+
+class SqliteCacheStorage:
+    def __init__(self, settings: Settings) -> None:
+        self.cachedir = data_path(settings["HTTPCACHE_DIR"], createdir=True)
+        self.expiration_secs = settings.getint("HTTPCACHE_EXPIRATION_SECS")
+        self.use_gzip = settings.getbool("HTTPCACHE_GZIP")
+        self.db = None
+
+    def open_spider(self, spider: Spider) -> None:
+        dbpath = get_db_path(self.cachedir, getattr(spider, "store_name", spider.name))
+        self.db = connect(dbpath)
+        self._fingerprinter = spider.crawler.request_fingerprinter
+        logger.debug(
+            "Using SQLite cache storage in %(cachepath)s",
+            {"cachepath": dbpath},
+            extra={"spider": spider},
+        )
+
+    def close_spider(self, spider: Spider) -> None:
+        self.db.close()
+
+    @timed()
+    def has_response(self, spider: Spider, request: Request) -> bool:
+        row = self.db.execute(
+            "SELECT timestamp FROM responses WHERE fingerprint = ?",
+            (self.get_key(request),),
+        ).fetchone()
+        return row is not None and not self.is_expired(row[0], request)
+
+    @timed()
+    def retrieve_response(self, spider: Spider, request: Request) -> Response | None:
+        row = self.db.execute(
+            "SELECT timestamp, url, status, compressed, headers, body FROM responses WHERE fingerprint = ?",
+            (self.get_key(request),),
+        ).fetchone()
+        if row is None:
+            return  # not cached
+        timestamp, url, status, compressed, headers, body = row
+        if self.is_expired(timestamp, request):
+            return  # expired
+        if compressed:
+            headers, body = zlib.decompress(headers), zlib.decompress(body)
+        headers = Headers(headers_raw_to_dict(headers))
+        respcls = responsetypes.from_args(headers=headers, url=url, body=body)
+        return respcls(url=url, headers=headers, status=status, body=body)
+
+    @timed()
+    def store_response(
+        self, spider: Spider, request: Request, response: Response
+    ) -> None:
+        headers = headers_dict_to_raw(response.headers)
+        body = response.body
+        if self.use_gzip:
+            headers, body = zlib.compress(headers), zlib.compress(body)
+        self.db.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                self.get_key(request),
+                time(),
+                response.url,
+                response.status,
+                self.use_gzip,
+                headers,
+                body,
+            ),
+        )
+        # Right away, other processes sharing the cache wait on the write lock
+        self.db.commit()
+
+    def get_key(self, request: Request) -> str:
+        return self._fingerprinter.fingerprint(request).hex()
+
+    def is_expired(self, timestamp: float, request: Request) -> bool:
+        # Per-request override, e.g. from the incremental crawl state
+        max_age = request.meta.get("cache_max_age", self.expiration_secs)
+        return 0 < max_age < time() - timestamp
+
+
+def get_db_path(cachedir: str, spider_name: str) -> Path:
+    return Path(cachedir, f"{spider_name}.sqlite3")
+
+
+def connect(dbpath: Path) -> sqlite3.Connection:
+    # WAL lets several crawler processes share one cache
+    db = sqlite3.connect(dbpath, timeout=60)
+    db.execute("PRAGMA journal_mode = WAL")
+    db.execute("PRAGMA synchronous = NORMAL")
+    db.execute(SCHEMA)
+    return db
+
+
+def compact(dbpath: Path, expiration_secs: int) -> tuple[int, int]:
+    db = connect(dbpath)
+    removed = 0
+    if expiration_secs > 0:
+        removed = db.execute(
+            "DELETE FROM responses WHERE timestamp < ?", (time() - expiration_secs,)
+        ).rowcount
+    db.commit()
+    db.execute("VACUUM")
+    remaining = db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+    db.close()
+    return removed, remaining
+
+
+def import_filesystem_cache(
+    fsdir: Path, dbpath: Path, use_gzip: bool, expiration_secs: int
+) -> int:
+    db = connect(dbpath)
+    imported = 0
+    for metapath in fsdir.glob("*/*/pickled_meta"):
+        rpath = metapath.parent
+        if 0 < expiration_secs < time() - metapath.stat().st_mtime:
+            continue
+        meta = pickle.loads(read_maybe_gzipped(metapath))
+        headers = read_maybe_gzipped(rpath / "response_headers")
+        body = read_maybe_gzipped(rpath / "response_body")
+        if use_gzip:
+            headers, body = zlib.compress(headers), zlib.compress(body)
+        db.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                rpath.name,
+                os.path.getmtime(metapath),
+                meta["response_url"],
+                meta["status"],
+                use_gzip,
+                headers,
+                body,
+            ),
+        )
+        imported += 1
+        if imported % 1000 == 0:
+            db.commit()
+    db.commit()
+    db.close()
+    return imported
+
+
+def read_maybe_gzipped(path: Path) -> bytes:
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:2] == b"\x1f\x8b":
+        return gzip.decompress(data)
+    return data
@@ -0,0 +1,305 @@
+import asyncio
+import logging
+import math
+import multiprocessing
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+from scrapy import Spider, signals
+from scrapy.crawler import Crawler
+from scrapy.exceptions import IgnoreRequest, NotConfigured
+from scrapy.http import Request, Response, TextResponse
+from scrapy.utils.httpobj import urlparse_cached
+from scrapy.utils.reactor import is_asyncio_reactor_installed
+from twisted.internet import task
+from .timing import get_timer
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ThrottleState:
+    latency: float | None = None
+    successes: int = 0
+    live: int = 0
+    cached: int = 0
+    backoffs: int = 0
+    counted_at: float = field(default_factory=time.monotonic)
+    live_prev: int = 0
+    cached_prev: int = 0
+    live_rate: float = 0.0
+    cached_rate: float = 0.0
+
+
+class AdaptiveThrottleMiddleware:
+    def __init__(self, crawler: Crawler) -> None:
+        settings = crawler.settings
+        if not settings.getbool("ADAPTIVE_THROTTLE_ENABLED"):
+            raise NotConfigured
+        self.crawler = crawler
+        self.target_latency = settings.getfloat("ADAPTIVE_THROTTLE_TARGET_LATENCY", 2.0)
+        self.min_delay = settings.getfloat("ADAPTIVE_THROTTLE_MIN_DELAY", 0.5)
+        self.max_delay = settings.getfloat("ADAPTIVE_THROTTLE_MAX_DELAY", 60.0)
+        self.min_concurrency = settings.getint("ADAPTIVE_THROTTLE_MIN_CONCURRENCY", 1)
+        self.max_concurrency = settings.getint("ADAPTIVE_THROTTLE_MAX_CONCURRENCY", 8)
+        self.speedup_after = settings.getint("ADAPTIVE_THROTTLE_SPEEDUP_AFTER", 10)
+        self.backoff_codes = set(
+            map(int, settings.getlist("ADAPTIVE_THROTTLE_BACKOFF_CODES", [429, 503]))
+        )
+        self.interval = settings.getfloat("ADAPTIVE_THROTTLE_LOG_INTERVAL", 60.0)
+        self.states: dict[str, ThrottleState] = {}
+        self.task = None
+        crawler.signals.connect(self.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(self.spider_closed, signal=signals.spider_closed)
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "AdaptiveThrottleMiddleware":
+        return cls(crawler)
+
+    def spider_opened(self, spider: Spider) -> None:
+        if self.interval > 0:
+            self.task = task.LoopingCall(self.log, spider)
+            self.task.start(self.interval, now=False)
+
+    def spider_closed(self, spider: Spider, reason: str) -> None:
+        if self.task is not None and self.task.running:
+            self.task.stop()
+        self.log(spider)
+
+    def process_response(
+        self, request: Request, response: Response, spider: Spider
+    ) -> Response:
+        key = self.get_slot_key(request)
+        state = self.states.setdefault(key, ThrottleState())
+        if "cached" in response.flags:
+            state.cached += 1
+            return response
+        state.live += 1
+        if response.status in self.backoff_codes:
+            self.back_off(key, state, retry_after=get_retry_after(response))
+            return response
+        latency = request.meta.get("download_latency")
+        if latency is not None:
+            self.observe_latency(key, state, latency)
+        return response
+
+    def process_exception(
+        self, request: Request, exception: Exception, spider: Spider
+    ) -> None:
+        if isinstance(exception, IgnoreRequest):
+            return
+        key = self.get_slot_key(request)
+        state = self.states.setdefault(key, ThrottleState())
+        state.live += 1
+        self.back_off(key, state)
+
+    def get_slot_key(self, request: Request) -> str:
+        key = request.meta.get("download_slot")
+        if key is None:
+            key = urlparse_cached(request).hostname or ""
+        return key
+
+    def observe_latency(self, key: str, state: ThrottleState, latency: float) -> None:
+        if state.latency is None:
+            state.latency = latency
+        else:
+            state.latency = 0.8 * state.latency + 0.2 * latency
+        slot = self.crawler.engine.downloader.slots.get(key)
+        if slot is None:
+            return
+        if latency > self.target_latency:
+            # The server is slowing down
+            state.successes = 0
+            self.update_slot(key, state, slot.delay * 1.5)
+            return
+        state.successes += 1
+        if state.successes >= self.speedup_after:
+            state.successes = 0
+            self.update_slot(key, state, slot.delay * 0.8)
+
+    def back_off(
+        self, key: str, state: ThrottleState, retry_after: float | None = None
+    ) -> None:
+        state.backoffs += 1
+        state.successes = 0
+        self.crawler.stats.inc_value("adaptive_throttle/backoff_count")
+        slot = self.crawler.engine.downloader.slots.get(key)
+        if slot is None:
+            return
+        delay = max(slot.delay, self.min_delay) * 2
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        self.update_slot(key, state, delay)
+
+    def update_slot(self, key: str, state: ThrottleState, delay: float) -> None:
+        slot = self.crawler.engine.downloader.slots[key]
+        slot.delay = min(max(delay, self.min_delay), self.max_delay)
+
+        # Keep enough requests in flight to sustain one request per delay
+        latency = state.latency if state.latency is not None else 0
+        concurrency = math.ceil(latency / slot.delay) if slot.delay > 0 else 1
+        slot.concurrency = min(
+            max(concurrency, self.min_concurrency), self.max_concurrency
+        )
+
+    def rates(self) -> dict[str, dict[str, float]]:
+        ret = {}
+        now = time.monotonic()
+        slots = self.crawler.engine.downloader.slots
+        for key, state in self.states.items():
+            elapsed = now - state.counted_at
+            if elapsed > 0:
+                state.live_rate = (state.live - state.live_prev) / elapsed
+                state.cached_rate = (state.cached - state.cached_prev) / elapsed
+            state.counted_at, state.live_prev, state.cached_prev = (
+                now,
+                state.live,
+                state.cached,
+            )
+            ret[key] = {
+                "live_rate": state.live_rate,
+                "cached_rate": state.cached_rate,
+                "latency": state.latency or 0.0,
+                "backoffs": state.backoffs,
+            }
+            if key in slots:
+                ret[key]["delay"] = slots[key].delay
+                ret[key]["concurrency"] = slots[key].concurrency
+        return ret
+
+    def log(self, spider: Spider) -> None:
+        for key, rate in self.rates().items():
+            for name, value in rate.items():
+                self.crawler.stats.set_value(
+                    f"adaptive_throttle/{key}/{name}", value, spider=spider
+                )
+            logger.info(
+                "Throttle %(slot)s: live %(live).2f req/s, cached %(cached).2f req/s, "
+                "delay %(delay).2fs, concurrency %(concurrency)d, "
+                "latency %(latency).2fs, backoffs %(backoffs)d",
+                {
+                    "slot": key,
+                    "live": rate["live_rate"],
+                    "cached": rate["cached_rate"],
+                    "delay": rate.get("delay", 0.0),
+                    "concurrency": rate.get("concurrency", 0),
+                    "latency": rate["latency"],
+                    "backoffs": rate["backoffs"],
+                },
+                extra={"spider": spider},
+            )
+
+
+def get_retry_after(response: Response) -> float | None:
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+class ParsePoolMiddleware:
+    # Reads the pages of the callbacks listed in the spider's `readers` in
+    # worker processes, the callback then gets the result in meta["parsed"]
+    # while the reactor keeps downloading
+    def __init__(self, crawler: Crawler) -> None:
+        self.processes = crawler.settings.getint("PARSE_PROCESSES", 0)
+        if self.processes <= 0:
+            raise NotConfigured
+        if not is_asyncio_reactor_installed():
+            raise NotConfigured("PARSE_PROCESSES needs the asyncio reactor")
+        self.executor: ProcessPoolExecutor | None = None
+        crawler.signals.connect(self.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(self.spider_closed, signal=signals.spider_closed)
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "ParsePoolMiddleware":
+        return cls(crawler)
+
+    def spider_opened(self, spider: Spider) -> None:
+        # Spawned, forking a process that runs a reactor is unsafe
+        self.executor = ProcessPoolExecutor(
+            self.processes, mp_context=multiprocessing.get_context("spawn")
+        )
+
+    def spider_closed(self, spider: Spider, reason: str) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    async def process_response(
+        self, request: Request, response: Response, spider: Spider
+    ) -> Response:
+        reader = get_reader(request, spider)
+        if reader is None or self.executor is None:
+            return response
+        if not isinstance(response, TextResponse):
+            return response
+        future = self.executor.submit(
+            read_page,
+            reader,
+            type(response),
+            response.url,
+            response.status,
+            dict(response.headers),
+            response.body,
+            spider.name,
+        )
+        try:
+            parsed, records, wall, cpu = await asyncio.wrap_future(future)
+        except Exception as e:
+            # The callback reads the page itself and reports errors as usual
+            logger.warning(
+                "Could not read %(url)s in a parse worker: %(error)r",
+                {"url": response.url, "error": e},
+                extra={"spider": spider},
+            )
+            return response
+        spider_logger = logging.getLogger(spider.name)
+        for record in records:
+            spider_logger.handle(record)
+        get_timer(reader.__qualname__).observe(wall, cpu)
+        request.meta["parsed"] = parsed
+        return response
+
+
+class RecordCollector(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+def get_reader(request: Request, spider: Spider) -> Callable | None:
+    name = getattr(request.callback, "__name__", None)
+    reader = getattr(spider, "readers", {}).get(name)
+    if reader is None:
+        return None
+    return getattr(type(spider), reader)
+
+
+def read_page(
+    reader: Callable,
+    response_cls: type,
+    url: str,
+    status: int,
+    headers: dict,
+    body: bytes,
+    logger_name: str,
+) -> tuple[Any, list[logging.LogRecord], float, float]:
+    # Runs in a parse worker, the records are logged again by the crawl
+    wall, cpu = time.perf_counter(), time.process_time()
+    collector = RecordCollector()
+    reader_logger = logging.Logger(logger_name)
+    reader_logger.addHandler(collector)
+    response = response_cls(url, status=status, headers=headers, body=body)
+    parsed = reader(response, reader_logger)
+    wall = time.perf_counter() - wall
+    cpu = time.process_time() - cpu
+    return parsed, collector.records, wall, cpu
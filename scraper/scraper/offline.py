@@ -0,0 +1,176 @@
+import logging
+import multiprocessing
+from collections import defaultdict
+from collections.abc import Iterable
+from itemadapter import is_item
+from scrapy import Spider
+from scrapy.crawler import Crawler
+from scrapy.exceptions import IgnoreRequest
+from scrapy.exporters import BaseItemExporter
+from scrapy.http import Request, Response
+from scrapy.settings import Settings
+from scrapy.spiderloader import SpiderLoader
+from scrapy.utils.misc import create_instance, load_object
+from scrapy.utils.python import to_unicode
+from scrapy.utils.request import request_from_dict
+from twisted.python.failure import Failure
+
+logger = logging.getLogger(__name__)
+
+REDIRECT_CODES = [301, 302, 303, 307, 308]
+MAX_REDIRECTS = 5
+
+# Event lookups wait until every fighter page is parsed,
+# so that each event page is parsed once with all of its pending bouts
+DEFERRED_CALLBACKS = ["parse_event_results"]
+
+
+def create_spider(settings: Settings, spider_name: str, spider_kwargs: dict) -> Spider:
+    # Pending bouts are held by reparse, across the workers
+    settings = settings.copy()
+    settings.set("PENDING_BOUTS_LIMIT", 0)
+    spidercls = SpiderLoader.from_settings(settings).load(spider_name)
+    crawler = Crawler(spidercls, settings)
+    crawler.stats = load_object(crawler.settings["STATS_CLASS"])(crawler)
+    crawler.request_fingerprinter = create_instance(
+        load_object(crawler.settings["REQUEST_FINGERPRINTER_CLASS"]),
+        settings=crawler.settings,
+        crawler=crawler,
+    )
+    return spidercls.from_crawler(crawler, **spider_kwargs)
+
+
+class OfflineWorker:
+    def __init__(self, settings: Settings, spider_name: str, spider_kwargs: dict):
+        self.spider = create_spider(settings, spider_name, spider_kwargs)
+        self.storage = load_object(settings["HTTPCACHE_STORAGE"])(settings)
+        self.storage.open_spider(self.spider)
+
+    def fetch(self, request: Request) -> Response | None:
+        for _ in range(MAX_REDIRECTS + 1):
+            response = self.storage.retrieve_response(self.spider, request)
+            if response is None:
+                return None
+            location = response.headers.get("Location")
+            if response.status not in REDIRECT_CODES or location is None:
+                return response.replace(request=request)
+            request = request.replace(url=response.urljoin(to_unicode(location)))
+        return None
+
+    def run(self, task: dict) -> tuple[list[dict], list[dict], dict[str, list[dict]]]:
+        request = request_from_dict(task["request"], spider=self.spider)
+        if "pending" in task:
+            self.spider.pending_bouts.update(task["pending"])
+        response = self.fetch(request)
+        if response is not None:
+            callback = request.callback or self.spider.parse
+            output = callback(response, **request.cb_kwargs)
+        elif request.errback is not None:
+            failure = Failure(IgnoreRequest(f"{request.url} is not in the HTTP cache"))
+            failure.request = request
+            output = request.errback(failure)
+        else:
+            logger.warning(f"{request.url} is not in the HTTP cache")
+            output = None
+
+        items, requests = [], []
+        for x in iterate_output(output):
+            if isinstance(x, Request):
+                requests.append(x.to_dict(spider=self.spider))
+            else:
+                items.append(x)
+        pending = getattr(self.spider, "pending_bouts", {})
+        if pending:
+            self.spider.pending_bouts = {}
+        return items, requests, pending
+
+
+def iterate_output(output) -> Iterable:
+    if output is None:
+        return []
+    if isinstance(output, Request) or is_item(output):
+        return [output]
+    return output
+
+
+worker: OfflineWorker | None = None
+
+
+def init_worker(values: dict, spider_name: str, spider_kwargs: dict) -> None:
+    global worker
+    worker = OfflineWorker(Settings(values), spider_name, spider_kwargs)
+
+
+def run_task(task: dict) -> tuple[list[dict], list[dict], dict[str, list[dict]]]:
+    return worker.run(task)
+
+
+def reparse(
+    settings: Settings,
+    spider_name: str,
+    spider_kwargs: dict,
+    exporter: BaseItemExporter,
+    processes: int | None = None,
+    chunksize: int = 16,
+) -> dict[str, int]:
+    spider = create_spider(settings, spider_name, spider_kwargs)
+    fingerprinter = spider.crawler.request_fingerprinter
+    seen = set()
+    frontier, deferred = [], []
+    pending = defaultdict(list)
+    stats = {"pages": 0, "items": 0}
+
+    def push(d: dict) -> None:
+        request = request_from_dict(d, spider=spider)
+        key = (
+            fingerprinter.fingerprint(request),
+            d["callback"],
+            repr(sorted(request.cb_kwargs.items())),
+        )
+        if key in seen:
+            return
+        seen.add(key)
+        if d["callback"] in DEFERRED_CALLBACKS:
+            deferred.append(d)
+        else:
+            frontier.append(d)
+
+    for request in spider.start_requests():
+        push(request.to_dict(spider=spider))
+
+    initargs = (settings.copy_to_dict(), spider_name, spider_kwargs)
+    with multiprocessing.Pool(processes, init_worker, initargs) as pool:
+        while len(frontier) > 0 or len(deferred) > 0:
+            if len(frontier) > 0:
+                tasks = [{"request": d} for d in frontier]
+                frontier = []
+            else:
+                tasks = []
+                for d in deferred:
+                    event_url = d["cb_kwargs"].get("event_url")
+                    tasks.append(
+                        {
+                            "request": d,
+                            "pending": {event_url: pending.pop(event_url, [])},
+                        }
+                    )
+                deferred = []
+            for items, requests, bouts in pool.imap_unordered(
+                run_task, tasks, chunksize=chunksize
+            ):
+                stats["pages"] += 1
+                for item in items:
+                    exporter.export_item(item)
+                stats["items"] += len(items)
+                for d in requests:
+                    push(d)
+                for event_url, auxiliaries in bouts.items():
+                    pending[event_url].extend(auxiliaries)
+            logger.info(f"Parsed {stats['pages']} pages, {stats['items']} items")
+
+    # Bouts whose event page never got parsed
+    for auxiliaries in pending.values():
+        for auxiliary in auxiliaries:
+            exporter.export_item(auxiliary)
+            stats["items"] += 1
+    return stats
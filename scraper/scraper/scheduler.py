@@ -0,0 +1,74 @@
+from scrapy import Spider
+from scrapy.core.scheduler import Scheduler
+from scrapy.downloadermiddlewares.httpcache import HttpCacheMiddleware
+from scrapy.extensions.httpcache import FilesystemCacheStorage
+from scrapy.http import Request
+from twisted.internet.defer import Deferred
+
+
+class CacheAwareScheduler(Scheduler):
+    def open(self, spider: Spider) -> Deferred | None:
+        ret = super().open(spider)
+        self.cached_mqs = self._mq()
+        self.live_concurrency = self.crawler.settings.getint(
+            "LIVE_CONCURRENT_REQUESTS", 4
+        )
+        self.cache = None
+        # Requests waiting in the queues, for the Checkpoint extension
+        self.queued: set[Request] = set()
+        for mw in self.crawler.engine.downloader.middleware.middlewares:
+            if isinstance(mw, HttpCacheMiddleware):
+                self.cache = mw
+        return ret
+
+    def enqueue_request(self, request: Request) -> bool:
+        # Requests persisted with JOBDIR keep the default path
+        if self.dqs is not None:
+            return super().enqueue_request(request)
+        if not request.dont_filter and self.df.request_seen(request):
+            self.df.log(request, self.spider)
+            return False
+        if self.is_cached(request):
+            self.cached_mqs.push(request)
+            self.stats.inc_value("scheduler/enqueued/cached", spider=self.spider)
+        else:
+            self._mqpush(request)
+            self.stats.inc_value("scheduler/enqueued/memory", spider=self.spider)
+        self.queued.add(request)
+        self.stats.inc_value("scheduler/enqueued", spider=self.spider)
+        return True
+
+    def next_request(self) -> Request | None:
+        if self.dqs is not None:
+            return super().next_request()
+
+        # Live fetches first while the politeness slots have room,
+        # cached responses never wait behind them
+        request = None
+        if not self.live_needs_backout():
+            request = super().next_request()
+        if request is None:
+            request = self.cached_mqs.pop()
+            if request is not None:
+                self.stats.inc_value("scheduler/dequeued/cached", spider=self.spider)
+                self.stats.inc_value("scheduler/dequeued", spider=self.spider)
+        if request is not None:
+            self.queued.discard(request)
+        return request
+
+    def __len__(self) -> int:
+        return super().__len__() + len(self.cached_mqs)
+
+    def live_needs_backout(self) -> bool:
+        slots = self.crawler.engine.downloader.slots
+        return sum(len(slot.active) for slot in slots.values()) >= self.live_concurrency
+
+    def is_cached(self, request: Request) -> bool:
+        if self.cache is None or not self.cache.policy.should_cache_request(request):
+            return False
+        storage = self.cache.storage
+        if hasattr(storage, "has_response"):
+            return storage.has_response(self.spider, request)
+        if isinstance(storage, FilesystemCacheStorage):
+            return storage._read_meta(self.spider, request) is not None
+        return storage.retrieve_response(self.spider, request) is not None
@@ -1,11 +1,23 @@
 BOT_NAME = "bot"
 SPIDER_MODULES = ["scraper.tapology"]
+COMMANDS_MODULE = "scraper.commands"
 
-CONCURRENT_REQUESTS = 1
-# CONCURRENT_REQUESTS_PER_DOMAIN = 100
-# AUTOTHROTTLE_ENABLED = True
-# AUTOTHROTTLE_TARGET_CONCURRENCY = 50
+# Cache hits are only bounded by CONCURRENT_REQUESTS,
+# live fetches are bounded by LIVE_CONCURRENT_REQUESTS
+# and throttled per domain by AdaptiveThrottleMiddleware
+SCHEDULER = "scraper.scheduler.CacheAwareScheduler"
+CONCURRENT_REQUESTS = 32
+LIVE_CONCURRENT_REQUESTS = 4
+CONCURRENT_REQUESTS_PER_DOMAIN = 1
 DOWNLOAD_DELAY = 3
+ADAPTIVE_THROTTLE_ENABLED = True
+ADAPTIVE_THROTTLE_TARGET_LATENCY = 2.0
+ADAPTIVE_THROTTLE_MIN_DELAY = 1.0
+ADAPTIVE_THROTTLE_MAX_DELAY = 60.0
+ADAPTIVE_THROTTLE_MIN_CONCURRENCY = 1
+ADAPTIVE_THROTTLE_MAX_CONCURRENCY = 4
+ADAPTIVE_THROTTLE_BACKOFF_CODES = [429, 503]
+ADAPTIVE_THROTTLE_LOG_INTERVAL = 60.0
 # ROTATING_PROXY_LIST = {
 #     "rotating-residential.geonode.com:9000",
 #     "rotating-residential.geonode.com:9001",
@@ -19,14 +31,28 @@ DOWNLOAD_DELAY = 3
 #     "rotating-residential.geonode.com:9009",
 #     "rotating-residential.geonode.com:9010",
 # }
-# DOWNLOADER_MIDDLEWARES = {
-#     "rotating_proxies.middlewares.RotatingProxyMiddleware": 610,
-#     "rotating_proxies.middlewares.BanDetectionMiddleware": 620,
-# }
+DOWNLOADER_MIDDLEWARES = {
+    # "rotating_proxies.middlewares.RotatingProxyMiddleware": 610,
+    # "rotating_proxies.middlewares.BanDetectionMiddleware": 620,
+    # Between DownloaderStats (850) and HttpCache (900) to see raw 429/503
+    "scraper.middlewares.AdaptiveThrottleMiddleware": 880,
+    # Last to see the responses, after the redirects and decompression
+    "scraper.middlewares.ParsePoolMiddleware": 50,
+}
+EXTENSIONS = {
+    # Logs hit rates of the memoized normalizers and parsers
+    "scraper.extensions.MemoStats": 500,
+    # Snapshots of the crawl for --resume, enabled by --checkpoint DIR
+    "scraper.extensions.Checkpoint": 510,
+    # Per-callback timings, throughput and error counts
+    "scraper.extensions.TimingStats": 520,
+}
 
 DOWNLOAD_TIMEOUT = 300
 COOKIES_ENABLED = False
 HTTPCACHE_ENABLED = True
+HTTPCACHE_STORAGE = "scraper.httpcache.SqliteCacheStorage"
+HTTPCACHE_GZIP = True
 HTTPCACHE_EXPIRATION_SECS = 60 * 60 * 24 * 365
 HTTPCACHE_IGNORE_HTTP_CODES = [
     400,  # Bad Request
@@ -69,6 +95,34 @@ HTTPCACHE_IGNORE_HTTP_CODES = [
     511,  # Network Authentication Required
 ]
 
+# Incremental crawl (-a state=<file>)
+INCREMENTAL_LISTING_MAX_AGE = 60 * 60 * 24
+INCREMENTAL_FIGHTER_MAX_AGE = 60 * 60 * 24 * 30
+INCREMENTAL_EVENT_GRACE = 60 * 60 * 24 * 7
+
+# Fighters and events emitted across runs (-a emitted=skip)
+FINGERPRINTS_DIR = "fingerprints"
+FINGERPRINTS_CAPACITY = 1_000_000
+FINGERPRINTS_ERROR_RATE = 0.001
+
+# Worker processes reading the fighter and event pages (0 to read them
+# in the crawl process)
+PARSE_PROCESSES = 0
+
+# Bouts of scope=result waiting for their event page, fighters over the
+# limit wait in a disk queue under SPILL_DIR, and the bouts of the parsed
+# events are kept there too (0 for no limit, all in memory). The limit is
+# soft, a fighter page already requested adds all of its bouts.
+PENDING_BOUTS_LIMIT = 10000
+SPILL_DIR = "spill"
+
+# Resumable crawl (scrapy crawl --checkpoint DIR [--resume])
+CHECKPOINT_INTERVAL = 60 * 5
+
+# Metrics of TimingStats as JSON Lines, e.g. TIMING_STATS_FILE = "metrics.jsonl"
+TIMING_STATS_FILE = None
+TIMING_STATS_INTERVAL = 60
+
 REQUEST_FINGERPRINTER_IMPLEMENTATION = "2.7"
 TWISTED_REACTOR = "twisted.internet.asyncioreactor.AsyncioSelectorReactor"
 FEED_EXPORT_ENCODING = "utf-8"
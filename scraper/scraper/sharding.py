@@ -0,0 +1,36 @@
+import json
+import zlib
+from collections.abc import Iterable
+from pathlib import Path
+from scrapy.exporters import BaseItemExporter
+
+SHARD_MODES = ["weight_class", "fighter"]
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    # "{index}/{count}", e.g. "0/4"
+    try:
+        index, count = map(int, value.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard: {value}, use INDEX/COUNT")
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Invalid shard: {value}, use 0 <= INDEX < COUNT")
+    return index, count
+
+
+def get_shard(key: str, count: int) -> int:
+    # Stable across processes, unlike hash()
+    return zlib.crc32(key.encode()) % count
+
+
+def merge_feeds(paths: Iterable[Path], exporter: BaseItemExporter) -> int:
+    merged = 0
+    for path in paths:
+        if not path.exists():
+            continue
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    exporter.export_item(json.loads(line))
+                    merged += 1
+    return merged
@@ -56,6 +56,49 @@ WEIGHT_CLASSES = [
     WEIGHT_CLASS_CATCH,
 ]
 
+# Weight classes with an upper limit, from the lightest to the heaviest
+WEIGHT_CLASSES_BY_LIMIT = [
+    WEIGHT_CLASS_ATOM,
+    WEIGHT_CLASS_STRAW,
+    WEIGHT_CLASS_FLY,
+    WEIGHT_CLASS_BANTAM,
+    WEIGHT_CLASS_FEATHER,
+    WEIGHT_CLASS_LIGHT,
+    WEIGHT_CLASS_S_LIGHT,
+    WEIGHT_CLASS_WELTER,
+    WEIGHT_CLASS_S_WELTER,
+    WEIGHT_CLASS_MIDDLE,
+    WEIGHT_CLASS_S_MIDDLE,
+    WEIGHT_CLASS_L_HEAVY,
+    WEIGHT_CLASS_CRUISER,
+    WEIGHT_CLASS_HEAVY,
+]
+WEIGHT_LIMITS_BY_CLASS = {
+    WEIGHT_CLASS_ATOM: WEIGHT_LIMIT_ATOM,
+    WEIGHT_CLASS_STRAW: WEIGHT_LIMIT_STRAW,
+    WEIGHT_CLASS_FLY: WEIGHT_LIMIT_FLY,
+    WEIGHT_CLASS_BANTAM: WEIGHT_LIMIT_BANTAM,
+    WEIGHT_CLASS_FEATHER: WEIGHT_LIMIT_FEATHER,
+    WEIGHT_CLASS_LIGHT: WEIGHT_LIMIT_LIGHT,
+    WEIGHT_CLASS_S_LIGHT: WEIGHT_LIMIT_S_LIGHT,
+    WEIGHT_CLASS_WELTER: WEIGHT_LIMIT_WELTER,
+    WEIGHT_CLASS_S_WELTER: WEIGHT_LIMIT_S_WELTER,
+    WEIGHT_CLASS_MIDDLE: WEIGHT_LIMIT_MIDDLE,
+    WEIGHT_CLASS_S_MIDDLE: WEIGHT_LIMIT_S_MIDDLE,
+    WEIGHT_CLASS_L_HEAVY: WEIGHT_LIMIT_L_HEAVY,
+    WEIGHT_CLASS_CRUISER: WEIGHT_LIMIT_CRUISER,
+    WEIGHT_CLASS_HEAVY: WEIGHT_LIMIT_HEAVY,
+    WEIGHT_CLASS_S_HEAVY: WEIGHT_LIMIT_S_HEAVY,
+    WEIGHT_CLASS_OPEN: WEIGHT_LIMIT_OPEN,
+    WEIGHT_CLASS_CATCH: WEIGHT_LIMIT_CATCH,
+}
+# Boundaries between weight classes, sorted by WEIGHT_CLASSES_BY_LIMIT
+WEIGHT_CLASS_BOUNDARIES = [
+    WEIGHT_LIMITS_BY_CLASS[weight_class] for weight_class in WEIGHT_CLASSES_BY_LIMIT
+]
+# Weight classes whose boundary takes no margin
+WEIGHT_CLASSES_WITHOUT_MARGIN = [WEIGHT_CLASS_S_MIDDLE]
+
 
 # Sport
 SPORT_MMA = "mma"
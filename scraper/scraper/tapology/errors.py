@@ -4,6 +4,10 @@ class NormalizeError(Exception):
         self.property = property
         super().__init__(f'could not normalize text "{self.text}" as {self.property}')
 
+    def __reduce__(self) -> tuple:
+        # Logged by the parse workers, see ParsePoolMiddleware
+        return type(self), (self.property, self.text)
+
 
 class ParseError(Exception):
     def __init__(self, property: str, text: str) -> None:
@@ -11,9 +15,15 @@ class ParseError(Exception):
         self.property = property
         super().__init__(f'could not parse text "{self.text}" as {self.property}')
 
+    def __reduce__(self) -> tuple:
+        return type(self), (self.property, self.text)
+
 
 class InferError(Exception):
     def __init__(self, property: str, input: str) -> None:
         self.input = input
         self.property = property
         super().__init__(f'could not infer {self.property} from input "{self.input}"')
+
+    def __reduce__(self) -> tuple:
+        return type(self), (self.property, self.input)
@@ -0,0 +1,231 @@
+from collections.abc import Iterator
+from lxml import etree
+from scrapy.http import TextResponse
+from w3lib.url import add_or_replace_parameter, url_query_parameter
+from .utils import date_regex
+
+# Single-pass extraction of the fighter page. Each function mirrors
+# the XPath queries the spider used to run, returning the same raw strings
+# (first match in document order, or None) from one walk over the tree.
+
+profile_sections_xpath = etree.XPath("//div[@class='details details_two_columns']")
+result_lists_xpath = etree.XPath("//section[@class='fighterFightResults']/ul")
+pagination_xpath = etree.XPath("//span[@class='moreLink']/nav[@class='pagination']")
+event_links_xpath = etree.XPath("//a[contains(@href, '/fightcenter/events/')]")
+listing_row_xpath = etree.XPath("ancestor::*[self::li or self::tr][1]")
+texts_xpath = etree.XPath(".//text()")
+
+
+def iter_children(element: etree._Element, tag: str, **attrs: str) -> Iterator:
+    for child in element:
+        if child.tag != tag:
+            continue
+        if all(child.get(k) == v for k, v in attrs.items()):
+            yield child
+
+
+def get_first(elements: Iterator) -> etree._Element | None:
+    return next(elements, None)
+
+
+def iter_texts(element: etree._Element) -> Iterator[str]:
+    # Text nodes directly under the element, i.e. ./text()
+    if element.text is not None:
+        yield element.text
+    for child in element:
+        if child.tail is not None:
+            yield child.tail
+
+
+def get_text(element: etree._Element | None) -> str | None:
+    if element is None:
+        return None
+    return next(iter_texts(element), None)
+
+
+def get_following_span(element: etree._Element) -> etree._Element | None:
+    # ./following-sibling::span[1]
+    sibling = element.getnext()
+    while sibling is not None and sibling.tag != "span":
+        sibling = sibling.getnext()
+    return sibling
+
+
+def extract_profile_details(root: etree._Element) -> dict[str, list] | None:
+    # <strong>{label}</strong><span>{value}</span> of the profile section,
+    # None if there is no profile section
+    sections = profile_sections_xpath(root)
+    if len(sections) == 0:
+        return None
+    details = {}
+    for section in sections:
+        for ul in iter_children(section, "ul"):
+            for li in iter_children(ul, "li"):
+                for strong in iter_children(li, "strong"):
+                    span = get_following_span(strong)
+                    if span is None:
+                        continue
+                    for label in iter_texts(strong):
+                        details.setdefault(label, []).append(span)
+    return details
+
+
+def get_detail_text(details: dict[str, list], label: str) -> str | None:
+    # ./ul/li/strong[text()='{label}']/following-sibling::span[1]/text()
+    for span in details.get(label, []):
+        text = get_text(span)
+        if text is not None:
+            return text
+    return None
+
+
+def get_detail_href(details: dict[str, list], label: str) -> str | None:
+    # ./ul/li/strong[text()='{label}']/following-sibling::span[1]/a/@href
+    for span in details.get(label, []):
+        for a in iter_children(span, "a"):
+            href = a.get("href")
+            if href is not None:
+                return href
+    return None
+
+
+def extract_fighter_result(li: etree._Element) -> dict:
+    ret = {
+        "status": li.get("data-status"),
+        "sport": li.get("data-sport"),
+        "match_url": None,
+        "event_url": None,
+        "date": None,
+        "ineligible": None,
+        "has_opponent": False,
+        "opponent_url": None,
+        "record": None,
+        "labels": [],
+    }
+    for result in iter_children(li, "div", **{"class": "result"}):
+        for div in result:
+            name = div.get("class")
+            if div.tag != "div":
+                continue
+            if name == "summary":
+                for lead in iter_children(div, "div", **{"class": "lead"}):
+                    for a in iter_children(lead, "a"):
+                        if ret["match_url"] is None:
+                            ret["match_url"] = a.get("href")
+                for notes in iter_children(div, "div", **{"class": "notes"}):
+                    for a in iter_children(notes, "a", title="Event Page"):
+                        if ret["event_url"] is None:
+                            ret["event_url"] = a.get("href")
+            elif name == "date":
+                if ret["date"] is None:
+                    ret["date"] = get_text(div)
+            elif name == "opponent":
+                ret["has_opponent"] = True
+                for child in iter_children(div, "div"):
+                    kind = child.get("class")
+                    if kind == "record nonMma" and ret["ineligible"] is None:
+                        ret["ineligible"] = get_text(child)
+                    elif kind == "name" and ret["opponent_url"] is None:
+                        for a in iter_children(child, "a"):
+                            if ret["opponent_url"] is None:
+                                ret["opponent_url"] = a.get("href")
+                    elif kind == "record" and ret["record"] is None:
+                        for span in iter_children(
+                            child, "span", title="Fighter Record Before Fight"
+                        ):
+                            if ret["record"] is None:
+                                ret["record"] = get_text(span)
+
+    # ./div[@class='details tall']/div[@class='div']/span[@class='label']
+    for details in iter_children(li, "div", **{"class": "details tall"}):
+        for div in iter_children(details, "div", **{"class": "div"}):
+            for label in iter_children(div, "span", **{"class": "label"}):
+                span = get_following_span(label)
+                ret["labels"].append((get_text(label), get_text(span)))
+    return ret
+
+
+def extract_fighter_page(root: etree._Element) -> dict:
+    # Everything the result and event scopes read from a fighter page, as
+    # plain data that can be sent to and from the parse workers
+    details = extract_profile_details(root)
+    page = {
+        "has_details": details is not None,
+        "record": None,
+        "date_of_birth": None,
+        "results": [],
+    }
+    if details is not None:
+        page["record"] = get_detail_text(details, "Pro MMA Record:")
+        page["date_of_birth"] = get_detail_text(details, "| Date of Birth:")
+    for ul in result_lists_xpath(root):
+        for li in iter_children(ul, "li"):
+            page["results"].append((ul.get("id"), extract_fighter_result(li)))
+    return page
+
+
+def iter_division_results(page: dict, division: str | None = None) -> Iterator[dict]:
+    for ul_id, result in page["results"]:
+        if division is None or ul_id == f"{division}Results":
+            yield result
+
+
+def get_page(url: str) -> int:
+    page = url_query_parameter(url, "page")
+    return int(page) if page is not None and page.isdigit() else 1
+
+
+def extract_page_urls(
+    response: TextResponse, ahead: int = 0, empty: bool = False
+) -> list[str]:
+    # The next page of a listing. The first page also gives every page up to
+    # the highest one it links (the last page when there is such a link),
+    # so that they are all fetched at once instead of one after the other.
+    # When a page links no page after the next one, the pages up to `ahead`
+    # pages after it are probed instead, and each probed page that is not
+    # empty probes one page further.
+    if empty:
+        return []
+    next_url, last = None, 1
+    for nav in pagination_xpath(response.selector.root):
+        for span in iter_children(nav, "span"):
+            for a in iter_children(span, "a"):
+                href = a.get("href")
+                if href is None:
+                    continue
+                url = response.urljoin(href)
+                if next_url is None and span.get("class") == "next":
+                    next_url = url
+                last = max(last, get_page(url))
+    if next_url is None:
+        return []
+    urls = [next_url]
+    page, next_page = get_page(response.url), get_page(next_url)
+    if last > next_page:
+        if page == 1:
+            for i in range(next_page + 1, last + 1):
+                urls.append(add_or_replace_parameter(next_url, "page", str(i)))
+        return urls
+    first = next_page + 1 if page == 1 else page + ahead
+    for i in range(max(first, next_page + 1), page + ahead + 1):
+        urls.append(add_or_replace_parameter(next_url, "page", str(i)))
+    return urls
+
+
+def extract_event_links(root: etree._Element) -> list[tuple[str, str | None]]:
+    # Event links of a listing in document order, each with the first text of
+    # its row (closest li or tr) that contains a date
+    ret, seen = [], set()
+    for a in event_links_xpath(root):
+        href = a.get("href")
+        if href is None or href in seen:
+            continue
+        seen.add(href)
+        date = None
+        for row in listing_row_xpath(a):
+            for text in texts_xpath(row):
+                if date_regex.search(text):
+                    date = str(text)
+                    break
+        ret.append((href, date))
+    return ret
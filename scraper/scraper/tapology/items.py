@@ -0,0 +1,235 @@
+import keyword
+from collections.abc import Iterator, Mapping, MutableMapping
+from types import MappingProxyType
+from itemadapter import ItemAdapter
+from itemadapter.adapter import DictAdapter
+
+
+class Order(tuple):
+    # Keys of an item in insertion order. Orders are shared by every item
+    # that got the same keys in the same order, and each one keeps the
+    # orders it leads to, so adding a key is a single dict lookup.
+    def __new__(cls, keys: tuple[str, ...] = ()) -> "Order":
+        order = super().__new__(cls, keys)
+        order.following = {}
+        return order
+
+    def then(self, key: str) -> "Order":
+        order = self.following.get(key)
+        if order is None:
+            order = self.following[key] = Order(self + (key,))
+        return order
+
+
+EMPTY = Order()
+
+# Orders by their keys, for items built from whole dicts
+orders: dict[tuple[str, ...], Order] = {(): EMPTY}
+
+
+def get_order(keys: tuple[str, ...]) -> Order:
+    order = orders.get(keys)
+    if order is None:
+        order = EMPTY
+        for key in keys:
+            order = order.then(key)
+        orders[keys] = order
+    return order
+
+
+class Item(MutableMapping):
+    # A dict with a fixed set of keys, stored in slots. Keys keep their
+    # insertion order, so feeds are exported exactly as from plain dicts.
+    __slots__ = ("_keys",)
+    attrs: dict[str, str] = {}
+
+    def __init_subclass__(cls) -> None:
+        super().__init_subclass__()
+        # "class", "as" and "for" are stored in "class_", "as_" and "for_"
+        cls.attrs = {name.removesuffix("_"): name for name in cls.__slots__}
+
+    def __init__(self, fields: Mapping = {}, /, **kwargs) -> None:
+        # Dicts and the read-only results of memoized parsers are taken as is
+        if kwargs or type(fields) not in (dict, MappingProxyType):
+            fields = dict(fields, **kwargs)
+        attrs = self.attrs
+        try:
+            for key, value in fields.items():
+                setattr(self, attrs[key], value)
+        except KeyError:
+            raise KeyError(
+                f"{type(self).__name__} does not support field: {key}"
+            ) from None
+        self._keys = get_order(tuple(fields))
+
+    def __getitem__(self, key: str):
+        if key not in self._keys:
+            raise KeyError(key)
+        return getattr(self, self.attrs[key])
+
+    def __setitem__(self, key: str, value) -> None:
+        attr = self.attrs.get(key)
+        if attr is None:
+            raise KeyError(f"{type(self).__name__} does not support field: {key}")
+        setattr(self, attr, value)
+        keys = self._keys
+        if key not in keys:
+            order = keys.following.get(key)
+            self._keys = keys.then(key) if order is None else order
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self._keys:
+            raise KeyError(key)
+        delattr(self, self.attrs[key])
+        self._keys = get_order(tuple(k for k in self._keys if k != key))
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __reduce__(self):
+        # Orders link to each other, pickle the fields only
+        return type(self), (dict(self),)
+
+    def copy(self) -> "Item":
+        # Shallow, slot by slot
+        ret = object.__new__(type(self))
+        ret._keys = self._keys
+        for key in self._keys:
+            attr = self.attrs[key]
+            setattr(ret, attr, getattr(self, attr))
+        return ret
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+
+def slots(*keys: str) -> tuple[str, ...]:
+    return tuple(f"{key}_" if keyword.iskeyword(key) else key for key in keys)
+
+
+class Record(Item):
+    __slots__ = slots("w", "l", "d")
+
+
+class RoundFormat(Item):
+    __slots__ = slots(
+        "type", "round_lengths", "round_length", "rounds", "length", "ot", "ot_length"
+    )
+
+
+class Weight(Item):
+    __slots__ = slots("class", "limit", "weigh_in")
+
+
+class TitleInfo(Item):
+    __slots__ = slots("as", "for")
+
+
+class Method(Item):
+    __slots__ = slots("type", "by")
+
+
+class EndTime(Item):
+    __slots__ = slots("round", "time", "elapsed")
+
+
+class ProfileItem(Item):
+    __slots__ = slots(
+        "weight_class",
+        "id",
+        "name",
+        "nationality",
+        "nickname",
+        "record",
+        "date_of_birth",
+        "last_weigh_in",
+        "earnings",
+        "affiliation",
+        "height",
+        "reach",
+        "college",
+        "foundation_styles",
+        "born",
+        "out_of",
+        "head_coach",
+    )
+
+
+class ResultItem(Item):
+    __slots__ = slots(
+        "fighter",
+        "division",
+        "match",
+        "event",
+        "status",
+        "date",
+        "sport",
+        "age",
+        "opponent",
+        "record_before",
+        "record_after",
+        "billing",
+        "round_format",
+        "referee",
+        "weight",
+        "odds",
+        "title_info",
+        "method",
+        "end_time",
+    )
+
+
+class BoutResult(Item):
+    # Outcome of a bout on the event page, merged into its ResultItems
+    __slots__ = slots("cancelled", "method", "end_time")
+
+
+class CardFighter(Item):
+    __slots__ = slots("id", "name", "status")
+
+
+class CardItem(Item):
+    __slots__ = slots(
+        "fighter_left", "fighter_right", "match", "sport", "billing", "no"
+    )
+
+
+class EventItem(Item):
+    __slots__ = slots(
+        "id",
+        "name",
+        "date",
+        "promotion",
+        "location",
+        "region",
+        "enclosure",
+        "venue",
+        "ring_announcer",
+        "ownership",
+        "cards",
+        "total_cards",
+    )
+
+
+class PromotionItem(Item):
+    __slots__ = slots("id", "name", "shorten", "headquarter")
+
+
+class SlotsItemAdapter(DictAdapter):
+    # Lets feed exporters and pipelines take the items like dicts
+    @classmethod
+    def is_item(cls, item) -> bool:
+        return isinstance(item, Item)
+
+    @classmethod
+    def is_item_class(cls, item_class: type) -> bool:
+        return issubclass(item_class, Item)
+
+
+ItemAdapter.ADAPTER_CLASSES.appendleft(SlotsItemAdapter)
@@ -0,0 +1,77 @@
+import functools
+import types
+from collections import OrderedDict
+from collections.abc import Callable
+from .errors import NormalizeError, ParseError
+
+# Failed normalizations and parses are outcomes worth caching as well
+CACHED_ERRORS = (NormalizeError, ParseError)
+
+memoized: list["LRUCache"] = []
+
+
+class LRUCache:
+    def __init__(self, func: Callable, maxsize: int) -> None:
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.maxsize = maxsize
+        self.entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __call__(self, *args, **kwargs):
+        key = args if not kwargs else (args, frozenset(kwargs.items()))
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+        else:
+            self.misses += 1
+            try:
+                entry = (freeze(self.func(*args, **kwargs)), None)
+            except CACHED_ERRORS as e:
+                entry = (None, e)
+            self.entries[key] = entry
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        result, error = entry
+        if error is not None:
+            raise error.with_traceback(None)
+        return result
+
+    def get_stats(self) -> dict[str, int | float]:
+        calls = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self.entries),
+            "hit_rate": self.hits / calls if calls > 0 else 0.0,
+        }
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.hits, self.misses, self.evictions = 0, 0, 0
+
+
+def memoize(maxsize: int = 4096) -> Callable[[Callable], LRUCache]:
+    def decorator(func: Callable) -> LRUCache:
+        cache = LRUCache(func, maxsize)
+        memoized.append(cache)
+        return cache
+
+    return decorator
+
+
+def get_stats() -> dict[str, dict[str, int | float]]:
+    return {cache.__name__: cache.get_stats() for cache in memoized}
+
+
+def freeze(result):
+    # Every caller gets the same cached result, so dicts are handed out
+    # read-only and callers build their own items from them
+    if isinstance(result, dict):
+        return types.MappingProxyType(result)
+    return result
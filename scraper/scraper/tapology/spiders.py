@@ -1,9 +1,44 @@
+import datetime
 import scrapy
-import copy
+from logging import Logger
+from pathlib import Path
+from scrapy import signals
+from scrapy.crawler import Crawler
+from scrapy.exceptions import DontCloseSpider
 from scrapy.http import TextResponse, Request
-from collections.abc import Generator
+from collections.abc import Callable, Generator, MutableMapping
+from typing import Any
+from scrapy.utils.project import data_path
+from twisted.python.failure import Failure
 from . import consts
+from ..diskqueue import DiskDict, DiskQueue
+from ..fingerprints import FingerprintStore, open_store
+from ..sharding import SHARD_MODES, get_shard, parse_shard
+from ..timing import timed
 from .errors import NormalizeError, ParseError
+from .extractors import (
+    extract_event_links,
+    extract_fighter_page,
+    extract_page_urls,
+    extract_profile_details,
+    get_detail_href,
+    get_detail_text,
+    iter_division_results,
+)
+from .items import (
+    BoutResult,
+    CardFighter,
+    CardItem,
+    EndTime,
+    EventItem,
+    Method,
+    ProfileItem,
+    PromotionItem,
+    ResultItem,
+    RoundFormat,
+    Weight,
+)
+from .state import CrawlState
 from .utils import (
     normalize_text,
     normalize_sport,
@@ -45,18 +80,319 @@ class FightersSpider(scrapy.Spider):
         "https://www.tapology.com/search/mma-fighters-by-weight-class/Heavyweight-265-pounds",
         "https://www.tapology.com/search/mma-fighters-by-weight-class/Super_Heavyweight-over-265-pounds",
     ]
+    # Events first, they resolve the bouts waiting in memory, and fighters
+    # before the listing pages that add more of them
+    LISTING_PRIORITY = 0
+    FIGHTER_PRIORITY = 10
+    EVENT_PRIORITY = 20
+    # Takes shard and shard_by, see the shardcrawl command
+    supports_sharding = True
+    # HTTP cache and emitted items, shared with EventsSpider
+    store_name = "fighters"
+    # Callbacks whose page is read in a parse worker, see ParsePoolMiddleware
+    readers = {
+        "parse_fighter_results": "read_fighter_page",
+        "parse_event": "read_event",
+        "parse_event_results": "read_event_results",
+    }
 
     def __init__(
         self,
         scope: str = "profile",
+        state: str | None = None,
+        shard: str | None = None,
+        shard_by: str = "weight_class",
+        emitted: str = "yield",
+        since: str | None = None,
+        until: str | None = None,
         *args,
         **kwargs,
     ) -> None:
         super().__init__(*args, **kwargs)
         if scope not in ["profile", "result", "event"]:
             raise ValueError(f"Unsupported scope: {scope}")
+        if shard_by not in SHARD_MODES:
+            raise ValueError(f"Unsupported shard_by: {shard_by}")
+        if emitted not in ["yield", "skip"]:
+            raise ValueError(f"Unsupported emitted: {emitted}")
+        if emitted == "skip" and scope == "result":
+            raise ValueError("emitted=skip is not supported with scope=result")
+        if (since is not None or until is not None) and scope != "event":
+            raise ValueError("since and until are only supported with scope=event")
         self.scope = scope
+        # Events from since to until (YYYY-MM-DD, both included)
+        self.since: str | None = None
+        self.until: str | None = None
+        if since is not None:
+            self.since = datetime.date.fromisoformat(since).isoformat()
+        if until is not None:
+            self.until = datetime.date.fromisoformat(until).isoformat()
+        self.state_path = state
+        self.state: CrawlState | None = None
+        self.shard = (0, 1) if shard is None else parse_shard(shard)
+        self.shard_by = shard_by
+        self.claims: FingerprintStore | None = None
+        self.emitted = emitted
+        self.fingerprints: FingerprintStore | None = None
+        self.requested_events: set[str] = set()
+        self.unrecorded: set[str] = set()
+        self.event_index: MutableMapping[str, dict[str, BoutResult]] = {}
+        self.pending_bouts: dict[str, list[ResultItem]] = {}
+        self.pending_count = 0
+        self.pending_limit = 0
+        self.parked_fighters: DiskQueue | None = None
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler, *args, **kwargs) -> "FightersSpider":
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        if spider.state_path is not None:
+            # Incremental mode
+            spider.state = CrawlState(spider.state_path, crawler.settings)
+        claims = crawler.settings.get("SHARD_CLAIMS")
+        if claims is not None:
+            # Sharded mode, see the shardcrawl command
+            spider.claims = FingerprintStore(Path(claims))
+        if spider.scope in ["profile", "event"]:
+            # Fighters or events emitted by any run, see emitted=skip
+            spider.fingerprints = open_store(
+                crawler.settings, spider.store_name, spider.scope
+            )
+        spider.pending_limit = crawler.settings.getint("PENDING_BOUTS_LIMIT", 0)
+        if spider.scope == "result" and spider.pending_limit > 0:
+            # Fighters over the limit of pending bouts wait on disk, and the
+            # bouts of the parsed events are looked up there
+            dirpath = data_path(
+                crawler.settings.get("SPILL_DIR", "spill"), createdir=True
+            )
+            spider.parked_fighters = DiskQueue(dirpath, prefix=f"{spider.name}-")
+            spider.event_index = DiskDict(dirpath, prefix=f"{spider.name}-events-")
+            crawler.signals.connect(spider.spider_idle, signal=signals.spider_idle)
+        return spider
+
+    def closed(self, reason: str) -> None:
+        if self.state is not None:
+            self.state.save()
+        if reason == "finished" or not self.settings.get("CHECKPOINT_DIR"):
+            # A resumed crawl writes the items after the checkpoint again
+            self.record_emitted()
+        if self.claims is not None:
+            self.claims.close()
+        if self.fingerprints is not None:
+            self.fingerprints.close()
+        if self.parked_fighters is not None:
+            self.parked_fighters.close()
+        if isinstance(self.event_index, DiskDict):
+            self.event_index.close()
+
+    def spider_idle(self) -> None:
+        # Nothing left that could release the parked fighters
+        if self.parked_fighters is None or len(self.parked_fighters) == 0:
+            return
+        batch = self.settings.getint("CONCURRENT_REQUESTS")
+        for _ in range(batch):
+            for request in self.release_fighter(force=True):
+                self.crawler.engine.crawl(request)
+        raise DontCloseSpider
+
+    def start_requests(self) -> Generator[Request, None, None]:
+        index, count = self.shard
+        for i, url in enumerate(self.start_urls):
+            if self.shard_by == "weight_class" and i % count != index:
+                continue
+            yield Request(
+                url,
+                dont_filter=True,
+                meta=self.get_listing_meta(),
+                priority=self.LISTING_PRIORITY,
+            )
+
+    def owns_fighter(self, url: str) -> bool:
+        index, count = self.shard
+        if self.shard_by == "fighter" and get_shard(url, count) != index:
+            return False
+        if self.scope == "profile" and self.skips_emitted(url):
+            return False
+        return self.claims is None or self.claims.add(url)
+
+    def owns_event(self, url: str) -> bool:
+        # Every result of every fighter links its event, skip them before
+        # building a request
+        if url in self.requested_events:
+            return False
+        self.requested_events.add(url)
+        if self.skips_emitted(url):
+            return False
+        return self.claims is None or self.claims.add(url)
+
+    def in_date_range(self, date: str) -> bool:
+        if self.since is not None and date < self.since:
+            return False
+        return self.until is None or date <= self.until
+
+    def may_be_in_date_range(self, date: str | None) -> bool:
+        # Raw date of a listing, events with no date there are fetched and
+        # checked on their page
+        if date is None or is_na(date):
+            return True
+        try:
+            return self.in_date_range(parse_date(date))
+        except ParseError:
+            return True
+
+    def is_before_since(self, date: str | None) -> bool:
+        # Raw date of a listing, False when unknown
+        if self.since is None or date is None or is_na(date):
+            return False
+        try:
+            return parse_date(date) < self.since
+        except ParseError:
+            return False
+
+    def skips_emitted(self, url: str) -> bool:
+        if self.emitted != "skip":
+            return False
+        return url in self.unrecorded or url in self.fingerprints
+
+    def collect_emitted(self, response: TextResponse, key: str) -> bool:
+        # False if another run has already emitted the item
+        if self.fingerprints is None:
+            return True
+        if self.skips_emitted(key):
+            return False
+        self.unrecorded.add(key)
+        self.unrecorded.update(response.meta.get("redirect_urls", []))
+        return True
+
+    def record_emitted(self) -> None:
+        # Once the items are safely in the feed, see the Checkpoint extension
+        if self.fingerprints is not None and self.unrecorded:
+            self.fingerprints.update(self.unrecorded)
+            self.unrecorded = set()
+
+    def checkpoint(self, dirpath: Path) -> dict:
+        if self.state is not None:
+            self.state.save()
+        event_index, parked_fighters = self.event_index, []
+        if self.parked_fighters is not None:
+            # Copies of the disk stores, not their contents
+            event_index = self.event_index.snapshot(dirpath / "events.sqlite3")
+            parked_fighters = self.parked_fighters.snapshot(dirpath / "parked.sqlite3")
+        return {
+            "event_index": event_index,
+            "pending_bouts": self.pending_bouts,
+            "requested_events": self.requested_events,
+            "parked_fighters": parked_fighters,
+        }
+
+    def restore(self, checkpoint: dict) -> None:
+        event_index = checkpoint["event_index"]
+        parked_fighters = checkpoint.get("parked_fighters", [])
+        if isinstance(event_index, Path):
+            if self.parked_fighters is not None:
+                self.event_index.load(event_index)
+                self.parked_fighters.load(parked_fighters)
+                event_index, parked_fighters = {}, []
+            else:
+                # Checkpointed with a PENDING_BOUTS_LIMIT
+                events = DiskDict.from_snapshot(event_index)
+                parked = DiskQueue.from_snapshot(parked_fighters)
+                event_index, parked_fighters = dict(events), list(parked)
+                events.close()
+                parked.close()
+        self.event_index.update(event_index)
+        self.pending_bouts = checkpoint["pending_bouts"]
+        self.pending_count = sum(len(bouts) for bouts in self.pending_bouts.values())
+        self.requested_events = checkpoint["requested_events"]
+        for url in parked_fighters:
+            self.park_fighter(url)
+
+    def is_saturated(self) -> bool:
+        return self.parked_fighters is not None and (
+            self.pending_count >= self.pending_limit
+        )
 
+    def park_fighter(self, url: str) -> None:
+        if self.parked_fighters is None:
+            # Checkpointed with another PENDING_BOUTS_LIMIT
+            self.crawler.engine.crawl(self.get_fighter_request(url))
+            return
+        self.parked_fighters.push(url)
+        self.crawler.stats.inc_value("fighters/parked", spider=self)
+
+    def release_fighter(self, force: bool = False) -> Generator[Request, None, None]:
+        # One at a time, each drained event or parsed fighter makes room
+        # for about one more fighter
+        if self.parked_fighters is None or (self.is_saturated() and not force):
+            return
+        url = self.parked_fighters.pop()
+        if url is not None:
+            yield self.get_fighter_request(url)
+
+    def get_fighter_request(self, url: str) -> Request:
+        return Request(
+            url,
+            callback=self.parse_fighter_results,
+            meta=self.get_fighter_meta(url),
+            priority=self.FIGHTER_PRIORITY,
+        )
+
+    def get_read(
+        self, response: TextResponse, reader: Callable[[TextResponse, Logger], Any]
+    ) -> Any:
+        # Already read by a parse worker, or read here
+        if "parsed" in response.meta:
+            return response.meta.pop("parsed")
+        return reader(response, self.logger)
+
+    def get_listing_meta(self) -> dict:
+        if self.state is None:
+            return {}
+        return {"cache_max_age": self.state.listing_max_age}
+
+    def get_fighter_meta(self, url: str) -> dict:
+        if self.state is None:
+            return {}
+        return {"cache_max_age": self.state.get_fighter_max_age(url)}
+
+    def get_event_meta(self, url: str) -> dict:
+        if self.state is None:
+            return {}
+        max_age = self.state.get_event_max_age(url)
+        if max_age is None:
+            return {}
+        return {"cache_max_age": max_age}
+
+    @staticmethod
+    def parse_state_record(record: str | None) -> dict[str, int] | None:
+        # As stored in the crawl state
+        if record is None or is_na(record):
+            return None
+        try:
+            return dict(parse_record(record))
+        except ParseError:
+            return None
+
+    def update_state(self, response: TextResponse, page: dict) -> None:
+        record = self.parse_state_record(page["record"])
+        upcoming = []
+        for result in iter_division_results(page):
+            date = result["date"]
+            if date is None or is_na(date):
+                continue
+            try:
+                date = parse_date(date)
+            except ParseError:
+                continue
+            status = result["status"]
+            if status is not None and normalize_text(status) == "upcoming":
+                upcoming.append(date)
+            event_url = result["event_url"]
+            if event_url is not None:
+                event_url = correct_event_url(response.urljoin(event_url))
+                self.state.update_event(event_url, date)
+        self.state.update_fighter(response.url, record, upcoming)
+
+    @timed()
     def parse(self, response: TextResponse) -> Generator[Request, None, None]:
         fighters = response.xpath("//table[@class='siteSearchResults']/tr")[1:]
         for fighter in fighters:
@@ -74,24 +410,53 @@ class FightersSpider(scrapy.Spider):
             except NormalizeError as e:
                 self.logger.error(e)
                 continue
+            if not self.owns_fighter(response.urljoin(url)):
+                continue
+            if self.state is not None:
+                # A changed record forces a refetch, see get_fighter_meta
+                self.state.check_record(
+                    response.urljoin(url),
+                    self.parse_state_record(fighter.xpath("./td[3]/text()").get()),
+                )
+            meta = self.get_fighter_meta(response.urljoin(url))
             if self.scope == "profile":
-                req = response.follow(url, callback=self.parse_fighter_profile)
+                req = response.follow(
+                    url,
+                    callback=self.parse_fighter_profile,
+                    meta=meta,
+                    priority=self.FIGHTER_PRIORITY,
+                )
                 req.cb_kwargs["weight_class"] = weight_class
                 yield req
             elif self.scope in ["result", "event"]:
-                yield response.follow(url, callback=self.parse_fighter_results)
+                if self.is_saturated():
+                    self.park_fighter(response.urljoin(url))
+                    continue
+                yield response.follow(
+                    url,
+                    callback=self.parse_fighter_results,
+                    meta=meta,
+                    priority=self.FIGHTER_PRIORITY,
+                )
 
-        # Move to the next page
-        next_url = response.xpath(
-            "//span[@class='moreLink']/nav[@class='pagination']/span[@class='next']/a/@href"
-        ).get()
-        if next_url is not None:
-            yield response.follow(next_url, callback=self.parse)
+        # Move to the next pages, the ones already requested are filtered out
+        for url in extract_page_urls(
+            response, self.settings.getint("CONCURRENT_REQUESTS"), not fighters
+        ):
+            yield Request(
+                url,
+                callback=self.parse,
+                meta=self.get_listing_meta(),
+                priority=self.LISTING_PRIORITY,
+            )
 
+    @timed()
     def parse_fighter_profile(
         self, response: TextResponse, weight_class: str
-    ) -> dict | None:
-        ret = {"weight_class": weight_class}
+    ) -> Generator[ProfileItem, None, None]:
+        if self.state is not None:
+            self.update_state(response, extract_fighter_page(response.selector.root))
+        ret = ProfileItem(weight_class=weight_class)
 
         # Fighter ID (must)
         ret["id"] = response.url
@@ -125,14 +490,12 @@ class FightersSpider(scrapy.Spider):
                 self.logger.error(e)
 
         # Parse profile section (must)
-        profile_section = response.xpath("//div[@class='details details_two_columns']")
-        if len(profile_section) == 0:
+        details = extract_profile_details(response.selector.root)
+        if details is None:
             return
 
         # Pro mma record (optional)
-        record = profile_section.xpath(
-            "./ul/li/strong[text()='Pro MMA Record:']/following-sibling::span[1]/text()"
-        ).get()
+        record = get_detail_text(details, "Pro MMA Record:")
         if record is not None and not is_na(record):
             try:
                 ret["record"] = parse_record(record)
@@ -140,9 +503,7 @@ class FightersSpider(scrapy.Spider):
                 self.logger.error(e)
 
         # Date of birth (optional)
-        date_of_birth = profile_section.xpath(
-            "./ul/li/strong[text()='| Date of Birth:']/following-sibling::span[1]/text()"
-        ).get()
+        date_of_birth = get_detail_text(details, "| Date of Birth:")
         if date_of_birth is not None and not is_na(date_of_birth):
             try:
                 ret["date_of_birth"] = parse_date(date_of_birth)
@@ -150,9 +511,7 @@ class FightersSpider(scrapy.Spider):
                 self.logger.error(e)
 
         # Last weigh-in (optional)
-        last_weigh_in = profile_section.xpath(
-            "./ul/li/strong[text()='| Last Weigh-In:']/following-sibling::span[1]/text()"
-        ).get()
+        last_weigh_in = get_detail_text(details, "| Last Weigh-In:")
         if last_weigh_in is not None and not is_na(last_weigh_in):
             try:
                 ret["last_weigh_in"] = parse_last_weigh_in(last_weigh_in)
@@ -160,9 +519,7 @@ class FightersSpider(scrapy.Spider):
                 self.logger.error(e)
 
         # Career disclosed earnings (optional)
-        earnings = profile_section.xpath(
-            "./ul/li/strong[text()='Career Disclosed Earnings:']/following-sibling::span[1]/text()"
-        ).get()
+        earnings = get_detail_text(details, "Career Disclosed Earnings:")
         if earnings is not None and not is_na(earnings):
             try:
                 ret["earnings"] = parse_earnings(earnings)
@@ -170,16 +527,12 @@ class FightersSpider(scrapy.Spider):
                 self.logger.error(e)
 
         # Affiliation (optional)
-        affili_url = profile_section.xpath(
-            "./ul/li/strong[text()='Affiliation:']/following-sibling::span[1]/a/@href"
-        ).get()
+        affili_url = get_detail_href(details, "Affiliation:")
         if affili_url is not None:
             ret["affiliation"] = response.urljoin(affili_url)
 
         # Height (optional)
-        height = profile_section.xpath(
-            "./ul/li/strong[text()='Height:']/following-sibling::span[1]/text()"
-        ).get()
+        height = get_detail_text(details, "Height:")
         if height is not None and not is_na(height):
             try:
                 ret["height"] = parse_height(height)
@@ -187,9 +540,7 @@ class FightersSpider(scrapy.Spider):
                 self.logger.error(e)
 
         # Reach (optional)
-        reach = profile_section.xpath(
-            "./ul/li/strong[text()='| Reach:']/following-sibling::span[1]/text()"
-        ).get()
+        reach = get_detail_text(details, "| Reach:")
         if reach is not None and not is_na(reach):
             try:
                 ret["reach"] = parse_reach(reach)
@@ -197,55 +548,50 @@ class FightersSpider(scrapy.Spider):
                 self.logger.error(e)
 
         # College (optional)
-        college = profile_section.xpath(
-            "./ul/li/strong[text()='College:']/following-sibling::span[1]/text()"
-        ).get()
+        college = get_detail_text(details, "College:")
         if college is not None and not is_na(college):
             ret["college"] = normalize_text(college)
 
         # Foundation styles (optional)
-        styles = profile_section.xpath(
-            "./ul/li/strong[text()='Foundation Style:']/following-sibling::span[1]/text()"
-        ).get()
+        styles = get_detail_text(details, "Foundation Style:")
         if styles is not None and not is_na(styles):
             ret["foundation_styles"] = []
             for s in normalize_text(styles).split(","):
                 ret["foundation_styles"].append(s.strip())
 
         # Place of born (optional)
-        born = profile_section.xpath(
-            "./ul/li/strong[text()='Born:']/following-sibling::span[1]/text()"
-        ).get()
+        born = get_detail_text(details, "Born:")
         if born is not None and not is_na(born):
             ret["born"] = normalize_text(born)
 
         # Fighting out of (optional)
-        out_of = profile_section.xpath(
-            "./ul/li/strong[text()='Fighting out of:']/following-sibling::span[1]/text()"
-        ).get()
+        out_of = get_detail_text(details, "Fighting out of:")
         if out_of is not None and not is_na(out_of):
             ret["out_of"] = normalize_text(out_of)
 
         # Head Coach (optional)
-        head_coach = profile_section.xpath(
-            "./ul/li/strong[text()='Head Coach:']/following-sibling::span[1]/text()"
-        ).get()
+        head_coach = get_detail_text(details, "Head Coach:")
         if head_coach is not None and not is_na(head_coach):
             ret["head_coach"] = normalize_text(head_coach)
-        return ret
+        if not self.collect_emitted(response, ret["id"]):
+            return
+        # Yielded, Scrapy would iterate over the keys of a returned Mapping
+        yield ret
 
+    @timed()
     def parse_fighter_results(
         self, response: TextResponse
-    ) -> Generator[dict | Request, None, None] | None:
+    ) -> Generator[ResultItem | Request, None, None] | None:
+        page = self.get_read(response, self.read_fighter_page)
+        if self.state is not None:
+            self.update_state(response, page)
+
         # Parse profile section (must)
-        profile_section = response.xpath("//div[@class='details details_two_columns']")
-        if len(profile_section) == 0:
+        if not page["has_details"]:
             return
 
         # Date of birth (optional)
-        date_of_birth = profile_section.xpath(
-            "./ul/li/strong[text()='| Date of Birth:']/following-sibling::span[1]/text()"
-        ).get()
+        date_of_birth = page["date_of_birth"]
         if date_of_birth is not None and not is_na(date_of_birth):
             try:
                 date_of_birth = parse_date(date_of_birth)
@@ -254,45 +600,45 @@ class FightersSpider(scrapy.Spider):
 
         # Parse results
         for division in [consts.DIVISION_PRO, consts.DIVISION_AM]:
-            result_sections = response.xpath(
-                f"//section[@class='fighterFightResults']/ul[@id='{division}Results']/li"
-            )
-            for result_section in result_sections:
+            for result in iter_division_results(page, division):
                 # Match ID (optional)
-                match_url = result_section.xpath(
-                    "./div[@class='result']/div[@class='summary']/div[@class='lead']/a/@href"
-                ).get()
+                match_url = result["match_url"]
                 if match_url is not None:
                     match_url = correct_match_url(response.urljoin(match_url))
 
                 # Event ID (optional)
-                event_url = result_section.xpath(
-                    "./div[@class='result']/div[@class='summary']/div[@class='notes']/a[@title='Event Page']/@href"
-                ).get()
+                event_url = result["event_url"]
                 if event_url is not None:
                     event_url = correct_event_url(response.urljoin(event_url))
 
                 if self.scope == "event":
-                    if event_url is not None:
-                        yield response.follow(event_url, callback=self.parse_event)
+                    if event_url is None:
+                        continue
+                    if not self.may_be_in_date_range(result["date"]):
+                        continue
+                    if self.owns_event(event_url):
+                        yield response.follow(
+                            event_url,
+                            callback=self.parse_event,
+                            meta=self.get_event_meta(event_url),
+                            priority=self.EVENT_PRIORITY,
+                        )
                 elif self.scope == "result":
-                    auxiliary = {"fighter": response.url, "division": division}
+                    auxiliary = ResultItem(fighter=response.url, division=division)
                     if match_url is not None:
                         auxiliary["match"] = match_url
                     if event_url is not None:
                         auxiliary["event"] = event_url
 
                     # Ignore inegligible matches
-                    text = result_section.xpath(
-                        "./div[@class='result']/div[@class='opponent']/div[@class='record nonMma']/text()"
-                    ).get()
+                    text = result["ineligible"]
                     if text is not None and normalize_text(text).startswith(
                         "record ineligible"
                     ):
                         continue
 
                     # Status of the match (must)
-                    status = result_section.xpath("./@data-status").get()
+                    status = result["status"]
                     if status is None:
                         continue
                     try:
@@ -309,9 +655,7 @@ class FightersSpider(scrapy.Spider):
                         continue
 
                     # Date of the match (must)
-                    date = result_section.xpath(
-                        "./div[@class='result']/div[@class='date']/text()"
-                    ).get()
+                    date = result["date"]
                     if date is None or is_na(date):
                         continue
                     try:
@@ -321,7 +665,7 @@ class FightersSpider(scrapy.Spider):
                         continue
 
                     # Sport of the match (must)
-                    sport = result_section.xpath("./@data-sport").get()
+                    sport = result["sport"]
                     if sport is None:
                         continue
                     try:
@@ -335,25 +679,18 @@ class FightersSpider(scrapy.Spider):
                         auxiliary["age"] = calc_age(auxiliary["date"], date_of_birth)
 
                     # Opponent section (must)
-                    opponent_section = result_section.xpath(
-                        "./div[@class='result']/div[@class='opponent']"
-                    )
-                    if len(opponent_section) == 0:
+                    if not result["has_opponent"]:
                         continue
                     auxiliary["opponent"] = {}
 
                     # ID of the opponent (must)
-                    opponent_url = opponent_section.xpath(
-                        "./div[@class='name']/a/@href"
-                    ).get()
+                    opponent_url = result["opponent_url"]
                     if opponent_url is None:
                         continue
                     auxiliary["opponent"] = response.urljoin(opponent_url)
 
                     # Record of the fighter (optional)
-                    record = opponent_section.xpath(
-                        "./div[@class='record']/span[@title='Fighter Record Before Fight']/text()"
-                    ).get()
+                    record = result["record"]
                     if record is not None and not is_na(record):
                         try:
                             parsed = parse_record(record)
@@ -371,19 +708,13 @@ class FightersSpider(scrapy.Spider):
                                 auxiliary["record_after"]["d"] += 1
 
                     # More info (optional)
-                    label_sections = result_section.xpath(
-                        "./div[@class='details tall']/div[@class='div']/span[@class='label']"
-                    )
-                    for label_section in label_sections:
-                        label = label_section.xpath("./text()").get()
+                    for label, value in result["labels"]:
                         if label is None:
                             continue
                         label = normalize_text(label)
                         if label == "billing:":
                             # Billing of the match
-                            billing = label_section.xpath(
-                                "./following-sibling::span[1]/text()"
-                            ).get()
+                            billing = value
                             if billing is not None and not is_na(billing):
                                 try:
                                     auxiliary["billing"] = normalize_billing(billing)
@@ -391,41 +722,33 @@ class FightersSpider(scrapy.Spider):
                                     self.logger.error(e)
                         elif label == "duration:":
                             # Round format of the match
-                            round_format = label_section.xpath(
-                                "./following-sibling::span[1]/text()"
-                            ).get()
+                            round_format = value
                             if round_format is not None and not is_na(round_format):
                                 try:
-                                    auxiliary["round_format"] = parse_round_format(
-                                        round_format
+                                    auxiliary["round_format"] = RoundFormat(
+                                        parse_round_format(round_format)
                                     )
                                 except ParseError as e:
                                     self.logger.error(e)
                         elif label == "referee:":
                             # Referee of the match
-                            referee = label_section.xpath(
-                                "./following-sibling::span[1]/text()"
-                            ).get()
+                            referee = value
                             if referee is not None and not is_na(referee):
                                 auxiliary["referee"] = normalize_text(referee)
                         elif label == "weight:":
                             # Weight infomation of the match
-                            weight_summary = label_section.xpath(
-                                "./following-sibling::span[1]/text()"
-                            ).get()
+                            weight_summary = value
                             if weight_summary is not None and not is_na(weight_summary):
                                 try:
-                                    auxiliary["weight"] = parse_weight_summary(
-                                        weight_summary
+                                    auxiliary["weight"] = Weight(
+                                        parse_weight_summary(weight_summary)
                                     )
                                 except ParseError as e:
                                     if e.text not in ["*numeric weight*"]:
                                         self.logger.error(e)
                         elif label == "odds:":
                             # Odds of the fighter
-                            odds = label_section.xpath(
-                                "./following-sibling::span[1]/text()"
-                            ).get()
+                            odds = value
                             if odds is not None:
                                 try:
                                     auxiliary["odds"] = parse_odds(odds)
@@ -433,9 +756,7 @@ class FightersSpider(scrapy.Spider):
                                     self.logger.error(e)
                         elif label == "title bout:":
                             # Title infomation
-                            title_info = label_section.xpath(
-                                "./following-sibling::span[1]/text()"
-                            ).get()
+                            title_info = value
                             if title_info is not None:
                                 try:
                                     auxiliary["title_info"] = parse_title_info(
@@ -446,23 +767,83 @@ class FightersSpider(scrapy.Spider):
 
                     # Return
                     if "event" in auxiliary and "match" in auxiliary:
-                        req = response.follow(
-                            url=event_url,
-                            callback=self.parse_event_results,
-                            dont_filter=True,
-                        )
-                        req.cb_kwargs["auxiliary"] = auxiliary
-                        yield req
+                        yield from self.resolve_bout(response, auxiliary)
                     else:
                         yield auxiliary
+        yield from self.release_fighter()
 
-    def parse_event(self, response: TextResponse) -> dict | None:
-        ret = {"id": response.url}
+    def resolve_bout(
+        self, response: TextResponse, auxiliary: ResultItem
+    ) -> Generator[ResultItem | Request, None, None]:
+        event_url = auxiliary["event"]
+
+        # The event page has already been parsed
+        index = self.event_index.get(event_url)
+        if index is not None:
+            yield self.merge_event_results(auxiliary, index)
+            return
+
+        self.pending_count += 1
+
+        # The event page is being fetched, wait for it
+        if event_url in self.pending_bouts:
+            self.pending_bouts[event_url].append(auxiliary)
+            return
+
+        # Fetch the event page
+        self.pending_bouts[event_url] = [auxiliary]
+        yield response.follow(
+            url=event_url,
+            callback=self.parse_event_results,
+            errback=self.parse_event_results_failure,
+            dont_filter=True,
+            cb_kwargs={"event_url": event_url},
+            meta=self.get_event_meta(event_url),
+            priority=self.EVENT_PRIORITY,
+        )
+
+    def merge_event_results(
+        self, auxiliary: ResultItem, index: dict[str, BoutResult]
+    ) -> ResultItem:
+        results = index.get(auxiliary["match"])
+        if results is None:
+            # Could not find the bout link on the event
+            self.logger.error(
+                f"could not find match {auxiliary['match']} on event {auxiliary['event']}"
+            )
+            return auxiliary
+        for key in ["method", "end_time"]:
+            if key in results:
+                # Both sides of the bout get their own
+                auxiliary[key] = results[key].copy()
+        return auxiliary
+
+    @staticmethod
+    def read_fighter_page(response: TextResponse, logger: Logger) -> dict:
+        return extract_fighter_page(response.selector.root)
+
+    @timed()
+    def parse_event(self, response: TextResponse) -> Generator[EventItem, None, None]:
+        ret = self.get_read(response, self.read_event)
+        if ret is None:
+            return
+        if self.state is not None and "date" in ret:
+            self.state.update_event(response.url, ret["date"])
+        if self.since is not None or self.until is not None:
+            if "date" not in ret or not self.in_date_range(ret["date"]):
+                return
+        if not self.collect_emitted(response, ret["id"]):
+            return
+        yield ret
+
+    @staticmethod
+    def read_event(response: TextResponse, logger: Logger) -> EventItem | None:
+        ret = EventItem(id=response.url)
 
         # Name of event (must)
         name = response.xpath("//div[@class='eventPageHeaderTitles']/h1/text()").get()
         if name is None or is_na(name):
-            self.logger.error(f"no event title available on event {response.url}")
+            logger.error(f"no event title available on event {response.url}")
             return
         ret["name"] = normalize_text(name)
 
@@ -471,18 +852,18 @@ class FightersSpider(scrapy.Spider):
             "//div[contains(@class, 'details')]/div[@class='right']/ul"
         )
         if details_section == 0:
-            self.logger.error(f"no details section on event {response.url}")
+            logger.error(f"no details section on event {response.url}")
             return
 
         # Date (must)
         date = details_section.xpath("./li[@class='header']/text()").get()
         if date is None or is_na(date):
-            self.logger.error(f"date is unknown on event {response.url}")
+            logger.error(f"date is unknown on event {response.url}")
             return
         try:
             ret["date"] = parse_date(date)
         except ParseError as e:
-            self.logger.error(e)
+            logger.error(e)
 
         # Details (optional)
         for section in details_section.xpath("./li[not(@class='header')]"):
@@ -526,11 +907,11 @@ class FightersSpider(scrapy.Spider):
         )
         cards = []
         for bout_card_section in bout_card_sections:
-            bout_item = {}
+            bout_item = CardItem()
 
             # Fighters (optional)
             for side in ["left", "right"]:
-                fighter_item = {}
+                fighter_item = CardFighter()
                 fighter_section = bout_card_section.xpath(
                     f"./div[contains(@class, 'fightCardFighterBout') and contains(@class, '{side}')]/div[@class='fightCardFighterName {side}']"
                 )
@@ -560,7 +941,7 @@ class FightersSpider(scrapy.Spider):
                         try:
                             fighter_item["status"] = normalize_status(fighter_status)
                         except NormalizeError as e:
-                            self.logger.error(e)
+                            logger.error(e)
                     else:
                         # fightCardFighterBout left
                         fighter_item["status"] = consts.STATUS_UNKNOWN
@@ -582,7 +963,7 @@ class FightersSpider(scrapy.Spider):
                 try:
                     bout_item["sport"] = normalize_sport(sport)
                 except NormalizeError as e:
-                    self.logger.error(e)
+                    logger.error(e)
             else:
                 bout_item["sport"] = consts.SPORT_MMA
 
@@ -594,7 +975,7 @@ class FightersSpider(scrapy.Spider):
                 try:
                     bout_item["billing"] = normalize_billing(billing)
                 except NormalizeError as e:
-                    self.logger.error(e)
+                    logger.error(e)
 
             # No of bout (optional)
             no = bout_card_section.xpath(
@@ -607,8 +988,25 @@ class FightersSpider(scrapy.Spider):
         ret["total_cards"] = len(cards)
         return ret
 
-    def parse_event_results(self, response: TextResponse, auxiliary: dict) -> dict:
-        ret = copy.deepcopy(auxiliary)
+    @timed()
+    def parse_event_results(
+        self, response: TextResponse, event_url: str
+    ) -> Generator[ResultItem | Request, None, None]:
+        index = self.get_read(response, self.read_event_results)
+
+        # Resolve all bouts waiting for this event
+        self.event_index[event_url] = index
+        bouts = self.pending_bouts.pop(event_url, [])
+        self.pending_count -= len(bouts)
+        for auxiliary in bouts:
+            yield self.merge_event_results(auxiliary, index)
+        yield from self.release_fighter()
+
+    @staticmethod
+    def read_event_results(
+        response: TextResponse, logger: Logger
+    ) -> dict[str, BoutResult]:
+        index = {}
         bout_card_sections = response.xpath(
             "//ul[@class='fightCard']/li[@class='fightCard']/div[@class='fightCardBout']"
         )
@@ -616,47 +1014,57 @@ class FightersSpider(scrapy.Spider):
             match_url = bout_card_section.xpath(
                 "./div[contains(@class, 'fightCardMatchup')]/table/tr/td/span[@class='billing']/a/@href"
             ).get()
-            if match_url is not None and ret["match"] == response.urljoin(match_url):
-                # Method (optional)
-                method = bout_card_section.xpath(
-                    "./div[@class='fightCardResultHolder']/div[@class='fightCardResult']/span[@class='result']/text()"
-                ).get()
-                if method is not None and not is_na(method):
-                    try:
-                        ret["method"] = parse_method(method)
-                    except ParseError as e:
-                        self.logger.error(e)
+            if match_url is None:
+                continue
+            match_url = response.urljoin(match_url)
+            if match_url in index:
+                continue
+            results = BoutResult(cancelled=False)
 
-                # End time (optional)
-                end_time = bout_card_section.xpath(
-                    "./div[@class='fightCardResultHolder']/div[@class='fightCardResult']/span[@class='time']/text()"
-                ).get()
-                if (
-                    end_time is not None
-                    and not is_na(end_time)
-                    and not normalize_text(end_time).startswith("original")
-                ):
-                    try:
-                        ret["end_time"] = parse_end_time(end_time)
-                    except ParseError as e:
-                        if e.text not in ["rounds"]:
-                            self.logger.error(e)
-                # Return item
-                return ret
+            # Method (optional)
+            method = bout_card_section.xpath(
+                "./div[@class='fightCardResultHolder']/div[@class='fightCardResult']/span[@class='result']/text()"
+            ).get()
+            if method is not None and not is_na(method):
+                try:
+                    results["method"] = Method(parse_method(method))
+                except ParseError as e:
+                    logger.error(e)
+
+            # End time (optional)
+            end_time = bout_card_section.xpath(
+                "./div[@class='fightCardResultHolder']/div[@class='fightCardResult']/span[@class='time']/text()"
+            ).get()
+            if (
+                end_time is not None
+                and not is_na(end_time)
+                and not normalize_text(end_time).startswith("original")
+            ):
+                try:
+                    results["end_time"] = EndTime(parse_end_time(end_time))
+                except ParseError as e:
+                    if e.text not in ["rounds"]:
+                        logger.error(e)
+            index[match_url] = results
 
-        # Check cancelled matches
+        # Cancelled matches
         cancelled = response.xpath(
             "//ul[@class='eventCancelledBouts']/li[@class='eventCancelledBout']/div[@class='eventCancelledBout']/div[@class='eventCancelledBoutLink']/a/@href"
         ).getall()
         for url in cancelled:
-            if ret["match"] == response.urljoin(url):
-                return ret
+            index.setdefault(response.urljoin(url), BoutResult(cancelled=True))
+        return index
 
-        # Could not find the bout link on the event
-        self.logger.error(
-            f"could not find match {ret['match']} on event {ret['event']}"
-        )
-        return ret
+    @timed()
+    def parse_event_results_failure(
+        self, failure: Failure
+    ) -> Generator[ResultItem, None, None]:
+        event_url = failure.request.cb_kwargs["event_url"]
+        self.logger.error(f"could not fetch event {event_url}: {failure.value!r}")
+        bouts = self.pending_bouts.pop(event_url, [])
+        self.pending_count -= len(bouts)
+        yield from bouts
+        yield from self.release_fighter()
 
 
 class PromotionsSpider(scrapy.Spider):
@@ -666,12 +1074,15 @@ class PromotionsSpider(scrapy.Spider):
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
 
-    def parse(self, response: TextResponse) -> Generator[dict | Request, None, None]:
+    @timed()
+    def parse(
+        self, response: TextResponse
+    ) -> Generator[PromotionItem | Request, None, None]:
         promotions = response.xpath(
             "//div[@class='promotionsIndex']/ul[@class='promotions']/li"
         )
         for promotion in promotions:
-            ret = {}
+            ret = PromotionItem()
 
             # Name section (must)
             name_section = promotion.xpath("./div[@class='name']")
@@ -705,15 +1116,98 @@ class PromotionsSpider(scrapy.Spider):
                 if len(code) == 2:
                     ret["headquarter"] = code
                 else:
-                    self.logger.erro(f"not a two-character country code: {code}")
+                    self.logger.error(f"not a two-character country code: {code}")
             yield ret
 
-        # To the next page
-        next_url = response.xpath(
-            "//span[@class='moreLink']/nav[@class='pagination']/span[@class='next']/a/@href"
-        ).get()
-        if next_url is not None:
-            yield response.follow(next_url, callback=self.parse)
+        # To the next pages
+        for url in extract_page_urls(
+            response, self.settings.getint("CONCURRENT_REQUESTS"), not promotions
+        ):
+            yield Request(url, callback=self.parse)
+
+
+class EventsSpider(FightersSpider):
+    # scope=event through the event lists of the promotions instead of the
+    # fighter pages, so that each event is found about once
+    name = "events"
+    start_urls = PromotionsSpider.start_urls
+    PROMOTION_PRIORITY = 10
+
+    def __init__(self, *args, **kwargs) -> None:
+        scope = kwargs.pop("scope", "event")
+        if scope != "event":
+            raise ValueError(f"Unsupported scope: {scope}, events only crawls events")
+        super().__init__("event", *args, **kwargs)
+
+    def start_requests(self) -> Generator[Request, None, None]:
+        for url in self.start_urls:
+            yield Request(
+                url,
+                dont_filter=True,
+                meta=self.get_listing_meta(),
+                priority=self.LISTING_PRIORITY,
+            )
+
+    @timed()
+    def parse(self, response: TextResponse) -> Generator[Request, None, None]:
+        # Same listing as PromotionsSpider, promotions are split by hash
+        # between the shards
+        index, count = self.shard
+        promotions = response.xpath(
+            "//div[@class='promotionsIndex']/ul[@class='promotions']/li/div[@class='name']/span[1]/a/@href"
+        ).getall()
+        for url in promotions:
+            url = response.urljoin(url)
+            if get_shard(url, count) != index:
+                continue
+            yield Request(
+                url,
+                callback=self.parse_promotion,
+                meta=self.get_listing_meta(),
+                priority=self.PROMOTION_PRIORITY,
+            )
+        for url in extract_page_urls(
+            response, self.settings.getint("CONCURRENT_REQUESTS"), not promotions
+        ):
+            yield Request(
+                url,
+                callback=self.parse,
+                meta=self.get_listing_meta(),
+                priority=self.LISTING_PRIORITY,
+            )
+
+    @timed()
+    def parse_promotion(self, response: TextResponse) -> Generator[Request, None, None]:
+        # Events of the promotion, newest first
+        recent = False
+        links = extract_event_links(response.selector.root)
+        for event_url, date in links:
+            recent = recent or not self.is_before_since(date)
+            if not self.may_be_in_date_range(date):
+                continue
+            event_url = correct_event_url(response.urljoin(event_url))
+            if self.owns_event(event_url):
+                yield Request(
+                    event_url,
+                    callback=self.parse_event,
+                    meta=self.get_event_meta(event_url),
+                    priority=self.EVENT_PRIORITY,
+                )
+
+        # All pages at once, or one after the other while they may still
+        # list events after since
+        urls = extract_page_urls(
+            response, self.settings.getint("CONCURRENT_REQUESTS"), not links
+        )
+        if self.since is not None:
+            urls = urls[:1] if recent else []
+        for url in urls:
+            yield Request(
+                url,
+                callback=self.parse_promotion,
+                meta=self.get_listing_meta(),
+                priority=self.PROMOTION_PRIORITY,
+            )
 
 
 class FemaleSpider(scrapy.Spider):
@@ -723,6 +1217,7 @@ class FemaleSpider(scrapy.Spider):
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
 
+    @timed()
     def parse(self, response: TextResponse) -> Generator[dict | Request, None, None]:
         fighters = response.xpath("//table[@class='siteSearchResults']/tr")[1:]
         for fighter in fighters:
@@ -730,8 +1225,7 @@ class FemaleSpider(scrapy.Spider):
             name = fighter.xpath("./td[1]/a/text()").get()
             if url is not None and name is not None:
                 yield {"id": response.urljoin(url), "name": normalize_text(name)}
-        next_url = response.xpath(
-            "//span[@class='moreLink']/nav[@class='pagination']/span[@class='next']/a/@href"
-        ).get()
-        if next_url is not None:
-            yield response.follow(next_url, callback=self.parse)
+        for url in extract_page_urls(
+            response, self.settings.getint("CONCURRENT_REQUESTS"), not fighters
+        ):
+            yield Request(url, callback=self.parse)
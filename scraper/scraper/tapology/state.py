@@ -0,0 +1,79 @@
+import datetime
+import json
+import os
+import time
+from scrapy.settings import Settings
+
+DAY = 60 * 60 * 24
+
+
+class CrawlState:
+    def __init__(self, path: str, settings: Settings) -> None:
+        self.path = path
+        self.listing_max_age = settings.getint("INCREMENTAL_LISTING_MAX_AGE", DAY)
+        self.fighter_max_age = settings.getint("INCREMENTAL_FIGHTER_MAX_AGE", 30 * DAY)
+        self.event_grace = settings.getint("INCREMENTAL_EVENT_GRACE", 7 * DAY)
+        self.fighters: dict[str, dict] = {}
+        self.events: dict[str, str] = {}
+        # Fighters whose listing shows another record than their last page
+        self.changed: set[str] = set()
+        if os.path.exists(path):
+            with open(path) as f:
+                state = json.load(f)
+            self.fighters = state["fighters"]
+            self.events = state["events"]
+
+    def save(self) -> None:
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"fighters": self.fighters, "events": self.events}, f)
+        os.replace(tmp, self.path)
+
+    def update_fighter(
+        self, url: str, record: dict[str, int] | None, upcoming: list[str]
+    ) -> None:
+        self.fighters[url] = {"record": record, "upcoming": sorted(upcoming)}
+        self.changed.discard(url)
+
+    def check_record(self, url: str, record: dict[str, int] | None) -> None:
+        # The record on the listing, new results when it is not the stored one
+        fighter = self.fighters.get(url)
+        if fighter is None or record is None or fighter["record"] is None:
+            return
+        if record != fighter["record"]:
+            self.changed.add(url)
+
+    def update_event(self, url: str, date: str) -> None:
+        self.events[url] = date
+
+    def get_fighter_max_age(self, url: str) -> int:
+        if url in self.changed:
+            return 1
+        # Revalidate once after each upcoming bout has taken place
+        now = time.time()
+        fighter = self.fighters.get(url)
+        if fighter is not None:
+            for date in fighter["upcoming"]:
+                changed_at = to_timestamp(date) + DAY
+                if changed_at <= now:
+                    return max(1, min(self.fighter_max_age, int(now - changed_at)))
+        return self.fighter_max_age
+
+    def get_event_max_age(self, url: str) -> int | None:
+        date = self.events.get(url)
+        if date is None:
+            return None
+        # Past events are immutable once their results have settled
+        settled_at = to_timestamp(date) + self.event_grace
+        now = time.time()
+        if settled_at <= now:
+            return max(1, int(now - settled_at))
+        return self.listing_max_age
+
+
+def to_timestamp(date: str) -> float:
+    return (
+        datetime.datetime.strptime(date, "%Y-%m-%d")
+        .replace(tzinfo=datetime.timezone.utc)
+        .timestamp()
+    )
@@ -1,7 +1,157 @@
+import bisect
 import datetime
+import functools
 import re
+import types
+from collections.abc import Mapping
+from typing import Any
 from . import consts
 from .errors import NormalizeError, ParseError, InferError
+from .items import Record, TitleInfo
+from .memo import memoize
+
+
+def build_aliases(
+    canonicals: list[str], aliases: dict[str, list[str]]
+) -> types.MappingProxyType:
+    # Canonical names first, then each alias to its canonical name
+    table = {canonical: canonical for canonical in canonicals}
+    for canonical, names in aliases.items():
+        for name in names:
+            table.setdefault(name, canonical)
+    return types.MappingProxyType(table)
+
+
+status_aliases = build_aliases(
+    consts.STATUSES,
+    {
+        consts.STATUS_WIN: ["win"],
+        consts.STATUS_LOSS: ["loss", "lose"],
+        consts.STATUS_DRAW: ["draw"],
+        consts.STATUS_CANCELLED: ["cancelled", "cancelled bout"],
+        consts.STATUS_NC: ["no contest", "overturned to no contest", "nc"],
+        consts.STATUS_UPCOMING: ["upcoming", "confirmed upcoming bout"],
+        consts.STATUS_UNKNOWN: ["unknown", "n/a", "na"],
+    },
+)
+sport_aliases = build_aliases(
+    consts.SPORTS,
+    {
+        consts.SPORT_MMA: ["mma", "pancrase", "modified mma"],
+        consts.SPORT_KNUCKLE_MMA: ["knuckle_mma", "bare knuck mma"],
+        consts.SPORT_BOX: ["boxing", "modified boxing"],
+        consts.SPORT_CAGE_BOX: [
+            "boxing_cage",
+            "boxing (cage)",
+            "modified boxing (cage)",
+        ],
+        consts.SPORT_KNUCKLE_BOX: ["knuckle", "bare knuck box"],
+        consts.SPORT_KICK: ["kickboxing", "modified kickboxing"],
+        consts.SPORT_MUAY: ["muay", "muay thai", "modified muay thai"],
+        consts.SPORT_KARATE: ["karate", "modified karate"],
+        consts.SPORT_SANDA: ["sanda"],
+        consts.SPORT_LETHWEI: ["lethwei"],
+        consts.SPORT_GRAPPLE: ["grappling", "modified grappling"],
+        consts.SPORT_SHOOT: ["shootboxing"],
+        consts.SPORT_WRESTLE: ["wrestling"],
+        consts.SPORT_SAMBO: ["sambo"],
+        consts.SPORT_VALE: ["valetudo", "vale tudo"],
+        consts.SPORT_JUDO: ["judo"],
+        consts.SPORT_COMBAT_JJ: ["combat_jj", "combat jiu-jitsu"],
+        consts.SPORT_TAEK: ["taekwondo"],
+        consts.SPORT_SLAP: ["slap", "slap fighting"],
+        consts.SPORT_CUSTOM: ["custom", "custom rules", "modified custom rules"],
+    },
+)
+weight_class_aliases = build_aliases(
+    consts.WEIGHT_CLASSES,
+    {
+        consts.WEIGHT_CLASS_ATOM: ["atomweight"],
+        consts.WEIGHT_CLASS_STRAW: ["strawweight"],
+        consts.WEIGHT_CLASS_FLY: ["flyweight"],
+        consts.WEIGHT_CLASS_BANTAM: ["bantamweight"],
+        consts.WEIGHT_CLASS_FEATHER: ["featherweight"],
+        consts.WEIGHT_CLASS_LIGHT: ["lightweight"],
+        consts.WEIGHT_CLASS_S_LIGHT: ["super lightweight"],
+        consts.WEIGHT_CLASS_WELTER: ["welterweight"],
+        consts.WEIGHT_CLASS_S_WELTER: ["super welterweight"],
+        consts.WEIGHT_CLASS_MIDDLE: ["middleweight"],
+        consts.WEIGHT_CLASS_S_MIDDLE: ["super middleweight"],
+        consts.WEIGHT_CLASS_L_HEAVY: ["light heavyweight"],
+        consts.WEIGHT_CLASS_HEAVY: ["heavyweight"],
+        consts.WEIGHT_CLASS_CRUISER: ["cruiserweight"],
+        consts.WEIGHT_CLASS_S_HEAVY: ["super heavyweight"],
+        consts.WEIGHT_CLASS_OPEN: ["openweight", "open weight", "open"],
+        consts.WEIGHT_CLASS_CATCH: ["catchweight", "catch weight", "catch"],
+    },
+)
+billing_aliases = build_aliases(
+    consts.BILLINGS,
+    {
+        consts.BILLING_MAIN: ["main event"],
+        consts.BILLING_CO_MAIN: ["co-main event"],
+        consts.BILLING_MAIN_CARD: ["main card"],
+        consts.BILLING_PRELIM_CARD: ["preliminary card", "prelim"],
+        consts.BILLING_POSTLIM_CARD: ["postlim"],
+    },
+)
+
+date_regex = re.compile(r"(\d{4})\.(\d{2})\.(\d{2})|(\d{2})\.(\d{2})\.(\d{4})")
+round_format_regular_regex = re.compile(r"(\d+) x (\d+)")
+round_format_one_round_regex = re.compile(r"(\d+) min one round$")
+round_format_one_round_ot_regex = re.compile(r"(\d+) min round plus overtime$")
+round_format_hyphen_regex = re.compile(r"(\d+(?:\-\d+)+)( plus overtime)?")
+round_format_plus_regex = re.compile(r"(\d+(?: \+ \d+)+)")
+round_format_unlim_rounds_regex = re.compile(r"(\d+) min unlim rounds")
+round_format_rounds_regex = re.compile(r"(\d+) rounds")
+round_time_regex = re.compile(r"^(\d+):(\d+)$")
+round_regex = re.compile(r"r(\d+)")
+nickname_regex = re.compile(r"\"(.+)\"")
+odds_regex = re.compile(r"([\+\-])?([\d\.]+)")
+end_time_round_regex = re.compile(
+    r"(?:(\d+:\d+) )?round (\d+)(?: of \d+)?(?:, (\d+:\d+) total)?"
+)
+end_time_rounds_regex = re.compile(r"(\d+) rounds?(?:, (\d+:\d+) total)?")
+end_time_round_of_regex = re.compile(r"(\d+:\d+) round (\d+)/\d+, (\d+:\d+) total")
+end_time_round_only_regex = re.compile(r"round (\d+)")
+end_time_elapsed_regex = re.compile(r"rounds, (\d+:\d+) total")
+weight_summary_class_regex = re.compile(r"(.*weight|([\d\.]+) (kgs?|lbs?))")
+weight_summary_value_regex = re.compile(r"(weigh-in )?([\d\.]+) (kgs?|lbs?)")
+weight_regex = re.compile(r"([\d\.]+) (kgs?|lbs?)")
+height_regex = re.compile(r"([\d\.]+)\'([\d\.]+)\"")
+reach_regex = re.compile(r"([\d\.]+)\"")
+earnings_regex = re.compile(r"\$([\d\,]+)")
+record_regex = re.compile(
+    r"^(?:climbed to |fell to |moved to |stayed at )?(\d+)-(\d+)(?:-(\d+))?"
+)
+method_category_regex = re.compile(
+    r"ko/tko|submission|decision|ends in a draw|ends in a no contest|disqualificaton"
+)
+method_qualifier_regex = re.compile(
+    r"(?P<unanimous>unanimous)|(?P<majority>majority)|(?P<split>split|spit|spilt)"
+    r"|(?P<doping>drug|doping|substance)"
+)
+doping_regex = re.compile(r"drug|doping|substance")
+
+# Method category -> (type, qualified by the decision, qualified by doping)
+method_categories = types.MappingProxyType(
+    {
+        "ko/tko": (consts.METHOD_TYPE_KO_TKO, False, False),
+        "submission": (consts.METHOD_TYPE_SUBMISSION, False, False),
+        "decision": (consts.METHOD_TYPE_DECISION, True, False),
+        "ends in a draw": (consts.METHOD_TYPE_DRAW, True, False),
+        "ends in a no contest": (consts.METHOD_TYPE_NC, True, True),
+        "disqualificaton": (consts.METHOD_TYPE_DQ, True, True),
+    }
+)
+method_types = types.MappingProxyType(
+    {
+        "overturned to no contest": consts.METHOD_TYPE_OVERTURNED,
+        "result overturned": consts.METHOD_TYPE_OVERTURNED,
+        "n/a": consts.METHOD_TYPE_OTHERS,
+        "result unknown": consts.METHOD_TYPE_UNKNOWN,
+    }
+)
 
 
 def is_na(text: str) -> str:
@@ -21,134 +171,29 @@ def normalize_text(text: str, lower: bool = True) -> str:
 
 def normalize_status(status: str) -> str:
     normed = normalize_text(status)
-    if normed in consts.STATUSES:
-        return normed
-    if normed in ["win"]:
-        return consts.STATUS_WIN
-    if normed in ["loss", "lose"]:
-        return consts.STATUS_LOSS
-    if normed in ["draw"]:
-        return consts.STATUS_DRAW
-    if normed in ["cancelled", "cancelled bout"]:
-        return consts.STATUS_CANCELLED
-    if normed in ["no contest", "overturned to no contest", "nc"]:
-        return consts.STATUS_NC
-    if normed in ["upcoming", "confirmed upcoming bout"]:
-        return consts.STATUS_UPCOMING
-    if normed in ["unknown", "n/a", "na"]:
-        return consts.STATUS_UNKNOWN
+    if normed in status_aliases:
+        return status_aliases[normed]
     raise NormalizeError("status", normed)
 
 
 def normalize_sport(sport: str) -> str:
     normed = normalize_text(sport)
-    if normed in consts.SPORTS:
-        return normed
-    if normed in ["mma", "pancrase", "modified mma"]:
-        return consts.SPORT_MMA
-    if normed in ["knuckle_mma", "bare knuck mma"]:
-        return consts.SPORT_KNUCKLE_MMA
-    if normed in [
-        "boxing",
-        "modified boxing",
-    ]:
-        return consts.SPORT_BOX
-    if normed in [
-        "boxing_cage",
-        "boxing (cage)",
-        "modified boxing (cage)",
-    ]:
-        return consts.SPORT_CAGE_BOX
-    if normed in ["knuckle", "bare knuck box"]:
-        return consts.SPORT_KNUCKLE_BOX
-    if normed in ["kickboxing", "modified kickboxing"]:
-        return consts.SPORT_KICK
-    if normed in ["muay", "muay thai", "modified muay thai"]:
-        return consts.SPORT_MUAY
-    if normed in ["karate", "modified karate"]:
-        return consts.SPORT_KARATE
-    if normed in ["sanda"]:
-        return consts.SPORT_SANDA
-    if normed in ["lethwei"]:
-        return consts.SPORT_LETHWEI
-    if normed in ["grappling", "modified grappling"]:
-        return consts.SPORT_GRAPPLE
-    if normed in ["shootboxing"]:
-        return consts.SPORT_SHOOT
-    if normed in ["wrestling"]:
-        return consts.SPORT_WRESTLE
-    if normed in ["sambo"]:
-        return consts.SPORT_SAMBO
-    if normed in ["valetudo", "vale tudo"]:
-        return consts.SPORT_VALE
-    if normed in ["judo"]:
-        return consts.SPORT_JUDO
-    if normed in ["combat_jj", "combat jiu-jitsu"]:
-        return consts.SPORT_COMBAT_JJ
-    if normed in ["taekwondo"]:
-        return consts.SPORT_TAEK
-    if normed in ["slap", "slap fighting"]:
-        return consts.SPORT_SLAP
-    if normed in ["custom", "custom rules", "modified custom rules"]:
-        return consts.SPORT_CUSTOM
+    if normed in sport_aliases:
+        return sport_aliases[normed]
     raise NormalizeError("sport", normed)
 
 
 def normalize_weight_class(weight_class: str) -> str | None:
     normed = normalize_text(weight_class)
-    if normed in consts.WEIGHT_CLASSES:
-        return normed
-    if normed in ["atomweight"]:
-        return consts.WEIGHT_CLASS_ATOM
-    if normed in ["strawweight"]:
-        return consts.WEIGHT_CLASS_STRAW
-    if normed in ["flyweight"]:
-        return consts.WEIGHT_CLASS_FLY
-    if normed in ["bantamweight"]:
-        return consts.WEIGHT_CLASS_BANTAM
-    if normed in ["featherweight"]:
-        return consts.WEIGHT_CLASS_FEATHER
-    if normed in ["lightweight"]:
-        return consts.WEIGHT_CLASS_LIGHT
-    if normed in ["super lightweight"]:
-        return consts.WEIGHT_CLASS_S_LIGHT
-    if normed in ["welterweight"]:
-        return consts.WEIGHT_CLASS_WELTER
-    if normed in ["super welterweight"]:
-        return consts.WEIGHT_CLASS_S_WELTER
-    if normed in ["middleweight"]:
-        return consts.WEIGHT_CLASS_MIDDLE
-    if normed in ["super middleweight"]:
-        return consts.WEIGHT_CLASS_S_MIDDLE
-    if normed in ["light heavyweight"]:
-        return consts.WEIGHT_CLASS_L_HEAVY
-    if normed in ["heavyweight"]:
-        return consts.WEIGHT_CLASS_HEAVY
-    if normed in ["cruiserweight"]:
-        return consts.WEIGHT_CLASS_CRUISER
-    if normed in ["super heavyweight"]:
-        return consts.WEIGHT_CLASS_S_HEAVY
-    if normed in ["openweight", "open weight", "open"]:
-        return consts.WEIGHT_CLASS_OPEN
-    if normed in ["catchweight", "catch weight", "catch"]:
-        return consts.WEIGHT_CLASS_CATCH
+    if normed in weight_class_aliases:
+        return weight_class_aliases[normed]
     raise NormalizeError("weight class", normed)
 
 
 def normalize_billing(billing: str) -> str:
     normed = normalize_text(billing)
-    if normed in consts.BILLINGS:
-        return normed
-    if normed in ["main event"]:
-        return consts.BILLING_MAIN
-    if normed in ["co-main event"]:
-        return consts.BILLING_CO_MAIN
-    if normed in ["main card"]:
-        return consts.BILLING_MAIN_CARD
-    if normed in ["preliminary card", "prelim"]:
-        return consts.BILLING_PRELIM_CARD
-    if normed in ["postlim"]:
-        return consts.BILLING_POSTLIM_CARD
+    if normed in billing_aliases:
+        return billing_aliases[normed]
     raise NormalizeError("billing", normed)
 
 
@@ -164,24 +209,24 @@ def normalize_division(division: str) -> str:
 def parse_date(date: str) -> str:
     normed = normalize_text(date)
     # 2014.09.09
-    matched = re.search(r"(\d{4})\.(\d{2})\.(\d{2})", normed)
-    if matched is not None:
-        return f"{matched.group(1):04}-{matched.group(2):02}-{matched.group(3):02}"
     # 09.09.2014
-    matched = re.search(r"(\d{2})\.(\d{2})\.(\d{4})", normed)
+    matched = date_regex.search(normed)
     if matched is not None:
-        return f"{matched.group(3):04}-{matched.group(1):02}-{matched.group(2):02}"
+        if matched.group(1) is not None:
+            return f"{matched.group(1):04}-{matched.group(2):02}-{matched.group(3):02}"
+        return f"{matched.group(6):04}-{matched.group(4):02}-{matched.group(5):02}"
     raise ParseError("date", normed)
 
 
-def parse_round_format(round_format: str) -> dict:
+@memoize()
+def parse_round_format(round_format: str) -> Mapping[str, Any]:
     normed = normalize_text(round_format)
 
     # 5 x 5 minute rounds
     # 5 x 5 min
-    matched = re.match(r"(\d+) x (\d+)", normed)
+    matched = round_format_regular_regex.match(normed)
     if matched is not None:
-        round_lengths = [int(matched.group(2))] * int(matched.group(1))
+        round_lengths = (int(matched.group(2)),) * int(matched.group(1))
         return {
             "type": consts.ROUND_FORMAT_TYPE_REGULAR,
             "round_lengths": round_lengths,
@@ -192,12 +237,12 @@ def parse_round_format(round_format: str) -> dict:
         }
 
     # 5 min one round
-    matched = re.match(r"(\d+) min one round$", normed)
+    matched = round_format_one_round_regex.match(normed)
     if matched is not None:
         l = int(matched.group(1))
         return {
             "type": consts.ROUND_FORMAT_TYPE_REGULAR,
-            "round_lengths": [l],
+            "round_lengths": (l,),
             "rounds": 1,
             "length": l,
             "ot": False,
@@ -205,12 +250,12 @@ def parse_round_format(round_format: str) -> dict:
         }
 
     # 5 min round plus overtime
-    matched = re.match(r"(\d+) min round plus overtime$", normed)
+    matched = round_format_one_round_ot_regex.match(normed)
     if matched is not None:
         l = int(matched.group(1))
         return {
             "type": consts.ROUND_FORMAT_TYPE_REGULAR,
-            "round_lengths": [l],
+            "round_lengths": (l,),
             "rounds": 1,
             "length": l,
             "ot": True,
@@ -224,9 +269,9 @@ def parse_round_format(round_format: str) -> dict:
     # 5-5-5 plus overtime
     # 5-5-5-5 plus overtime
     # 5-5 two rounds
-    matched = re.match(r"(\d+(?:\-\d+)+)( plus overtime)?", normed)
+    matched = round_format_hyphen_regex.match(normed)
     if matched is not None:
-        round_lengths = list(map(lambda s: int(s), matched.group(1).split("-")))
+        round_lengths = tuple(map(lambda s: int(s), matched.group(1).split("-")))
         ot = matched.group(2) is not None
         return {
             "type": consts.ROUND_FORMAT_TYPE_REGULAR,
@@ -239,9 +284,11 @@ def parse_round_format(round_format: str) -> dict:
 
     # 5 + 5 two rounds
     # 5 + 5 + 5 three rounds
-    matched = re.match(r"(\d+(?: \+ \d+)+)", normed)
+    matched = round_format_plus_regex.match(normed)
     if matched is not None:
-        round_lengths = list(map(lambda s: int(s.strip()), matched.group(1).split("+")))
+        round_lengths = tuple(
+            map(lambda s: int(s.strip()), matched.group(1).split("+"))
+        )
         return {
             "type": consts.ROUND_FORMAT_TYPE_REGULAR,
             "round_lengths": round_lengths,
@@ -252,7 +299,7 @@ def parse_round_format(round_format: str) -> dict:
         }
 
     # 5 min unlim rounds
-    matched = re.match(r"(\d+) min unlim rounds", normed)
+    matched = round_format_unlim_rounds_regex.match(normed)
     if matched is not None:
         return {
             "type": consts.ROUND_FORMAT_TYPE_UNLIM_ROUNDS,
@@ -264,7 +311,7 @@ def parse_round_format(round_format: str) -> dict:
         return {"type": consts.ROUND_FORMAT_TYPE_UNLIM_ROUND_LENGTH, "rounds": 1}
 
     # 3 Rounds
-    matched = re.match(r"(\d+) rounds", normed)
+    matched = round_format_rounds_regex.match(normed)
     if matched is not None:
         return {
             "type": consts.ROUND_FORMAT_TYPE_ROUND_LENGTH_UNKNONW,
@@ -275,7 +322,7 @@ def parse_round_format(round_format: str) -> dict:
 
 def parse_round_time(round_time: str) -> dict[str, int]:
     normed = normalize_text(round_time)
-    matched = re.match(r"^(\d+):(\d+)$", normed)
+    matched = round_time_regex.match(normed)
     if matched is not None:
         return {"m": int(matched.group(1)), "s": int(matched.group(2))}
     raise ParseError("round time", normed)
@@ -283,7 +330,7 @@ def parse_round_time(round_time: str) -> dict[str, int]:
 
 def parse_round(round: str) -> int:
     normed = normalize_text(round)
-    matched = re.match(r"r(\d+)", normed)
+    matched = round_regex.match(normed)
     if matched is not None:
         return int(matched.group(1))
     raise ParseError("round", normed)
@@ -291,26 +338,28 @@ def parse_round(round: str) -> int:
 
 def parse_nickname(nickname: str) -> str:
     normed = normalize_text(nickname)
-    matched = re.match(r"\"(.+)\"", normed)
+    matched = nickname_regex.match(normed)
     if matched is not None:
         return matched.group(1)
     raise ParseError("nickname", normed)
 
 
-def parse_title_info(title_info: str) -> dict[str, str]:
+def parse_title_info(title_info: str) -> TitleInfo:
     normed = normalize_text(title_info)
     normed_split = list(
         filter(lambda x: x != "", map(lambda x: x.strip(), normed.split("·")))
     )
     if len(normed_split) == 2:
         # Champion · UFC Featherweight Championship
-        return {
-            "as": normed_split[0],
-            "for": normed_split[1],
-        }
+        return TitleInfo(
+            {
+                "as": normed_split[0],
+                "for": normed_split[1],
+            }
+        )
     elif len(normed_split) == 1:
         # Tournament Championship
-        return {"for": normed_split[0]}
+        return TitleInfo({"for": normed_split[0]})
     raise ParseError("title info", normed)
 
 
@@ -319,7 +368,7 @@ def parse_odds(odds: str) -> float:
 
     # +210 · Moderate Underdog
     # 0 · Close
-    matched = re.search(r"([\+\-])?([\d\.]+)", normed)
+    matched = odds_regex.search(normed)
     if matched is not None:
         value = float(matched.group(2))
         sign = matched.group(1)
@@ -329,7 +378,8 @@ def parse_odds(odds: str) -> float:
     raise ParseError("odds", normed)
 
 
-def parse_end_time(end_time: str) -> dict:
+@memoize()
+def parse_end_time(end_time: str) -> Mapping[str, Any]:
     normed = normalize_text(end_time)
     # 1:44 round 1 of 3
     # 0:56 round 3 of 3, 10:56 total
@@ -337,9 +387,7 @@ def parse_end_time(end_time: str) -> dict:
     # 2:20 round 3
     # round 3 of 5
     # round 2 of 3, 3:00 total
-    matched = re.match(
-        r"(?:(\d+:\d+) )?round (\d+)(?: of \d+)?(?:, (\d+:\d+) total)?", normed
-    )
+    matched = end_time_round_regex.match(normed)
     if matched is not None:
         round_time = matched.group(1)
         round = int(matched.group(2))
@@ -358,7 +406,7 @@ def parse_end_time(end_time: str) -> dict:
     # 1 round, 10:00 total
     # 1 round
     # 2 rounds
-    matched = re.match(r"(\d+) rounds?(?:, (\d+:\d+) total)?", normed)
+    matched = end_time_rounds_regex.match(normed)
     if matched is not None:
         round = int(matched.group(1))
         elapsed_time = matched.group(2)
@@ -366,7 +414,7 @@ def parse_end_time(end_time: str) -> dict:
             return {"round": round, "elapsed": elapsed_time}
         return {"round": round}
     # 1:31 round 8/10, 22:31 total
-    matched = re.match(r"(\d+:\d+) round (\d+)/\d+, (\d+:\d+) total", normed)
+    matched = end_time_round_of_regex.match(normed)
     if matched is not None:
         round_time = matched.group(1)
         round = int(matched.group(2))
@@ -374,20 +422,21 @@ def parse_end_time(end_time: str) -> dict:
         return {"round": round, "time": round_time, "elapsed": elapsed_time}
     # round 1
     # round 3
-    matched = re.match(r"round (\d+)", normed)
+    matched = end_time_round_only_regex.match(normed)
     if matched is not None:
         round = int(matched.group(1))
         return {"round": round}
 
     # rounds, 15:00 total
-    matched = re.match(r"rounds, (\d+:\d+) total", normed)
+    matched = end_time_elapsed_regex.match(normed)
     if matched is not None:
         elapsed_time = matched.group(1)
         return {"elapsed": elapsed_time}
     raise ParseError("end time", normed)
 
 
-def parse_weight_summary(weight_summary: str) -> dict[str, float]:
+@memoize()
+def parse_weight_summary(weight_summary: str) -> Mapping[str, Any]:
     normed = normalize_text(weight_summary)
     normed_split = list(map(lambda x: x.strip(), normed.split("·")))
     ret = {}
@@ -396,7 +445,7 @@ def parse_weight_summary(weight_summary: str) -> dict[str, float]:
     # *numeric weight*
     # 110 kg|kgs|lb|lbs
     # 110 kg|kgs|lb|lbs (49.9 kg|kgs|lb|lbs)
-    matched = re.match(r"(.*weight|([\d\.]+) (kgs?|lbs?))", normed_split[0])
+    matched = weight_summary_class_regex.match(normed_split[0])
     if matched is None:
         raise ParseError("weight summary", normed)
     if matched.group(1) == "*numeric weight":
@@ -413,7 +462,7 @@ def parse_weight_summary(weight_summary: str) -> dict[str, float]:
     for s in normed_split[1:]:
         # 120 kg|kgs|lb|lbs (264.6 kg|kgs|lb|lbs)
         # Weigh-In 120 kg|kgs|lb|lbs (264.6 kg|kgs|lb|lbs)
-        matched = re.match(r"(weigh-in )?([\d\.]+) (kgs?|lbs?)", s)
+        matched = weight_summary_value_regex.match(s)
         if matched is None:
             raise ParseError("weight summary", normed)
         if matched.group(2) is None or matched.group(3) is None:
@@ -438,7 +487,7 @@ def get_id_from_url(url: str) -> str:
 
 def parse_last_weigh_in(last_weigh_in: str) -> float:
     normed = normalize_text(last_weigh_in)
-    matched = re.match(r"([\d\.]+) (kgs?|lbs?)", normed)
+    matched = weight_regex.match(normed)
     if matched is not None:
         value = float(matched.group(1))
         unit = matched.group(2)
@@ -448,7 +497,7 @@ def parse_last_weigh_in(last_weigh_in: str) -> float:
 
 def parse_height(height: str) -> float:
     normed = normalize_text(height)
-    matched = re.search(r"([\d\.]+)\'([\d\.]+)\"", normed)
+    matched = height_regex.search(normed)
     if matched is not None:
         return to_meter(float(matched.group(1)), float(matched.group(2)))
     raise ParseError("height", normed)
@@ -456,7 +505,7 @@ def parse_height(height: str) -> float:
 
 def parse_reach(reach: str) -> float:
     normed = normalize_text(reach)
-    matched = re.search(r"([\d\.]+)\"", normed)
+    matched = reach_regex.search(normed)
     if matched is not None:
         return to_meter(0, float(matched.group(1)))
     raise ParseError("reach", normed)
@@ -464,79 +513,48 @@ def parse_reach(reach: str) -> float:
 
 def parse_earnings(earnings: str) -> int:
     normed = normalize_text(earnings)
-    matched = re.search(r"\$([\d\,]+)", normed)
+    matched = earnings_regex.search(normed)
     if matched is not None:
         return int(matched.group(1).replace(",", ""))
     raise ParseError("earnings", normed)
 
 
-def parse_method(method: str) -> dict:
+@memoize()
+def parse_method(method: str) -> Mapping[str, str]:
     normed = normalize_text(method)
     normed_split = list(map(lambda x: x.strip(), normed.split(",")))
     n = len(normed_split)
     cat = normed_split[0]
     by = "unknown" if n == 1 else ",".join(normed_split[1:])
-    if cat.startswith("ko/tko"):
-        return {"type": consts.METHOD_TYPE_KO_TKO, "by": by}
-    elif cat.startswith("submission"):
-        return {"type": consts.METHOD_TYPE_SUBMISSION, "by": by}
-    elif cat.startswith("decision"):
-        if re.search(r"unanimous", by):
-            return {"type": consts.METHOD_TYPE_DECISION, "by": "unanimous"}
-        if re.search(r"majority", by):
-            return {"type": consts.METHOD_TYPE_DECISION, "by": "majority"}
-        if re.search(r"(split|spit|spilt)", by):
-            return {"type": consts.METHOD_TYPE_DECISION, "by": "split"}
-        return {"type": consts.METHOD_TYPE_DECISION, "by": by}
-    elif cat.startswith("ends in a draw"):
-        if re.search(r"unanimous", by):
-            return {"type": consts.METHOD_TYPE_DRAW, "by": "unanimous"}
-        if re.search(r"majority", by):
-            return {"type": consts.METHOD_TYPE_DRAW, "by": "majority"}
-        if re.search(r"(split|spit|spilt)", by):
-            return {"type": consts.METHOD_TYPE_DRAW, "by": "split"}
-        return {"type": consts.METHOD_TYPE_DRAW, "by": by}
-    elif cat.startswith("ends in a no contest"):
-        if re.search(r"unanimous", by):
-            return {"type": consts.METHOD_TYPE_NC, "by": "unanimous"}
-        if re.search(r"majority", by):
-            return {"type": consts.METHOD_TYPE_NC, "by": "majority"}
-        if re.search(r"(split|spit|spilt)", by):
-            return {"type": consts.METHOD_TYPE_NC, "by": "split"}
-        if is_doping(by):
-            return {"type": consts.METHOD_TYPE_NC, "by": "doping"}
-        return {"type": consts.METHOD_TYPE_NC, "by": by}
-    elif cat.startswith("disqualificaton"):
-        if re.search(r"unanimous", by):
-            return {"type": consts.METHOD_TYPE_DQ, "by": "unanimous"}
-        if re.search(r"majority", by):
-            return {"type": consts.METHOD_TYPE_DQ, "by": "majority"}
-        if re.search(r"(split|spit|spilt)", by):
-            return {"type": consts.METHOD_TYPE_DQ, "by": "split"}
-        if is_doping(by):
-            return {"type": consts.METHOD_TYPE_DQ, "by": "doping"}
-        return {"type": consts.METHOD_TYPE_DQ, "by": by}
-    elif cat in ["overturned to no contest", "result overturned"]:
-        return {"type": consts.METHOD_TYPE_OVERTURNED, "by": by}
-    elif cat == "n/a":
-        return {"type": consts.METHOD_TYPE_OTHERS, "by": by}
-    elif cat == "result unknown":
-        return {"type": consts.METHOD_TYPE_UNKNOWN, "by": by}
+    matched = method_category_regex.match(cat)
+    if matched is not None:
+        type, by_decision, by_doping = method_categories[matched.group(0)]
+        if by_decision or by_doping:
+            qualifiers = {m.lastgroup for m in method_qualifier_regex.finditer(by)}
+            if by_decision:
+                for qualifier in ["unanimous", "majority", "split"]:
+                    if qualifier in qualifiers:
+                        return {"type": type, "by": qualifier}
+            if by_doping and "doping" in qualifiers:
+                return {"type": type, "by": "doping"}
+        return {"type": type, "by": by}
+    if cat in method_types:
+        return {"type": method_types[cat], "by": by}
     raise ParseError("method", normed)
 
 
-def parse_record(record: str) -> dict[str, int]:
+def parse_record(record: str) -> Record:
     normed = normalize_text(record)
-    matched = re.match(
-        r"^(?:climbed to |fell to |moved to |stayed at )?(\d+)-(\d+)(?:-(\d+))?", normed
-    )
+    matched = record_regex.match(normed)
     if matched is not None:
         d = matched.group(3)
-        return {
-            "w": int(matched.group(1)),
-            "l": int(matched.group(2)),
-            "d": 0 if d is None else int(d),
-        }
+        return Record(
+            {
+                "w": int(matched.group(1)),
+                "l": int(matched.group(2)),
+                "d": 0 if d is None else int(d),
+            }
+        )
     raise ParseError("record", normed)
 
 
@@ -553,74 +571,27 @@ def to_weight_class(value: float, unit: str = "kg", margin: float = 0.02) -> str
     if margin < 0 or 1 < margin:
         raise ValueError("Margin must be [0, 1]")
     kg = to_kg(value, unit=unit)
+    i = bisect.bisect_left(get_weight_class_boundaries(margin), kg)
+    if i == len(consts.WEIGHT_CLASSES_BY_LIMIT):
+        return consts.WEIGHT_CLASS_S_HEAVY
+    return consts.WEIGHT_CLASSES_BY_LIMIT[i]
+
+
+@functools.cache
+def get_weight_class_boundaries(margin: float) -> tuple[float, ...]:
     scale = 1 + margin
-    if kg <= consts.WEIGHT_LIMIT_ATOM * scale:
-        return consts.WEIGHT_CLASS_ATOM
-    if kg <= consts.WEIGHT_LIMIT_STRAW * scale:
-        return consts.WEIGHT_CLASS_STRAW
-    if kg <= consts.WEIGHT_LIMIT_FLY * scale:
-        return consts.WEIGHT_CLASS_FLY
-    if kg <= consts.WEIGHT_LIMIT_BANTAM * scale:
-        return consts.WEIGHT_CLASS_BANTAM
-    if kg <= consts.WEIGHT_LIMIT_FEATHER * scale:
-        return consts.WEIGHT_CLASS_FEATHER
-    if kg <= consts.WEIGHT_LIMIT_LIGHT * scale:
-        return consts.WEIGHT_CLASS_LIGHT
-    if kg <= consts.WEIGHT_LIMIT_S_LIGHT * scale:
-        return consts.WEIGHT_CLASS_S_LIGHT
-    if kg <= consts.WEIGHT_LIMIT_WELTER * scale:
-        return consts.WEIGHT_CLASS_WELTER
-    if kg <= consts.WEIGHT_LIMIT_S_WELTER * scale:
-        return consts.WEIGHT_CLASS_S_WELTER
-    if kg <= consts.WEIGHT_LIMIT_MIDDLE * scale:
-        return consts.WEIGHT_CLASS_MIDDLE
-    if kg <= consts.WEIGHT_LIMIT_S_MIDDLE:
-        return consts.WEIGHT_CLASS_S_MIDDLE
-    if kg <= consts.WEIGHT_LIMIT_L_HEAVY * scale:
-        return consts.WEIGHT_CLASS_L_HEAVY
-    if kg <= consts.WEIGHT_LIMIT_CRUISER * scale:
-        return consts.WEIGHT_CLASS_CRUISER
-    if kg <= consts.WEIGHT_LIMIT_HEAVY * scale:
-        return consts.WEIGHT_CLASS_HEAVY
-    return consts.WEIGHT_CLASS_S_HEAVY
+    return tuple(
+        limit if weight_class in consts.WEIGHT_CLASSES_WITHOUT_MARGIN else limit * scale
+        for weight_class, limit in zip(
+            consts.WEIGHT_CLASSES_BY_LIMIT, consts.WEIGHT_CLASS_BOUNDARIES
+        )
+    )
 
 
 def to_weight_limit(weight_class: str) -> float | None:
-    if weight_class not in consts.WEIGHT_CLASSES:
+    if weight_class not in consts.WEIGHT_LIMITS_BY_CLASS:
         raise ValueError(f"invalid weight class: {weight_class}")
-    if weight_class == consts.WEIGHT_CLASS_ATOM:
-        return consts.WEIGHT_LIMIT_ATOM
-    if weight_class == consts.WEIGHT_CLASS_STRAW:
-        return consts.WEIGHT_LIMIT_STRAW
-    if weight_class == consts.WEIGHT_CLASS_FLY:
-        return consts.WEIGHT_LIMIT_FLY
-    if weight_class == consts.WEIGHT_CLASS_BANTAM:
-        return consts.WEIGHT_LIMIT_BANTAM
-    if weight_class == consts.WEIGHT_CLASS_FEATHER:
-        return consts.WEIGHT_LIMIT_FEATHER
-    if weight_class == consts.WEIGHT_CLASS_LIGHT:
-        return consts.WEIGHT_LIMIT_LIGHT
-    if weight_class == consts.WEIGHT_CLASS_S_LIGHT:
-        return consts.WEIGHT_LIMIT_S_LIGHT
-    if weight_class == consts.WEIGHT_CLASS_WELTER:
-        return consts.WEIGHT_LIMIT_WELTER
-    if weight_class == consts.WEIGHT_CLASS_S_WELTER:
-        return consts.WEIGHT_LIMIT_S_WELTER
-    if weight_class == consts.WEIGHT_CLASS_MIDDLE:
-        return consts.WEIGHT_LIMIT_MIDDLE
-    if weight_class == consts.WEIGHT_CLASS_S_MIDDLE:
-        return consts.WEIGHT_LIMIT_S_MIDDLE
-    if weight_class == consts.WEIGHT_CLASS_L_HEAVY:
-        return consts.WEIGHT_LIMIT_L_HEAVY
-    if weight_class == consts.WEIGHT_CLASS_CRUISER:
-        return consts.WEIGHT_LIMIT_CRUISER
-    if weight_class == consts.WEIGHT_CLASS_HEAVY:
-        return consts.WEIGHT_LIMIT_HEAVY
-    if weight_class == consts.WEIGHT_CLASS_OPEN:
-        return None
-    if weight_class == consts.WEIGHT_CLASS_CATCH:
-        return None
-    return consts.WEIGHT_LIMIT_S_HEAVY
+    return consts.WEIGHT_LIMITS_BY_CLASS[weight_class]
 
 
 def to_meter(feet: float, inch: float) -> float:
@@ -703,6 +674,6 @@ def correct_event_url(event_url: str) -> str:
 
 def is_doping(by: str) -> bool:
     normed = normalize_text(by)
-    if re.search(r"(drug|doping|substance)", normed):
+    if doping_regex.search(normed):
         return True
     return False
@@ -0,0 +1,130 @@
+import bisect
+import functools
+import time
+from collections.abc import Callable, Generator
+from itemadapter import is_item
+from scrapy.http import Request
+
+# Upper bounds (ms) of the wall and CPU time histogram buckets
+BUCKETS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+timers: dict[str, "Timer"] = {}
+
+
+class Timer:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.clear()
+
+    def observe(
+        self, wall: float, cpu: float | None = None, items: int = 0, requests: int = 0
+    ) -> None:
+        self.calls += 1
+        self.wall += wall
+        self.wall_max = max(self.wall_max, wall)
+        self.items += items
+        self.requests += requests
+        self.histogram[get_bucket(wall)] += 1
+        # Not measured for downloads
+        if cpu is not None:
+            self.cpu += cpu
+            self.cpu_histogram[get_bucket(cpu)] += 1
+
+    def iterate(
+        self, outputs: Generator, wall: float, cpu: float
+    ) -> Generator[object, None, None]:
+        # Callback generators run in steps, only the time spent
+        # inside next() counts
+        items = requests = 0
+        try:
+            while True:
+                wall_start, cpu_start = time.perf_counter(), time.process_time()
+                try:
+                    x = next(outputs)
+                except StopIteration:
+                    break
+                finally:
+                    wall += time.perf_counter() - wall_start
+                    cpu += time.process_time() - cpu_start
+                if isinstance(x, Request):
+                    requests += 1
+                elif x is not None:
+                    items += 1
+                yield x
+        finally:
+            self.observe(wall, cpu, items, requests)
+
+    def get_stats(self) -> dict[str, int | float]:
+        stats = {
+            "calls": self.calls,
+            "wall": self.wall,
+            "cpu": self.cpu,
+            "wall_mean": self.wall / self.calls if self.calls > 0 else 0.0,
+            "wall_max": self.wall_max,
+            "items": self.items,
+            "requests": self.requests,
+        }
+        for bound, wall, cpu in zip(
+            BUCKETS + [None], self.histogram, self.cpu_histogram
+        ):
+            label = f"le_{bound}ms" if bound is not None else "inf"
+            stats[f"wall_hist/{label}"] = wall
+            stats[f"cpu_hist/{label}"] = cpu
+        return stats
+
+    def clear(self) -> None:
+        self.calls, self.items, self.requests = 0, 0, 0
+        self.wall, self.cpu, self.wall_max = 0.0, 0.0, 0.0
+        self.histogram = [0] * (len(BUCKETS) + 1)
+        self.cpu_histogram = [0] * (len(BUCKETS) + 1)
+
+
+def get_bucket(seconds: float) -> int:
+    # The last one is unbounded
+    return bisect.bisect_left(BUCKETS, seconds * 1000)
+
+
+def get_timer(name: str) -> Timer:
+    if name not in timers:
+        timers[name] = Timer(name)
+    return timers[name]
+
+
+def timed(name: str | None = None) -> Callable[[Callable], Callable]:
+    # Wall and CPU time of every call, plus the items and requests
+    # yielded or returned by spider callbacks
+    def decorator(func: Callable) -> Callable:
+        timer = get_timer(name or func.__qualname__)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            wall, cpu = time.perf_counter(), time.process_time()
+            result = func(*args, **kwargs)
+            wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+            if isinstance(result, Generator):
+                return timer.iterate(result, wall, cpu)
+            items, requests = count_outputs(result)
+            timer.observe(wall, cpu, items, requests)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def count_outputs(result) -> tuple[int, int]:
+    if result is None:
+        return 0, 0
+    if isinstance(result, Request):
+        return 0, 1
+    if is_item(result):
+        return 1, 0
+    if isinstance(result, list):
+        requests = sum(isinstance(x, Request) for x in result)
+        return len(result) - requests, requests
+    return 0, 0
+
+
+def get_stats() -> dict[str, dict[str, int | float]]:
+    return {name: timer.get_stats() for name, timer in timers.items()}